@@ -17,15 +17,14 @@ import json
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict, fields
 
-import pandas as pd
-
 sys.path.insert(0, str(Path(__file__).parent))
 
 from scanner.historical import HistoricalScanner, HistoricalConfig
 from data.fmp_client import FMPClient
+from data.price_resolver import PriceResolver
 from config.settings import get_settings
 from utils.logging import setup_logging, get_logger
 
@@ -95,6 +94,7 @@ class SignalBacktester:
         """
         self.settings = get_settings()
         self.fmp = FMPClient(settings=self.settings)
+        self.prices = PriceResolver(self.fmp)
         self.scanner = HistoricalScanner(HistoricalConfig())
         self.signals_db: List[TrackedSignal] = []
         self.use_sp500_pit = use_sp500_pit
@@ -130,46 +130,34 @@ class SignalBacktester:
         return {s.signal_date for s in self.signals_db}
 
     async def get_price_on_date(self, ticker: str, target_date: str) -> Optional[float]:
-        """Get closing price on or near a specific date."""
+        """Get closing price on or near a specific date (first close within 10 days on/after, else before)."""
         try:
-            # Rate limit: small delay between requests
-            await asyncio.sleep(0.3)
-
-            # Get historical data around the target date
-            target = datetime.strptime(target_date, "%Y-%m-%d")
-            from_date = (target - timedelta(days=10)).strftime("%Y-%m-%d")
-            to_date = (target + timedelta(days=10)).strftime("%Y-%m-%d")
-
-            hist = await self.fmp.get_historical_prices(ticker, from_date=from_date, to_date=to_date)
-            if not hist:
-                return None
-
-            # Handle response format - may be dict with 'historical' key
-            if isinstance(hist, dict) and 'historical' in hist:
-                hist = hist['historical']
-
-            if not hist:
-                return None
-
-            # Convert to dataframe
-            df = pd.DataFrame(hist)
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values('date')
-
-            target_dt = pd.to_datetime(target_date)
-
-            # Find closest date on or after target
-            mask = df['date'] >= target_dt
-            if mask.any():
-                return float(df[mask].iloc[0]['close'])
-
-            # If no date after, get the last available
-            return float(df.iloc[-1]['close'])
-
+            return await self.prices.get_price_on_date(ticker, target_date)
         except Exception as e:
             logger.warning(f"Failed to get price for {ticker} on {target_date}: {e}")
             return None
 
+    @staticmethod
+    def _price_dates(signal_date: str, entry_date: str = "") -> List[str]:
+        """Dates update_returns looks up for a signal (entry, passed horizons, today)."""
+        entry_dt = datetime.strptime(signal_date, "%Y-%m-%d") + timedelta(days=1)
+        today = datetime.now()
+        dates = [entry_date or entry_dt.strftime("%Y-%m-%d")]
+        for days in (90, 180, 365):
+            if entry_dt + timedelta(days=days) <= today:
+                dates.append((entry_dt + timedelta(days=days)).strftime("%Y-%m-%d"))
+        if entry_dt + timedelta(days=365) > today:
+            dates.append(today.strftime("%Y-%m-%d"))
+        return dates
+
+    async def prefetch_prices(self, signals: List[Tuple[str, str, str]]) -> None:
+        """Load every price the given (ticker, signal_date, entry_date) signals need in one pass."""
+        await self.prices.prefetch([
+            (ticker, d)
+            for ticker, signal_date, entry_date in signals
+            for d in self._price_dates(signal_date, entry_date)
+        ])
+
     async def get_company_name(self, ticker: str) -> str:
         """Get company name."""
         try:
@@ -203,8 +191,11 @@ class SignalBacktester:
         # Filter by max_score (scores 5-7 only, consistent with research paper)
         scored_weeks = [sw for sw in scored_weeks if sw.total_score <= self.max_score]
 
+        top_weeks = scored_weeks[:10]  # Top 10 per week
+        await self.prefetch_prices([(sw.ticker, week_end_date, "") for sw in top_weeks])
+
         signals = []
-        for sw in scored_weeks[:10]:  # Top 10 per week
+        for sw in top_weeks:
             company_name = await self.get_company_name(sw.ticker)
 
             # Calculate Monday entry date (next trading day after Sunday signal)
@@ -326,9 +317,6 @@ class SignalBacktester:
                 # Save after each week
                 self._save_signals_db()
 
-                # Rate limit: pause between weeks to avoid API limits
-                await asyncio.sleep(2)
-
             except Exception as e:
                 logger.error(f"Error processing week {week_date}: {e}")
                 await asyncio.sleep(5)  # Longer pause on error
@@ -338,6 +326,8 @@ class SignalBacktester:
         """Update returns for all existing signals."""
         logger.info(f"Updating returns for {len(self.signals_db)} signals")
 
+        await self.prefetch_prices([(s.ticker, s.signal_date, s.entry_date) for s in self.signals_db])
+
         for i, signal in enumerate(self.signals_db):
             self.signals_db[i] = await self.update_returns(signal)
 
@@ -574,7 +564,7 @@ Examples:
   Only update returns (no new signals):
     python backtest_signals.py --update
 
-  Force full rerun from scratch (~35 min):
+  Force full rerun from scratch:
     python backtest_signals.py --start 2023-01-01 --force
 
   Survivorship-bias-free 10-year backtest (S&P 500 only):
@@ -60,6 +60,13 @@ class Settings(BaseSettings):
 
     # Rate Limiting
     fmp_requests_per_minute: int = Field(300, env="FMP_REQUESTS_PER_MINUTE")
+    fmp_max_concurrency: int = Field(20, env="FMP_MAX_CONCURRENCY")
+
+    # FMP transport: live API, record responses to an archive, or replay them
+    fmp_transport: Literal["live", "record", "replay"] = Field("live", env="FMP_TRANSPORT")
+    fmp_archive_path: Optional[Path] = Field(default=None, env="FMP_ARCHIVE")
+    fmp_replay_latency_ms: float = Field(0.0, env="FMP_REPLAY_LATENCY_MS")
+    fmp_replay_throttle_rate: float = Field(0.0, env="FMP_REPLAY_THROTTLE_RATE")
     anthropic_requests_per_minute: int = Field(50, env="ANTHROPIC_REQUESTS_PER_MINUTE")
 
     # Paths
@@ -70,6 +77,11 @@ class Settings(BaseSettings):
 
     # Cache Settings
     cache_expiry_hours: int = Field(24, env="CACHE_EXPIRY_HOURS")
+    cache_backend: Literal["sqlite", "json"] = Field("sqlite", env="CACHE_BACKEND")
+    cache_db_path: Optional[Path] = Field(default=None, env="CACHE_DB_PATH")
+    price_store_enabled: bool = Field(True, env="PRICE_STORE_ENABLED")
+    price_store_path: Optional[Path] = Field(default=None, env="PRICE_STORE_PATH")
+    fmp_offline: bool = Field(False, env="FMP_OFFLINE")
 
     # Logging
     log_level: str = Field("INFO", env="LOG_LEVEL")
@@ -91,6 +103,12 @@ class Settings(BaseSettings):
             self.reports_output_dir = self.base_dir / "reports" / "output"
         if self.cache_dir is None:
             self.cache_dir = self.base_dir / "data" / "cache"
+        if self.cache_db_path is None:
+            self.cache_db_path = self.cache_dir / "fmp_cache.sqlite3"
+        if self.price_store_path is None:
+            self.price_store_path = self.cache_dir / "prices.sqlite3"
+        if self.fmp_archive_path is None:
+            self.fmp_archive_path = self.cache_dir / "fmp_archive.sqlite3"
         if self.prompts_dir is None:
             self.prompts_dir = self.base_dir / "agents" / "prompts"
 
@@ -4,10 +4,11 @@ Data clients for the High Intent Signal Scanner.
 Primary data source: Financial Modeling Prep (FMP) API
 """
 
-from data.fmp_client import FMPClient, FMPError, FMPRateLimitError
+from data.fmp_client import FMPClient, FMPError, FMPOfflineError, FMPRateLimitError
 
 __all__ = [
     "FMPClient",
     "FMPError",
+    "FMPOfflineError",
     "FMPRateLimitError",
 ]
@@ -4,16 +4,24 @@ Primary data source for company financials, SEC filings, and market data.
 """
 
 import asyncio
+import logging
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 import json
 from pathlib import Path
 
 import httpx
-from ratelimit import limits, sleep_and_retry
 import backoff
 
 from config.settings import get_settings, Settings
+from data.response_cache import CacheBackend, get_cache_backend, make_cache_key
+from data.price_columns import PriceColumns, columns_from_bars, parse_price_payload
+from data.price_store import PriceStore, get_price_store
+from data.rate_limiter import AdaptiveRateLimiter, get_rate_limiter
+from data.transport import FaultInjector, get_transport
+
+logger = logging.getLogger(__name__)
 
 
 class FMPError(Exception):
@@ -26,6 +34,60 @@ class FMPRateLimitError(FMPError):
     pass
 
 
+class FMPOfflineError(FMPError):
+    """Request not in cache while running offline."""
+    pass
+
+
+@dataclass(frozen=True)
+class StalePolicy:
+    """
+    Stale-while-revalidate policy for a slow-changing endpoint.
+
+    Once an entry is older than its cache_hours it is still returned
+    immediately and refreshed in the background, until it is older than
+    max_stale_hours (None = no limit), when the caller waits for a fresh copy.
+    """
+
+    max_stale_hours: Optional[float] = None
+
+
+# Endpoint prefix -> policy. Anything not listed blocks on expiry as before.
+STALE_POLICIES: Dict[str, StalePolicy] = {
+    "/profile/": StalePolicy(max_stale_hours=24 * 30),
+    "/stock_peers": StalePolicy(max_stale_hours=24 * 30),
+    "/sector_price_earning_ratio": StalePolicy(max_stale_hours=24 * 7),
+    "/industry_price_earning_ratio": StalePolicy(max_stale_hours=24 * 7),
+    "/sp500_constituent": StalePolicy(max_stale_hours=24 * 7),
+    "/historical/sp500_constituent": StalePolicy(max_stale_hours=24 * 7),
+}
+
+
+def get_stale_policy(endpoint: str) -> Optional[StalePolicy]:
+    """Stale-while-revalidate policy for an endpoint, if it has one."""
+    for prefix, policy in STALE_POLICIES.items():
+        if endpoint.startswith(prefix):
+            return policy
+    return None
+
+
+@dataclass
+class RequestStats:
+    """Process-wide FMP request counters."""
+
+    network: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0  # Calls saved by joining an in-flight request
+    stale_hits: int = 0  # Served stale while refreshing in the background
+    offline_stale: int = 0  # Served past their TTL in offline mode
+
+
+_request_stats = RequestStats()
+
+# In-flight requests keyed by base URL + cache key, shared by all clients
+_inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+
 class FMPClient:
     """
     Async client for the Financial Modeling Prep API.
@@ -45,6 +107,11 @@ class FMPClient:
         api_key: Optional[str] = None,
         settings: Optional[Settings] = None,
         cache_enabled: bool = True,
+        cache: Optional[CacheBackend] = None,
+        price_store: Optional[PriceStore] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        offline: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         """
         Initialize FMP client.
@@ -53,6 +120,15 @@ class FMPClient:
             api_key: FMP API key. If None, loads from settings.
             settings: Application settings.
             cache_enabled: Enable disk caching of responses.
+            cache: Cache backend. If None, uses the shared backend from settings.
+            price_store: Daily price store for get_historical_prices. If None,
+                uses the shared store from settings (when enabled).
+            rate_limiter: Request limiter. If None, uses the process-wide
+                limiter for settings.fmp_requests_per_minute.
+            offline: Answer only from the cache (any age) and never touch the
+                network. If None, uses settings.fmp_offline.
+            transport: httpx transport (e.g. data.transport.ReplayTransport).
+                If None, built from settings.fmp_transport.
         """
         self.settings = settings or get_settings()
         self.api_key = api_key or self.settings.fmp_api_key
@@ -60,61 +136,75 @@ class FMPClient:
         self.base_url_v4 = self.settings.fmp_base_url_v4
         self.base_url_stable = self.settings.fmp_base_url_stable
         self.cache_enabled = cache_enabled
+        self.offline = self.settings.fmp_offline if offline is None else offline
         self.cache_dir = self.settings.cache_dir
+        self.cache = cache or get_cache_backend(
+            self.settings.cache_backend,
+            self.cache_dir,
+            self.settings.cache_db_path,
+        )
+        self.price_store = price_store
+        if self.price_store is None and cache_enabled and self.settings.price_store_enabled:
+            self.price_store = get_price_store(self.settings.price_store_path)
 
+        self.rate_limiter = rate_limiter or get_rate_limiter(
+            self.settings.fmp_requests_per_minute,
+            self.settings.fmp_max_concurrency,
+        )
+
+        self._transport = transport
         self._client: Optional[httpx.AsyncClient] = None
+        self._price_locks: Dict[str, asyncio.Lock] = {}
+        self._revalidations: Set[asyncio.Task] = set()
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
                 timeout=30.0,
-                limits=httpx.Limits(max_keepalive_connections=10),
+                limits=httpx.Limits(max_keepalive_connections=self.settings.fmp_max_concurrency),
+                transport=self._transport or self._build_transport(),
             )
         return self._client
 
+    def _build_transport(self) -> Optional[httpx.AsyncBaseTransport]:
+        """Record/replay transport from settings (None for the live API)."""
+        return get_transport(
+            self.settings.fmp_transport,
+            self.settings.fmp_archive_path,
+            FaultInjector(
+                latency_ms=self.settings.fmp_replay_latency_ms,
+                throttle_rate=self.settings.fmp_replay_throttle_rate,
+            ),
+        )
+
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP client (after pending background refreshes finish)."""
+        if self._revalidations:
+            await asyncio.gather(*self._revalidations, return_exceptions=True)
         if self._client and not self._client.is_closed:
             await self._client.aclose()
+        if _request_stats.coalesced or _request_stats.stale_hits:
+            logger.info(
+                f"FMP requests: {_request_stats.network} network, "
+                f"{_request_stats.cache_hits} cache hits, "
+                f"{_request_stats.coalesced} saved by coalescing, "
+                f"{_request_stats.stale_hits} served stale"
+            )
+        if self.offline and _request_stats.offline_stale:
+            logger.warning(
+                f"Offline mode: {_request_stats.offline_stale} responses served from "
+                f"expired cache entries (data may be stale)"
+            )
 
-    def _get_cache_path(self, endpoint: str, params: Dict[str, Any]) -> Path:
-        """Get cache file path for a request."""
-        # Create a cache key from endpoint and params
-        param_str = "_".join(f"{k}={v}" for k, v in sorted(params.items()) if k != "apikey")
-        cache_key = f"{endpoint.replace('/', '_')}_{param_str}.json"
-        return self.cache_dir / cache_key
-
-    def _is_cache_valid(self, cache_path: Path, max_age_hours: int = 24) -> bool:
-        """Check if cache file is still valid."""
-        if not cache_path.exists():
-            return False
-
-        mtime = datetime.fromtimestamp(cache_path.stat().st_mtime)
-        return datetime.now() - mtime < timedelta(hours=max_age_hours)
-
-    def _read_cache(self, cache_path: Path) -> Optional[Any]:
-        """Read data from cache."""
-        try:
-            with open(cache_path, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return None
+    def _cache_key(self, endpoint: str, params: Dict[str, Any]) -> str:
+        """Get cache key for a request (endpoint + params, without apikey)."""
+        return make_cache_key(endpoint, params)
 
-    def _write_cache(self, cache_path: Path, data: Any) -> None:
-        """Write data to cache."""
-        try:
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_path, "w") as f:
-                json.dump(data, f)
-        except IOError:
-            pass  # Silently fail cache writes
+    def request_stats(self) -> Dict[str, Any]:
+        """Process-wide request counters, including calls saved by coalescing."""
+        return {**asdict(_request_stats), "rate_limiter": self.rate_limiter.stats()}
 
-    @backoff.on_exception(
-        backoff.expo,
-        (httpx.HTTPStatusError, httpx.ConnectError),
-        max_tries=3,
-    )
     async def _request(
         self,
         endpoint: str,
@@ -122,16 +212,28 @@ class FMPClient:
         use_v4: bool = False,
         use_stable: bool = False,
         cache_hours: int = 24,
+        parse: Optional[Callable[[bytes], Any]] = None,
     ) -> Any:
         """
         Make an API request.
 
+        Identical concurrent requests are coalesced: only the first one goes
+        to the network and every other caller awaits its parsed result.
+
+        Endpoints listed in STALE_POLICIES return an expired cache entry
+        immediately and refresh it in the background. In offline mode the
+        latest cached entry is returned whatever its age (also for uncached
+        endpoints, cache_hours=0, whose last response is still stored);
+        expired ones are counted as stale. A miss raises FMPOfflineError.
+
         Args:
             endpoint: API endpoint (e.g., "/profile/AAPL")
             params: Query parameters
             use_v4: Use v4 API base URL
             use_stable: Use stable API base URL (for newer endpoints like DCF)
             cache_hours: Cache validity in hours (0 to disable)
+            parse: Parse the raw response body with this instead of JSON into
+                dicts. Such responses bypass the response cache.
 
         Returns:
             API response data
@@ -148,28 +250,126 @@ class FMPClient:
         url = f"{base}{endpoint}"
 
         # Check cache
+        cache_key = self._cache_key(endpoint, params)
+        if parse is not None:
+            cache_hours = 0
+        if self.offline:
+            entry = self.cache.get_entry(cache_key) if parse is None else None
+            if entry is None:
+                raise FMPOfflineError(f"Not cached (offline mode): {endpoint}")
+            if cache_hours > 0 and entry.is_fresh(cache_hours):
+                _request_stats.cache_hits += 1
+            else:
+                _request_stats.offline_stale += 1
+                logger.debug(f"Offline: serving {entry.age_hours:.1f}h old response for {endpoint}")
+            return entry.data
+
         if self.cache_enabled and cache_hours > 0:
-            cache_path = self._get_cache_path(endpoint, params)
-            if self._is_cache_valid(cache_path, cache_hours):
-                cached_data = self._read_cache(cache_path)
-                if cached_data is not None:
-                    return cached_data
+            entry = self.cache.get_entry(cache_key)
+            if entry is not None:
+                if entry.is_fresh(cache_hours):
+                    _request_stats.cache_hits += 1
+                    return entry.data
+                policy = get_stale_policy(endpoint)
+                if policy is not None and (
+                    policy.max_stale_hours is None or entry.is_fresh(policy.max_stale_hours)
+                ):
+                    _request_stats.stale_hits += 1
+                    self._revalidate(base, endpoint, url, params, cache_key, cache_hours)
+                    return entry.data
+
+        return await self._fetch_coalesced(base, endpoint, url, params, cache_key, cache_hours, parse)
+
+    def _revalidate(
+        self,
+        base: str,
+        endpoint: str,
+        url: str,
+        params: Dict[str, Any],
+        cache_key: str,
+        cache_hours: int,
+    ) -> None:
+        """Refresh a stale cache entry in a background task."""
+        async def refresh() -> None:
+            try:
+                await self._fetch_coalesced(base, endpoint, url, params, cache_key, cache_hours)
+            except Exception as e:
+                logger.debug(f"Background refresh failed for {endpoint}: {e}")
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+
+    async def _fetch_coalesced(
+        self,
+        base: str,
+        endpoint: str,
+        url: str,
+        params: Dict[str, Any],
+        cache_key: str,
+        cache_hours: int,
+        parse: Optional[Callable[[bytes], Any]] = None,
+    ) -> Any:
+        """Fetch through the single-flight table and write the result to the cache."""
+        # Join an identical request that is already in flight
+        flight_key = f"{base}{cache_key}"
+        if parse is not None:
+            flight_key += f"#{parse.__name__}"
+        loop = asyncio.get_running_loop()
+        pending = _inflight.get(flight_key)
+        if pending is not None and pending.get_loop() is loop:
+            _request_stats.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = loop.create_future()
+        _inflight[flight_key] = future
+        try:
+            data = await self._fetch(url, params, parse)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                e = FMPError(f"Coalesced request cancelled: {endpoint}")
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(data)
+        finally:
+            if _inflight.get(flight_key) is future:
+                del _inflight[flight_key]
+
+        # Write to cache; uncached endpoints (cache_hours=0) are stored too,
+        # as the fallback offline mode serves
+        if self.cache_enabled and parse is None:
+            self.cache.set(cache_key, data, ttl_hours=cache_hours)
+
+        return data
 
-        # Make request
+    @backoff.on_exception(
+        backoff.expo,
+        (httpx.HTTPStatusError, httpx.ConnectError, FMPRateLimitError),
+        max_tries=3,
+    )
+    async def _fetch(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        parse: Optional[Callable[[bytes], Any]] = None,
+    ) -> Any:
+        """Perform one HTTP GET (with retries) and parse the body (JSON by default)."""
         client = await self._get_client()
-        response = await client.get(url, params=params)
+        _request_stats.network += 1
+
+        # Shared limiter enforces requests/minute and concurrency
+        async with self.rate_limiter.slot() as slot:
+            response = await client.get(url, params=params)
+            if response.status_code == 429:
+                slot.record_throttle(response.headers.get("Retry-After"))
 
         if response.status_code == 429:
             raise FMPRateLimitError("Rate limit exceeded")
 
         response.raise_for_status()
-        data = response.json()
-
-        # Write to cache
-        if self.cache_enabled and cache_hours > 0:
-            self._write_cache(cache_path, data)
-
-        return data
+        return parse(response.content) if parse is not None else response.json()
 
     # =========================================================================
     # Company Information
@@ -611,18 +811,31 @@ class FMPClient:
         ticker: str,
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
+        refresh: bool = False,
+        ohlcv_only: bool = False,
     ) -> Dict[str, Any]:
         """
         Get historical daily prices.
 
+        With ohlcv_only, date-bounded requests are served from the price
+        store, which only fetches the parts of the range it has not seen
+        before. The store keeps the PRICE_FIELDS columns only, so bars come
+        back without change, changePercent, unadjustedVolume, label and
+        changeOverTime; other requests return the full FMP response.
+
         Args:
             ticker: Stock ticker
             from_date: Start date (YYYY-MM-DD)
             to_date: End date (YYYY-MM-DD)
+            refresh: Re-fetch the whole range even if the store covers it
+            ohlcv_only: Caller only reads date, OHLC, adjClose, volume and vwap
 
         Returns:
             Historical price data
         """
+        if ohlcv_only and self.price_store is not None and from_date and to_date:
+            return await self._get_stored_prices(ticker, from_date, to_date, refresh)
+
         params = {}
         if from_date:
             params["from"] = from_date
@@ -631,6 +844,108 @@ class FMPClient:
 
         return await self._request(f"/historical-price-full/{ticker}", params=params)
 
+    async def get_price_columns(
+        self,
+        ticker: str,
+        from_date: str,
+        to_date: str,
+        refresh: bool = False,
+    ) -> PriceColumns:
+        """
+        Get daily prices as NumPy columns, oldest first.
+
+        Fast path for bulk downloads: responses are parsed straight into
+        columns (see data.price_columns) and never materialized as one dict
+        per bar.
+
+        Returns:
+            {"date": datetime64[D], "open", "high", "low", "close",
+            "adj_close", "volume", "vwap": float64} arrays (empty if no data)
+        """
+        if self.price_store is None:
+            data = await self.get_historical_prices(ticker, from_date, to_date)
+            bars = data.get("historical", []) if isinstance(data, dict) else []
+            return columns_from_bars(bars)
+
+        await self._fill_price_gaps(ticker, from_date, to_date, refresh)
+        return self.price_store.get_columns(ticker, from_date, to_date)
+
+    async def _get_stored_prices(
+        self,
+        ticker: str,
+        from_date: str,
+        to_date: str,
+        refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """Fill any gaps in the price store for the range, then answer from it."""
+        await self._fill_price_gaps(ticker, from_date, to_date, refresh)
+
+        bars = self.price_store.get_bars(ticker, from_date, to_date)
+        if not bars:
+            return {}
+        # FMP returns newest first
+        return {"symbol": ticker, "historical": bars[::-1]}
+
+    async def _fill_price_gaps(
+        self,
+        ticker: str,
+        from_date: str,
+        to_date: str,
+        refresh: bool = False,
+    ) -> None:
+        """
+        Fetch the parts of the range the price store has not seen yet.
+
+        Each gap is fetched together with the nearest stored bar on either
+        side. If those bars disagree with the store, history was rewritten
+        (a split) since it was stored: the ticker is invalidated and the rest
+        of the range is fetched again.
+        """
+        lock = self._price_locks.setdefault(ticker, asyncio.Lock())
+        async with lock:
+            for _ in range(2):
+                if self.offline:
+                    gaps = []
+                elif refresh:
+                    gaps = [(from_date, to_date)]
+                else:
+                    gaps = self.price_store.missing_ranges(ticker, from_date, to_date)
+                if not gaps:
+                    return
+
+                ranges = [self.price_store.overlap_range(ticker, start, end) for start, end in gaps]
+                responses = await asyncio.gather(*[
+                    self._request(
+                        f"/historical-price-full/{ticker}",
+                        params={"from": start, "to": end},
+                        parse=parse_price_payload,
+                    )
+                    for start, end in ranges
+                ])
+
+                fetched = []
+                for (start, end), columns in zip(ranges, responses):
+                    if columns is None:
+                        # Not price data (error payload): leave the range uncovered to retry later
+                        logger.debug(f"{ticker}: no historical prices in response for {start}..{end}")
+                        continue
+                    fetched.append((start, end, columns))
+
+                rewritten = not all(self.price_store.matches(ticker, columns) for *_, columns in fetched)
+                if rewritten:
+                    logger.info(f"{ticker}: stored prices disagree with FMP (split?), re-fetching")
+                    self.price_store.invalidate(ticker)
+                for start, end, columns in fetched:
+                    self.price_store.add_columns(ticker, columns, start, end)
+                if not rewritten:
+                    return
+                refresh = False
+
+    def invalidate_prices(self, ticker: str) -> None:
+        """Forget stored daily prices for a ticker (e.g. after a split)."""
+        if self.price_store is not None:
+            self.price_store.invalidate(ticker)
+
     async def get_price_history(
         self,
         ticker: str,
@@ -1285,16 +1600,63 @@ class FMPClient:
         """
         return await self._request("/most-actives", use_stable=True, cache_hours=1)
 
-    async def get_batch_quotes(self, tickers: List[str]) -> List[Dict[str, Any]]:
+    async def get_batch_quotes(
+        self,
+        tickers: List[str],
+        chunk_size: int = 50,
+        missing: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        Get quotes for multiple tickers in one call.
+        Get quotes for any number of tickers.
+
+        Symbols are upper-cased and split into chunks the endpoint accepts,
+        and the chunks are requested concurrently under the shared rate
+        limiter. Quotes come back in input order.
+
+        Args:
+            tickers: Symbols to quote
+            chunk_size: Symbols per request
+            missing: If given, extended with symbols that got no quote
+                (failed chunk or unknown symbol)
 
-        More efficient than calling get_quote() for each ticker.
+        Raises:
+            FMPError: If every chunk request failed
         """
         if not tickers:
             return []
-        symbols = ",".join(tickers[:50])  # Limit to 50 per batch
-        return await self._request(f"/quote/{symbols}", cache_hours=0)
+
+        symbols = list(dict.fromkeys(t.strip().upper() for t in tickers))  # De-duplicate, keep order
+        chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+        results = await asyncio.gather(
+            *[self._request(f"/quote/{','.join(chunk)}", cache_hours=0) for chunk in chunks],
+            return_exceptions=True,
+        )
+
+        errors = [result for result in results if isinstance(result, Exception)]
+        if len(errors) == len(chunks):
+            raise errors[0]
+
+        by_symbol: Dict[str, Dict[str, Any]] = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Quote request failed for {len(chunk)} tickers ({chunk[0]}...): {result}")
+                continue
+            if not isinstance(result, list):
+                logger.warning(f"Unexpected quote response for {len(chunk)} tickers ({chunk[0]}...): {result!r:.200}")
+                continue
+            for quote in result:
+                if isinstance(quote, dict) and quote.get("symbol"):
+                    by_symbol[quote["symbol"].upper()] = quote
+
+        absent = [t for t in symbols if t not in by_symbol]
+        if absent:
+            logger.warning(f"No quote for {len(absent)} tickers: "
+                           f"{absent[:10]}{'...' if len(absent) > 10 else ''}")
+            if missing is not None:
+                missing.extend(absent)
+
+        return [by_symbol[t] for t in symbols if t in by_symbol]
 
     async def get_stock_screener(
         self,
@@ -0,0 +1,128 @@
+"""
+Columnar daily price data.
+
+Multi-year historical-price-full responses are parsed straight from the
+response bytes into typed NumPy columns (ascending by date) by Arrow's JSON
+reader, so no dict is ever created per bar.
+"""
+
+import io
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pa_json
+
+# Column -> FMP field, in storage order
+PRICE_FIELDS = [
+    ("open", "open"),
+    ("high", "high"),
+    ("low", "low"),
+    ("close", "close"),
+    ("adj_close", "adjClose"),
+    ("volume", "volume"),
+    ("vwap", "vwap"),
+]
+
+# {"date": datetime64[D] array, "open": float64 array, ...}, ascending by date
+PriceColumns = Dict[str, np.ndarray]
+
+
+def empty_columns() -> PriceColumns:
+    columns = {"date": np.array([], dtype="datetime64[D]")}
+    columns.update({col: np.array([], dtype=np.float64) for col, _ in PRICE_FIELDS})
+    return columns
+
+
+def columns_from_bars(bars: List[Dict[str, Any]]) -> PriceColumns:
+    """
+    Build columns from FMP ``historical`` bars (either date order).
+
+    Bars without a date or close are dropped; missing fields become NaN.
+    """
+    bars = [b for b in bars if b.get("date") and b.get("close") is not None]
+    if not bars:
+        return empty_columns()
+
+    # Date strings sort chronologically, so this replaces a full sort when
+    # the payload is already newest-first (the FMP default)
+    if bars[0]["date"] > bars[-1]["date"]:
+        bars = bars[::-1]
+
+    n = len(bars)
+    columns = {"date": np.array([b["date"][:10] for b in bars], dtype="datetime64[D]")}
+    for col, field in PRICE_FIELDS:
+        columns[col] = np.fromiter(
+            (np.nan if (v := b.get(field)) is None else v for b in bars),
+            dtype=np.float64,
+            count=n,
+        )
+
+    if n > 1 and not (np.diff(columns["date"]) > np.timedelta64(0, "D")).all():
+        order = np.argsort(columns["date"], kind="stable")
+        columns = {name: values[order] for name, values in columns.items()}
+    return columns
+
+
+# historical-price-full body; other fields (symbol, label, change...) are skipped
+_PAYLOAD_SCHEMA = pa.schema([
+    ("historical", pa.list_(pa.struct(
+        [("date", pa.string())] + [(field, pa.float64()) for _, field in PRICE_FIELDS]
+    ))),
+])
+
+_PAYLOAD_OPTIONS = pa_json.ParseOptions(
+    explicit_schema=_PAYLOAD_SCHEMA,
+    unexpected_field_behavior="ignore",
+    newlines_in_values=True,  # FMP pretty-prints its responses
+)
+
+
+def parse_price_payload(content: bytes) -> Optional[PriceColumns]:
+    """
+    Parse a raw historical-price-full response body into columns.
+
+    An empty ``historical`` list or an empty object ``{}`` (what FMP sends
+    for a range without bars, e.g. before an IPO) gives empty columns.
+    Returns None for error payloads and malformed bodies, which are not
+    price data.
+    """
+    if len(content) < 16 and b"".join(content.split()) == b"{}":
+        return empty_columns()
+    try:
+        table = pa_json.read_json(io.BytesIO(content), parse_options=_PAYLOAD_OPTIONS)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    historical = table.column("historical").combine_chunks()
+    if len(historical) != 1 or historical.null_count:
+        return None
+
+    bars = historical.flatten()
+    # Bars without a date or close are dropped, as in columns_from_bars
+    bars = bars.filter(pc.and_(bars.field("date").is_valid(), bars.field("close").is_valid()))
+    if not len(bars):
+        return empty_columns()
+
+    dates = pc.utf8_slice_codeunits(bars.field("date"), 0, 10).cast(pa.date32())
+    columns = {"date": dates.to_numpy(zero_copy_only=False).astype("datetime64[D]")}
+    for col, field in PRICE_FIELDS:
+        columns[col] = bars.field(field).to_numpy(zero_copy_only=False).astype(np.float64)
+
+    # Newest first (the FMP default) reverses cheaply; anything else is sorted
+    dates = columns["date"]
+    if len(dates) > 1 and dates[0] > dates[-1]:
+        columns = {name: values[::-1].copy() for name, values in columns.items()}
+    if len(dates) > 1 and not (np.diff(columns["date"]) > np.timedelta64(0, "D")).all():
+        order = np.argsort(columns["date"], kind="stable")
+        columns = {name: values[order] for name, values in columns.items()}
+    return columns
+
+
+def slice_columns(columns: PriceColumns, start: Optional[str] = None, end: Optional[str] = None) -> PriceColumns:
+    """Rows with start <= date <= end (ISO dates)."""
+    dates = columns["date"]
+    lo = np.searchsorted(dates, np.datetime64(start, "D"), side="left") if start else 0
+    hi = np.searchsorted(dates, np.datetime64(end, "D"), side="right") if end else len(dates)
+    return {name: values[lo:hi] for name, values in columns.items()}
+
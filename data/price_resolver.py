@@ -0,0 +1,124 @@
+"""
+Bulk closing-price lookups.
+
+Backtests ask for the close of many (ticker, date) pairs. Instead of one
+windowed request per pair, the resolver loads each ticker's daily series
+once over the span of all its requested dates (the price store only
+fetches ranges it has not seen) and answers lookups with searchsorted.
+"""
+
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.fmp_client import FMPClient
+
+logger = logging.getLogger(__name__)
+
+# A lookup uses the first bar on/after the date, else the last bar before it,
+# within this many calendar days
+WINDOW_DAYS = 10
+
+
+def _shift(value: str, days: int) -> str:
+    return (date.fromisoformat(value[:10]) + timedelta(days=days)).isoformat()
+
+
+class PriceResolver:
+    """
+    Closing prices for (ticker, date) lookups, one loaded series per ticker.
+    """
+
+    def __init__(self, fmp: FMPClient, window_days: int = WINDOW_DAYS):
+        self.fmp = fmp
+        self.window_days = window_days
+        # ticker -> (dates datetime64[D], closes float64), ascending
+        self._series: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # ticker -> (start, end) range the series was loaded for
+        self._ranges: Dict[str, Tuple[str, str]] = {}
+
+    async def prefetch(
+        self,
+        requests: Iterable[Tuple[str, str]],
+        max_concurrent: Optional[int] = None,
+    ) -> None:
+        """
+        Load series so every (ticker, date) in requests resolves locally.
+
+        Tickers already loaded over a wide enough range are skipped; others
+        are (re)loaded once over the union of old and new ranges.
+        """
+        spans: Dict[str, Tuple[str, str]] = {}
+        for ticker, target_date in requests:
+            start = _shift(target_date, -self.window_days)
+            end = _shift(target_date, self.window_days)
+            if ticker in spans:
+                start = min(start, spans[ticker][0])
+                end = max(end, spans[ticker][1])
+            spans[ticker] = (start, end)
+
+        to_load = []
+        for ticker, (start, end) in spans.items():
+            loaded = self._ranges.get(ticker)
+            if loaded is not None:
+                if loaded[0] <= start and end <= loaded[1]:
+                    continue
+                start, end = min(start, loaded[0]), max(end, loaded[1])
+            to_load.append((ticker, start, end))
+        if not to_load:
+            return
+
+        pending = iter(to_load)
+
+        async def loader() -> None:
+            for ticker, start, end in pending:
+                try:
+                    columns = await self.fmp.get_price_columns(ticker, start, end)
+                except Exception as e:
+                    logger.warning(f"Failed to load prices for {ticker}: {e}")
+                    continue
+                keep = ~np.isnan(columns["close"])
+                self._series[ticker] = (columns["date"][keep], columns["close"][keep])
+                self._ranges[ticker] = (start, end)
+
+        workers = max_concurrent or self.fmp.settings.fmp_max_concurrency
+        await asyncio.gather(*[loader() for _ in range(min(workers, len(to_load)))])
+        logger.debug(f"Loaded price series for {len(to_load)} tickers")
+
+    def prices_on(self, ticker: str, dates: Sequence[str]) -> np.ndarray:
+        """Closes for one ticker on each date (NaN where no bar is in the window)."""
+        targets = np.array([d[:10] for d in dates], dtype="datetime64[D]")
+        result = np.full(len(targets), np.nan)
+        series = self._series.get(ticker)
+        if series is None or not len(series[0]):
+            return result
+
+        bar_dates, closes = series
+        window = np.timedelta64(self.window_days, "D")
+        after = np.searchsorted(bar_dates, targets, side="left")
+
+        # First bar on or after the date
+        has_after = after < len(bar_dates)
+        after_ok = has_after.copy()
+        after_ok[has_after] = bar_dates[after[has_after]] <= targets[has_after] + window
+        result[after_ok] = closes[after[after_ok]]
+
+        # Otherwise the last bar before it
+        before = after - 1
+        before_ok = ~after_ok & (before >= 0)
+        before_ok[before_ok] = bar_dates[before[before_ok]] >= targets[before_ok] - window
+        result[before_ok] = closes[before[before_ok]]
+        return result
+
+    def price_on(self, ticker: str, target_date: str) -> Optional[float]:
+        """Close on or near a date from loaded data (None if unavailable)."""
+        price = self.prices_on(ticker, [target_date])[0]
+        return None if np.isnan(price) else float(price)
+
+    async def get_price_on_date(self, ticker: str, target_date: str) -> Optional[float]:
+        """Close on or near a date, loading the ticker's series if needed."""
+        await self.prefetch([(ticker, target_date)])
+        return self.price_on(ticker, target_date)
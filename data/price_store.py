@@ -0,0 +1,472 @@
+"""
+Range-merging daily price store.
+
+Keeps one sorted, de-duplicated OHLCV series per ticker plus the list of
+date ranges that have already been fetched. Any later range request is
+answered locally and only the uncovered gaps go to FMP, instead of caching
+every requested window as its own overlapping response.
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from data.price_columns import PRICE_FIELDS, PriceColumns, empty_columns
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_NAME = "prices.sqlite3"
+
+# Stored bar fields: (column, FMP field)
+BAR_FIELDS = PRICE_FIELDS
+
+DateRange = Tuple[str, str]
+
+# Gaps between consecutive bars longer than this (days) are indexed; shorter
+# runs (weekends, holidays) cannot hide a window of +/-3 days or more
+MIN_GAP_DAYS = 7
+
+
+def _to_date(value: str) -> date:
+    return date.fromisoformat(value[:10])
+
+
+def _shift(value: str, days: int) -> str:
+    return (_to_date(value) + timedelta(days=days)).isoformat()
+
+
+def merge_ranges(ranges: Iterable[DateRange]) -> List[DateRange]:
+    """Merge overlapping or adjacent (next-day) date ranges."""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= _shift(merged[-1][1], 1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(start: str, end: str, covered: Iterable[DateRange]) -> List[DateRange]:
+    """Return the parts of [start, end] not inside any covered range."""
+    gaps: List[DateRange] = []
+    cursor = start
+    for c_start, c_end in merge_ranges(covered):
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, _shift(c_start, -1)))
+        cursor = _shift(c_end, 1)
+        if cursor > end:
+            return gaps
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class PriceStore:
+    """
+    SQLite-backed per-ticker daily bar store with coverage tracking.
+
+    Coverage never extends past yesterday, so today's (possibly partial)
+    bar is re-fetched on the next request.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            columns = ", ".join(
+                f"{col} {'INTEGER' if col == 'volume' else 'REAL'}" for col, _ in BAR_FIELDS
+            )
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS prices ("
+                f" ticker TEXT NOT NULL, date TEXT NOT NULL, {columns},"
+                f" PRIMARY KEY (ticker, date)) WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS coverage ("
+                " ticker TEXT NOT NULL, start_date TEXT NOT NULL, end_date TEXT NOT NULL,"
+                " PRIMARY KEY (ticker, start_date)) WITHOUT ROWID"
+            )
+            self._conn = conn
+        return self._conn
+
+    # ------------------------------------------------------------------
+    # Coverage
+    # ------------------------------------------------------------------
+
+    def get_coverage(self, ticker: str) -> List[DateRange]:
+        """Date ranges already fetched for a ticker, sorted."""
+        return [
+            (row[0], row[1])
+            for row in self.conn.execute(
+                "SELECT start_date, end_date FROM coverage WHERE ticker = ? ORDER BY start_date",
+                (ticker,),
+            )
+        ]
+
+    def missing_ranges(self, ticker: str, start: str, end: str) -> List[DateRange]:
+        """Sub-ranges of [start, end] that still need to be fetched."""
+        return subtract_ranges(start, end, self.get_coverage(ticker))
+
+    def overlap_range(self, ticker: str, start: str, end: str) -> DateRange:
+        """
+        [start, end] widened to the nearest stored bar on each side.
+
+        A fetch of the widened range overlaps the store by a bar at each end,
+        which matches() uses to detect history rewritten since (a split).
+        """
+        (before,) = self.conn.execute(
+            "SELECT MAX(date) FROM prices WHERE ticker = ? AND date < ?", (ticker, start)
+        ).fetchone()
+        (after,) = self.conn.execute(
+            "SELECT MIN(date) FROM prices WHERE ticker = ? AND date > ?", (ticker, end)
+        ).fetchone()
+        return before or start, after or end
+
+    def matches(self, ticker: str, columns: PriceColumns, rtol: float = 1e-4) -> bool:
+        """
+        Whether fetched bars agree with the stored ones on shared dates.
+
+        Only bars inside fetched coverage are compared; the latest bar may
+        have been stored mid-session and is expected to change.
+        """
+        if not len(columns["date"]):
+            return True
+        dates = columns["date"].astype(str)
+        stored = self.conn.execute(
+            "SELECT date, close FROM prices WHERE ticker = ? AND date BETWEEN ? AND ?",
+            (ticker, dates[0], dates[-1]),
+        ).fetchall()
+        coverage = self.get_coverage(ticker)
+        stored_close = {
+            d: c for d, c in stored
+            if c is not None and any(s <= d <= e for s, e in coverage)
+        }
+        if not stored_close:
+            return True
+        for d, close in zip(dates.tolist(), columns["close"].tolist()):
+            old = stored_close.get(d)
+            if old is not None and close == close and not np.isclose(close, old, rtol=rtol):
+                return False
+        return True
+
+    def _add_coverage(self, ticker: str, start: str, end: str) -> None:
+        yesterday = (datetime.now().date() - timedelta(days=1)).isoformat()
+        end = min(end, yesterday)
+        if end < start:
+            return
+        merged = merge_ranges(self.get_coverage(ticker) + [(start, end)])
+        self.conn.execute("DELETE FROM coverage WHERE ticker = ?", (ticker,))
+        self.conn.executemany(
+            "INSERT INTO coverage (ticker, start_date, end_date) VALUES (?, ?, ?)",
+            [(ticker, s, e) for s, e in merged],
+        )
+
+    # ------------------------------------------------------------------
+    # Bars
+    # ------------------------------------------------------------------
+
+    def add_bars(
+        self,
+        ticker: str,
+        bars: List[Dict[str, Any]],
+        start: str,
+        end: str,
+    ) -> int:
+        """
+        Merge FMP ``historical`` bars for [start, end] into the store.
+
+        The range is marked covered even if it has no bars (e.g. before IPO),
+        so it is never requested again. Callers pass only well-formed
+        ``historical`` responses; error payloads must not be stored.
+
+        Returns:
+            Number of bars written
+        """
+        rows = []
+        for bar in bars:
+            bar_date = bar.get("date")
+            if not bar_date or bar.get("close") is None:
+                continue
+            rows.append((ticker, bar_date[:10], *[bar.get(field) for _, field in BAR_FIELDS]))
+        return self._write_rows(ticker, rows, start, end)
+
+    def add_columns(self, ticker: str, columns: PriceColumns, start: str, end: str) -> int:
+        """Columnar variant of add_bars (see data.price_columns)."""
+        dates = columns["date"].astype(str).tolist()
+        values = []
+        for col, _ in BAR_FIELDS:
+            column = columns[col]
+            # SQLite stores NaN as NULL; volume goes back to INTEGER
+            column = [None if v != v else v for v in column.tolist()]
+            if col == "volume":
+                column = [None if v is None else int(v) for v in column]
+            values.append(column)
+        rows = [(ticker, d, *row) for d, *row in zip(dates, *values)]
+        return self._write_rows(ticker, rows, start, end)
+
+    def _write_rows(self, ticker: str, rows: List[Tuple], start: str, end: str) -> int:
+        placeholders = ", ".join("?" for _ in range(len(BAR_FIELDS) + 2))
+        conn = self.conn
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(f"INSERT OR REPLACE INTO prices VALUES ({placeholders})", rows)
+            self._add_coverage(ticker, start, end)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def get_bars(
+        self,
+        ticker: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Stored bars for a ticker in ascending date order, with FMP field names."""
+        query = f"SELECT date, {', '.join(col for col, _ in BAR_FIELDS)} FROM prices WHERE ticker = ?"
+        params: List[Any] = [ticker]
+        if start:
+            query += " AND date >= ?"
+            params.append(start)
+        if end:
+            query += " AND date <= ?"
+            params.append(end)
+        query += " ORDER BY date"
+
+        return [
+            {"date": row[0], **{field: row[i + 1] for i, (_, field) in enumerate(BAR_FIELDS)}}
+            for row in self.conn.execute(query, params)
+        ]
+
+    def get_columns(
+        self,
+        ticker: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> PriceColumns:
+        """Stored bars for a ticker as ascending NumPy columns (no per-bar dicts)."""
+        query = f"SELECT date, {', '.join(col for col, _ in BAR_FIELDS)} FROM prices WHERE ticker = ?"
+        params: List[Any] = [ticker]
+        if start:
+            query += " AND date >= ?"
+            params.append(start)
+        if end:
+            query += " AND date <= ?"
+            params.append(end)
+        query += " ORDER BY date"
+
+        rows = self.conn.execute(query, params).fetchall()
+        if not rows:
+            return empty_columns()
+        fields = list(zip(*rows))
+        columns = {"date": np.array(fields[0], dtype="datetime64[D]")}
+        for i, (col, _) in enumerate(BAR_FIELDS):
+            # None -> NaN
+            columns[col] = np.array(fields[i + 1], dtype=np.float64)
+        return columns
+
+    def invalidate(self, ticker: str) -> None:
+        """Drop all bars and coverage for a ticker (e.g. after a split)."""
+        conn = self.conn
+        conn.execute("DELETE FROM prices WHERE ticker = ?", (ticker,))
+        conn.execute("DELETE FROM coverage WHERE ticker = ?", (ticker,))
+
+    def coverage_index(self) -> "PriceCoverageIndex":
+        """Index of every ticker's bar span and gaps (see PriceCoverageIndex)."""
+        index = PriceCoverageIndex(self)
+        index.refresh()
+        return index
+
+    def tickers(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT ticker FROM coverage")]
+
+    def stats(self) -> Dict[str, Any]:
+        self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        (bars,) = self.conn.execute("SELECT COUNT(*) FROM prices").fetchone()
+        (tickers,) = self.conn.execute("SELECT COUNT(DISTINCT ticker) FROM coverage").fetchone()
+        return {
+            "db_path": str(self.db_path),
+            "tickers": tickers,
+            "bars": bars,
+            "file_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0,
+        }
+
+    def import_json_dir(self, cache_dir: Path) -> Tuple[int, int]:
+        """
+        Import legacy ``_historical-price-full_{T}_from=..._to=....json`` files.
+
+        Returns:
+            Tuple of (files imported, bars written)
+        """
+        files = bars_written = 0
+        for path in Path(cache_dir).glob("_historical-price-full_*_from=*_to=*.json"):
+            ticker, _, rest = path.stem[len("_historical-price-full_"):].partition("_from=")
+            start, _, end = rest.partition("_to=")
+            if not ticker or not start or not end:
+                continue
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            historical = data.get("historical", [] if data == {} else None) if isinstance(data, dict) else None
+            if not isinstance(historical, list):
+                continue  # Error response: the range was never really fetched
+            bars_written += self.add_bars(ticker, historical, start, end)
+            files += 1
+            if files % 500 == 0:
+                logger.info(f"Imported {files} price files...")
+        return files, bars_written
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _day(value: str) -> int:
+    return int(np.datetime64(value[:10], "D").astype(np.int64))
+
+
+class PriceCoverageIndex:
+    """
+    Which tickers have bars around a date, for the whole store in one query.
+
+    Keeps per ticker the first and last bar, the gaps between bars longer
+    than MIN_GAP_DAYS and the fetched date ranges, flattened into arrays so
+    a window lookup is a few vectorized comparisons. A ticker whose window
+    has no bars but was never fully fetched is reported as unknown rather
+    than missing, so callers can still ask the API.
+    """
+
+    def __init__(self, store: PriceStore):
+        self.store = store
+        # ticker -> (first day, last day, [(gap start, gap end)], [(covered start, covered end)])
+        self._entries: Dict[str, Tuple[Optional[int], Optional[int], List, List]] = {}
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        self._positions: Dict[str, int] = {}
+
+    def refresh(self, tickers: Optional[Iterable[str]] = None) -> None:
+        """(Re)load entries for some tickers, or the whole store."""
+        if tickers is None:
+            self._entries = {}
+            self._load("", [])
+        else:
+            tickers = list(dict.fromkeys(tickers))
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                for ticker in chunk:
+                    self._entries.pop(ticker, None)
+                self._load(f" WHERE ticker IN ({', '.join('?' for _ in chunk)})", chunk)
+        self._arrays = None
+
+    def _load(self, where: str, params: List[str]) -> None:
+        conn = self.store.conn
+        bounds = {
+            ticker: (_day(first), _day(last))
+            for ticker, first, last in conn.execute(
+                f"SELECT ticker, MIN(date), MAX(date) FROM prices{where} GROUP BY ticker", params
+            )
+        }
+        gaps: Dict[str, List[Tuple[int, int]]] = {}
+        for ticker, prev, curr in conn.execute(
+            f"SELECT ticker, prev, date FROM ("
+            f" SELECT ticker, date, LAG(date) OVER (PARTITION BY ticker ORDER BY date) AS prev"
+            f" FROM prices{where}) WHERE julianday(date) - julianday(prev) > ?",
+            [*params, MIN_GAP_DAYS],
+        ):
+            gaps.setdefault(ticker, []).append((_day(prev), _day(curr)))
+        covered: Dict[str, List[Tuple[int, int]]] = {}
+        for ticker, start, end in conn.execute(
+            f"SELECT ticker, start_date, end_date FROM coverage{where}", params
+        ):
+            covered.setdefault(ticker, []).append((_day(start), _day(end)))
+
+        for ticker in bounds.keys() | covered.keys():
+            first, last = bounds.get(ticker, (None, None))
+            self._entries[ticker] = (first, last, gaps.get(ticker, []), covered.get(ticker, []))
+
+    def _flat(self) -> Dict[str, np.ndarray]:
+        if self._arrays is None:
+            tickers = list(self._entries)
+            self._positions = {t: i for i, t in enumerate(tickers)}
+            none = np.iinfo(np.int64).max
+            entries = [self._entries[t] for t in tickers]
+            gaps = [(i, s, e) for i, entry in enumerate(entries) for s, e in entry[2]]
+            covered = [(i, s, e) for i, entry in enumerate(entries) for s, e in entry[3]]
+            self._arrays = {
+                # No bars: first after and last before any date
+                "first": np.array([none if e[0] is None else e[0] for e in entries], dtype=np.int64),
+                "last": np.array([-none if e[1] is None else e[1] for e in entries], dtype=np.int64),
+                "gaps": np.array(gaps, dtype=np.int64).reshape(-1, 3),
+                "covered": np.array(covered, dtype=np.int64).reshape(-1, 3),
+            }
+        return self._arrays
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._entries
+
+    def has_data(self, tickers: Iterable[str], target_date: str, days: int = 30) -> Dict[str, Optional[bool]]:
+        """
+        Whether each ticker has a bar within +/-days of target_date.
+
+        Returns:
+            ticker -> True, False, or None when the store cannot tell
+            (ticker never seen, or the window not fully fetched)
+        """
+        arrays = self._flat()
+        center = _day(target_date)
+        lo = center - days
+        hi = center + days
+
+        has = (arrays["first"] <= hi) & (arrays["last"] >= lo)
+        gaps = arrays["gaps"]
+        inside = (gaps[:, 1] < lo) & (gaps[:, 2] > hi)
+        has[gaps[inside, 0]] = False
+
+        # Coverage stops at yesterday, so only the past part of the window must be fetched
+        yesterday = _day((datetime.now().date() - timedelta(days=1)).isoformat())
+        covered = arrays["covered"]
+        known = np.zeros(len(has), dtype=bool)
+        spans = (covered[:, 1] <= lo) & (covered[:, 2] >= min(hi, max(lo, yesterday)))
+        known[covered[spans, 0]] = True
+
+        result: Dict[str, Optional[bool]] = {}
+        for ticker in tickers:
+            i = self._positions.get(ticker)
+            if i is None:
+                result[ticker] = None
+            elif has[i]:
+                result[ticker] = True
+            else:
+                result[ticker] = False if known[i] else None
+        return result
+
+
+_STORES: Dict[str, PriceStore] = {}
+
+
+def get_price_store(db_path: Path) -> PriceStore:
+    """Get the shared price store for a database path."""
+    key = str(db_path)
+    if key not in _STORES:
+        _STORES[key] = PriceStore(Path(db_path))
+    return _STORES[key]
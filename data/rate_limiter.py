@@ -0,0 +1,191 @@
+"""
+Process-wide rate limiting for FMP traffic.
+
+Combines a token bucket (requests per minute from settings) with an AIMD
+concurrency window: every healthy response widens the window a little,
+while 429s and latency blow-ups shrink it multiplicatively. All FMPClient
+instances in a process share one limiter, so callers no longer need their
+own sleeps or semaphores.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    """One in-flight request; records the outcome on exit."""
+
+    def __init__(self, limiter: "AdaptiveRateLimiter"):
+        self.limiter = limiter
+        self.throttled = False
+        self.retry_after: Optional[float] = None
+        self._start = 0.0
+
+    def record_throttle(self, retry_after: Optional[Any] = None) -> None:
+        """Mark this request as rate limited (HTTP 429)."""
+        self.throttled = True
+        try:
+            self.retry_after = float(retry_after) if retry_after is not None else None
+        except (TypeError, ValueError):
+            self.retry_after = None
+
+    async def __aenter__(self) -> "_Slot":
+        await self.limiter._acquire()
+        self._start = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        latency = time.monotonic() - self._start
+        if self.throttled:
+            self.limiter._on_throttle(self.retry_after)
+        elif exc_type is None:
+            self.limiter._on_success(latency)
+        await self.limiter._release()
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket + AIMD concurrency limiter.
+
+    Args:
+        requests_per_minute: Sustained request rate
+        max_concurrency: Upper bound for the concurrency window
+        min_concurrency: Lower bound for the concurrency window
+        initial_concurrency: Starting window size
+        latency_factor: Shrink the window when a response is this many times
+            slower than the best smoothed latency seen so far
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 300,
+        max_concurrency: int = 20,
+        min_concurrency: int = 1,
+        initial_concurrency: int = 5,
+        latency_factor: float = 3.0,
+    ):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, self.rate)  # Allow up to one second of burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.latency_factor = latency_factor
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._latency_ewma: Optional[float] = None
+        self._best_latency: Optional[float] = None
+
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Counters
+        self.total_requests = 0
+        self.throttled_requests = 0
+        self.total_wait_seconds = 0.0
+
+    def slot(self) -> _Slot:
+        """
+        Context manager wrapping one HTTP call.
+
+        Usage:
+            async with limiter.slot() as slot:
+                response = await client.get(url)
+                if response.status_code == 429:
+                    slot.record_throttle(response.headers.get("Retry-After"))
+        """
+        return _Slot(self)
+
+    def _get_condition(self) -> asyncio.Condition:
+        # asyncio primitives are bound to one loop; scripts may call asyncio.run() more than once
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self._in_flight = 0
+        return self._condition
+
+    async def _acquire(self) -> None:
+        start = time.monotonic()
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < int(self.concurrency))
+            self._in_flight += 1
+        try:
+            await self._take_token()
+        except BaseException:
+            await self._release()
+            raise
+        self.total_requests += 1
+        self.total_wait_seconds += time.monotonic() - start
+
+    async def _release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            condition.notify_all()
+
+    async def _take_token(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def _on_success(self, latency: float) -> None:
+        self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+        if self._best_latency is None or self._latency_ewma < self._best_latency:
+            self._best_latency = self._latency_ewma
+
+        if latency > self._best_latency * self.latency_factor:
+            # Server is queueing our requests: back off gently
+            self.concurrency = max(self.min_concurrency, self.concurrency * 0.9)
+        else:
+            # Additive increase: roughly +1 per window of successful requests
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+
+    def _on_throttle(self, retry_after: Optional[float]) -> None:
+        self.throttled_requests += 1
+        self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+        # Empty the bucket and pause everyone until the server is ready again
+        self._tokens = 0.0
+        pause = retry_after if retry_after is not None else 1.0
+        self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        logger.warning(
+            f"FMP rate limit hit; concurrency window now {self.concurrency:.1f}, pausing {pause:.1f}s"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.total_requests,
+            "throttled": self.throttled_requests,
+            "concurrency_window": round(self.concurrency, 2),
+            "latency_ewma_ms": round(self._latency_ewma * 1000, 1) if self._latency_ewma else None,
+            "avg_wait_ms": round(self.total_wait_seconds / self.total_requests * 1000, 1)
+            if self.total_requests else 0.0,
+        }
+
+
+_LIMITERS: Dict[int, AdaptiveRateLimiter] = {}
+
+
+def get_rate_limiter(requests_per_minute: int, max_concurrency: int = 20) -> AdaptiveRateLimiter:
+    """Get the process-wide limiter for a given quota."""
+    limiter = _LIMITERS.get(requests_per_minute)
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(requests_per_minute, max_concurrency=max_concurrency)
+        _LIMITERS[requests_per_minute] = limiter
+    return limiter
@@ -0,0 +1,283 @@
+"""
+Response cache backends for the FMP client.
+
+The default backend keeps every cached response in a single SQLite file,
+keyed by endpoint + params, with zlib-compressed JSON values and TTL
+metadata. The legacy one-JSON-file-per-request layout is still available
+as the "json" backend.
+
+Use manage_cache.py to import an existing data/cache/*.json tree.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("data/cache")
+DEFAULT_DB_NAME = "fmp_cache.sqlite3"
+
+
+def make_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    Build the cache key for a request.
+
+    Matches the legacy JSON file naming (minus the ``.json`` suffix) so that
+    existing cache files can be imported one-to-one.
+    """
+    param_str = "_".join(f"{k}={v}" for k, v in sorted(params.items()) if k != "apikey")
+    return f"{endpoint.replace('/', '_')}_{param_str}"
+
+
+@dataclass
+class CacheEntry:
+    """A cached response with its TTL metadata."""
+
+    data: Any
+    created_at: float  # Unix timestamp
+    ttl_hours: float = 0.0
+
+    @property
+    def age_hours(self) -> float:
+        return (time.time() - self.created_at) / 3600
+
+    def is_fresh(self, max_age_hours: float) -> bool:
+        return self.age_hours < max_age_hours
+
+
+class CacheBackend:
+    """Interface for response cache backends."""
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the stored entry for a key, regardless of age."""
+        raise NotImplementedError
+
+    def set(self, key: str, data: Any, ttl_hours: float = 0.0) -> None:
+        """Store a response."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove a stored response."""
+        raise NotImplementedError
+
+    def get(self, key: str, max_age_hours: float) -> Optional[Any]:
+        """Return cached data if it is younger than max_age_hours."""
+        entry = self.get_entry(key)
+        if entry is None or not entry.is_fresh(max_age_hours):
+            return None
+        return entry.data
+
+    def close(self) -> None:
+        pass
+
+
+class JSONFileCache(CacheBackend):
+    """Legacy backend: one JSON file per request, TTL taken from file mtime."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        path = self._path(key)
+        try:
+            created_at = path.stat().st_mtime
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return CacheEntry(data=data, created_at=created_at)
+
+    def set(self, key: str, data: Any, ttl_hours: float = 0.0) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._path(key), "w") as f:
+                json.dump(data, f)
+        except IOError:
+            pass  # Silently fail cache writes
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Single-file indexed cache backed by SQLite.
+
+    Lookups are a primary-key read on one table, so they cost the same no
+    matter how many responses are stored. Values are compressed JSON.
+
+    If legacy_dir is set, a miss falls back to the old ``<key>.json`` file
+    and imports it, so an unmigrated cache directory keeps working.
+    """
+
+    def __init__(self, db_path: Path, legacy_dir: Optional[Path] = None, compression_level: int = 6):
+        self.db_path = Path(db_path)
+        self.legacy_dir = Path(legacy_dir) if legacy_dir else None
+        self.compression_level = compression_level
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " created_at REAL NOT NULL,"
+                " ttl_hours REAL NOT NULL DEFAULT 0,"
+                " value BLOB NOT NULL"
+                ")"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _encode(self, data: Any) -> bytes:
+        raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return zlib.compress(raw, self.compression_level)
+
+    @staticmethod
+    def _decode(blob: bytes) -> Any:
+        return json.loads(zlib.decompress(blob))
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        try:
+            row = self.conn.execute(
+                "SELECT value, created_at, ttl_hours FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                return CacheEntry(data=self._decode(row[0]), created_at=row[1], ttl_hours=row[2])
+        except (sqlite3.Error, zlib.error, json.JSONDecodeError) as e:
+            logger.debug(f"Cache read failed for {key}: {e}")
+            return None
+
+        if self.legacy_dir is not None:
+            entry = JSONFileCache(self.legacy_dir).get_entry(key)
+            if entry is not None:
+                self.set(key, entry.data, created_at=entry.created_at)
+            return entry
+        return None
+
+    def set(self, key: str, data: Any, ttl_hours: float = 0.0, created_at: Optional[float] = None) -> None:
+        try:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, created_at, ttl_hours, value) VALUES (?, ?, ?, ?)",
+                (key, created_at or time.time(), ttl_hours, self._encode(data)),
+            )
+        except sqlite3.Error as e:
+            logger.debug(f"Cache write failed for {key}: {e}")
+
+    def delete(self, key: str) -> None:
+        self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def purge(self, older_than_hours: float) -> int:
+        """Delete entries older than the given age. Returns rows removed."""
+        cutoff = time.time() - older_than_hours * 3600
+        cur = self.conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+        return cur.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        count, total_bytes = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM responses"
+        ).fetchone()
+        return {
+            "db_path": str(self.db_path),
+            "entries": count,
+            "compressed_bytes": total_bytes,
+            "file_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0,
+        }
+
+    def iter_keys(self) -> Iterator[Tuple[str, float]]:
+        yield from self.conn.execute("SELECT key, created_at FROM responses")
+
+    def import_json_dir(self, cache_dir: Path, delete: bool = False) -> Tuple[int, int]:
+        """
+        Import legacy ``*.json`` response files, keeping their mtime as created_at.
+
+        Returns:
+            Tuple of (imported, skipped) file counts
+        """
+        imported = skipped = 0
+        conn = self.conn
+        conn.execute("BEGIN")
+        try:
+            for path in Path(cache_dir).glob("*.json"):
+                try:
+                    created_at = path.stat().st_mtime
+                    with open(path, "r") as f:
+                        data = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    skipped += 1
+                    continue
+
+                existing = conn.execute(
+                    "SELECT created_at FROM responses WHERE key = ?", (path.stem,)
+                ).fetchone()
+                if existing is None or existing[0] < created_at:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, created_at, ttl_hours, value) VALUES (?, ?, 0, ?)",
+                        (path.stem, created_at, self._encode(data)),
+                    )
+                imported += 1
+
+                if imported % 500 == 0:
+                    logger.info(f"Imported {imported} cache files...")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        if delete:
+            for path in Path(cache_dir).glob("*.json"):
+                if self.get_entry(path.stem) is not None:
+                    path.unlink()
+
+        return imported, skipped
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# One backend per (kind, location) so every FMPClient in a process shares it
+_BACKENDS: Dict[Tuple[str, str], CacheBackend] = {}
+
+
+def get_cache_backend(kind: str, cache_dir: Path, db_path: Optional[Path] = None) -> CacheBackend:
+    """
+    Get the shared cache backend for this process.
+
+    Args:
+        kind: "sqlite" (default) or "json" (legacy per-file layout)
+        cache_dir: Cache directory
+        db_path: SQLite file (defaults to cache_dir / fmp_cache.sqlite3)
+    """
+    if kind == "json":
+        location = str(cache_dir)
+    elif kind == "sqlite":
+        location = str(db_path or Path(cache_dir) / DEFAULT_DB_NAME)
+    else:
+        raise ValueError(f"Unknown cache backend: {kind}")
+
+    backend = _BACKENDS.get((kind, location))
+    if backend is None:
+        if kind == "json":
+            backend = JSONFileCache(Path(location))
+        else:
+            backend = SQLiteCache(Path(location), legacy_dir=cache_dir)
+        _BACKENDS[(kind, location)] = backend
+    return backend
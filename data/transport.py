@@ -0,0 +1,244 @@
+"""
+Record/replay transports for the FMP client.
+
+RecordingTransport passes requests through to the live API and stores every
+response in an FMPArchive (one SQLite file, zlib-compressed bodies, keyed by
+path + query without the API key). ReplayTransport answers from an archive
+with optional latency and 429 injection, so scans and backtests can be
+benchmarked reproducibly without API quota. fmp_standin.py serves the same
+archive over HTTP.
+
+Select a transport with FMP_TRANSPORT=record|replay and FMP_ARCHIVE=<path>.
+For benchmarks, point CACHE_DIR at an empty directory so the response cache
+does not hide the transport.
+"""
+
+import asyncio
+import logging
+import random
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_NAME = "fmp_archive.sqlite3"
+
+
+def make_request_key(method: str, path: str, params: Iterable[Tuple[str, str]]) -> str:
+    """Archive key for a request: method, URL path and sorted query (without apikey)."""
+    query = "&".join(f"{k}={v}" for k, v in sorted(params) if k != "apikey")
+    return f"{method.upper()} {path}?{query}"
+
+
+def request_key(request: httpx.Request) -> str:
+    return make_request_key(request.method, request.url.path, request.url.params.multi_items())
+
+
+@dataclass
+class RecordedResponse:
+    status_code: int
+    content: bytes
+    content_type: str = "application/json"
+
+
+class FMPArchive:
+    """Compact on-disk archive of recorded FMP responses."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Shared by the stand-in server's handler threads
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " status INTEGER NOT NULL,"
+                " content_type TEXT NOT NULL,"
+                " body BLOB NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[RecordedResponse]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT status, content_type, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return RecordedResponse(status_code=row[0], content=zlib.decompress(row[2]), content_type=row[1])
+
+    def put(self, key: str, response: RecordedResponse) -> None:
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, status, content_type, body) VALUES (?, ?, ?, ?)",
+                (key, response.status_code, response.content_type, zlib.compress(response.content, 6)),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (count,) = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {
+            "path": str(self.path),
+            "responses": count,
+            "file_bytes": self.path.stat().st_size if self.path.exists() else 0,
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class FaultInjector:
+    """
+    Latency and rate-limit injection shared by ReplayTransport and the stand-in server.
+
+    Args:
+        latency_ms: Base latency added to every response
+        jitter_ms: Uniform random extra latency (0..jitter_ms)
+        throttle_rate: Fraction of requests answered with HTTP 429
+        retry_after: Retry-After header sent with injected 429s
+        seed: RNG seed, for reproducible runs
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """Seconds to wait before answering."""
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000
+
+    def should_throttle(self) -> bool:
+        if not self.throttle_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.throttle_rate
+
+    def throttle_response(self) -> RecordedResponse:
+        return RecordedResponse(429, b'{"Error Message": "Limit Reach (injected)"}')
+
+
+def not_found_response(key: str) -> RecordedResponse:
+    return RecordedResponse(404, f'{{"Error Message": "Not in archive: {key}"}}'.encode())
+
+
+# Headers describing the wire body, dropped once it has been read and decoded
+DECODED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forward requests to the live API and archive every response."""
+
+    def __init__(self, archive: FMPArchive, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.archive = archive
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()
+        await response.aclose()
+
+        if response.status_code != 429:  # Throttling is not part of the data
+            self.archive.put(
+                request_key(request),
+                RecordedResponse(
+                    response.status_code,
+                    content,
+                    response.headers.get("content-type", "application/json"),
+                ),
+            )
+        # content is already decoded, so the upstream encoding/length no longer apply
+        headers = [
+            (name, value) for name, value in response.headers.multi_items()
+            if name.lower() not in DECODED_HEADERS
+        ]
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Answer requests from an archive, never touching the network."""
+
+    def __init__(self, archive: FMPArchive, faults: Optional[FaultInjector] = None):
+        self.archive = archive
+        self.faults = faults or FaultInjector()
+        self.misses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.faults.delay()
+        if delay:
+            await asyncio.sleep(delay)
+
+        key = request_key(request)
+        if self.faults.should_throttle():
+            recorded = self.faults.throttle_response()
+            headers = {"content-type": recorded.content_type, "retry-after": str(self.faults.retry_after)}
+        else:
+            recorded = self.archive.get(key)
+            if recorded is None:
+                self.misses += 1
+                logger.warning(f"Replay miss: {key}")
+                recorded = not_found_response(key)
+            headers = {"content-type": recorded.content_type}
+
+        return httpx.Response(
+            status_code=recorded.status_code,
+            headers=headers,
+            content=recorded.content,
+            request=request,
+        )
+
+
+def get_transport(
+    mode: str,
+    archive_path: Path,
+    faults: Optional[FaultInjector] = None,
+) -> Optional[httpx.AsyncBaseTransport]:
+    """
+    Build the transport for a mode ("live", "record" or "replay").
+
+    Returns None for live mode (httpx default transport).
+    """
+    if mode == "live":
+        return None
+    archive = FMPArchive(archive_path)
+    if mode == "record":
+        return RecordingTransport(archive)
+    if mode == "replay":
+        return ReplayTransport(archive, faults)
+    raise ValueError(f"Unknown FMP transport: {mode}")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stand-in for the FMP API, served from a recorded archive.
+
+Record an archive first by running any entry point with FMP_TRANSPORT=record,
+then serve it and point the client's base URLs at this server.
+
+Usage:
+    # Record real responses while running a scan
+    FMP_TRANSPORT=record python scan_historical.py --sp500
+
+    # Serve them with 80ms latency and 2% injected 429s
+    python fmp_standin.py --latency-ms 80 --throttle-rate 0.02
+
+    # Run against the stand-in (empty cache dir so nothing is short-circuited)
+    FMP_BASE_URL=http://127.0.0.1:8765/api/v3 \\
+    FMP_BASE_URL_V4=http://127.0.0.1:8765/api/v4 \\
+    FMP_BASE_URL_STABLE=http://127.0.0.1:8765/stable \\
+    CACHE_DIR=/tmp/bench_cache python scan_historical.py --sp500
+"""
+
+import argparse
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from data.response_cache import DEFAULT_CACHE_DIR
+from data.transport import (
+    DEFAULT_ARCHIVE_NAME,
+    FaultInjector,
+    FMPArchive,
+    make_request_key,
+    not_found_response,
+)
+from utils.logging import setup_logging
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve recorded FMP responses over HTTP",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--archive",
+        type=Path,
+        default=DEFAULT_CACHE_DIR / DEFAULT_ARCHIVE_NAME,
+        help="Recorded archive (default: data/cache/fmp_archive.sqlite3)",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency (0..N ms)")
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 429 (0-1)",
+    )
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After for injected 429s")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for latency/429 injection")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    return parser.parse_args()
+
+
+def make_handler(archive: FMPArchive, faults: FaultInjector, verbose: bool):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            delay = faults.delay()
+            if delay:
+                time.sleep(delay)
+
+            parts = urlsplit(self.path)
+            key = make_request_key("GET", unquote(parts.path), parse_qsl(parts.query, keep_blank_values=True))
+
+            headers = {}
+            if faults.should_throttle():
+                recorded = faults.throttle_response()
+                headers["Retry-After"] = str(faults.retry_after)
+            else:
+                recorded = archive.get(key) or not_found_response(key)
+
+            self.send_response(recorded.status_code)
+            self.send_header("Content-Type", recorded.content_type)
+            self.send_header("Content-Length", str(len(recorded.content)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(recorded.content)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def main():
+    args = parse_args()
+    setup_logging(level="DEBUG" if args.verbose else "INFO")
+
+    archive = FMPArchive(args.archive)
+    print(json.dumps(archive.stats(), indent=2))
+
+    faults = FaultInjector(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(archive, faults, args.verbose))
+    print(f"Serving FMP stand-in on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
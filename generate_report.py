@@ -263,10 +263,13 @@ async def main():
     parser.add_argument("--min-market-cap", type=int, default=1_000_000_000, help="Minimum market cap (default: $1B)")
     parser.add_argument("--output", type=str, default="docs/index.md", help="Output file path")
     parser.add_argument("--dry-run", action="store_true", help="Print to stdout instead of saving")
+    parser.add_argument("--offline", action="store_true", help="Use cached FMP data only (no API calls)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     args = parser.parse_args()
 
     setup_logging(level="DEBUG" if args.verbose else "INFO")
+    if args.offline:
+        get_settings().fmp_offline = True
 
     generator = ReportGenerator(
         min_score=args.min_score,
@@ -118,6 +118,11 @@ Examples:
         action="store_true",
         help="Skip fetching news articles",
     )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Use cached FMP data only (no API calls)",
+    )
 
     # Output options
     parser.add_argument(
@@ -168,6 +173,8 @@ def get_tickers_from_args(args: argparse.Namespace) -> Optional[List[str]]:
 async def run_scan(args: argparse.Namespace) -> ScanReport:
     """Run the scan with given arguments."""
     settings = get_settings()
+    if args.offline:
+        settings.fmp_offline = True
 
     # Build signal config from args
     signal_config = SignalConfig(
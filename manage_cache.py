@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Manage the local FMP response cache.
+
+Usage:
+    # Import the legacy data/cache/*.json files into the SQLite cache
+    python manage_cache.py migrate
+
+    # Import and delete the JSON files afterwards
+    python manage_cache.py migrate --delete
+
+    # Show entry count and size
+    python manage_cache.py stats
+
+    # Drop entries older than 30 days
+    python manage_cache.py purge --older-than 720
+
+    # Merge the historical-price-full JSON fragments into the price store
+    python manage_cache.py migrate-prices
+
+    # List historical signal caches (default and custom universes)
+    python manage_cache.py signals
+
+    # Evict signal caches older than a week or computed by an older detector
+    python manage_cache.py evict-signals --older-than 168 --mismatched
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from data.price_store import PriceStore
+from data.price_store import DEFAULT_DB_NAME as DEFAULT_PRICES_DB_NAME
+from config.settings import get_settings
+from data.response_cache import DEFAULT_DB_NAME, SQLiteCache
+from scanner.historical import HistoricalConfig, HistoricalSignalDetector
+from scanner.signal_store import find_signal_stores
+from utils.logging import setup_logging
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Manage the FMP response cache",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Cache directory (default: the settings' cache_dir, as used by FMPClient)",
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=None,
+        help="SQLite cache file (default: the settings' cache_db_path, "
+             "or <cache-dir>/fmp_cache.sqlite3 with --cache-dir)",
+    )
+
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    migrate = sub.add_parser("migrate", help="Import legacy *.json cache files")
+    migrate.add_argument(
+        "--delete",
+        action="store_true",
+        help="Delete JSON files once they are imported",
+    )
+
+    sub.add_parser("stats", help="Show cache statistics")
+
+    purge = sub.add_parser("purge", help="Delete old entries")
+    purge.add_argument(
+        "--older-than",
+        type=float,
+        required=True,
+        help="Age in hours",
+    )
+
+    sub.add_parser(
+        "migrate-prices",
+        help="Import historical-price-full JSON fragments into the price store",
+    )
+
+    signals = sub.add_parser("signals", help="List historical signal caches")
+    signals.add_argument(
+        "--historical-dir",
+        type=Path,
+        default=HistoricalConfig().cache_dir,
+        help="Historical cache directory (default: data/cache/historical)",
+    )
+
+    evict = sub.add_parser("evict-signals", help="Delete stale historical signal caches")
+    evict.add_argument(
+        "--historical-dir",
+        type=Path,
+        default=HistoricalConfig().cache_dir,
+        help="Historical cache directory (default: data/cache/historical)",
+    )
+    evict.add_argument(
+        "--older-than",
+        type=float,
+        default=None,
+        help="Age in hours",
+    )
+    evict.add_argument(
+        "--mismatched",
+        action="store_true",
+        help="Also delete caches computed by a different detector version",
+    )
+    evict.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only show what would be deleted",
+    )
+
+    return parser.parse_args()
+
+
+def list_signal_caches(historical_dir: Path) -> None:
+    stores = find_signal_stores(historical_dir)
+    if not stores:
+        print(f"No signal caches in {historical_dir}")
+        return
+
+    print(f"{'File':<40} {'Tickers':>8} {'Age (h)':>8} {'Size (MB)':>10}  Detector")
+    for store in stores:
+        state = store.load_state()
+        tickers = str(len(state.tickers)) if state else "-"
+        if state is None:
+            detector = "unknown"
+        elif state.detector_version == HistoricalSignalDetector.VERSION:
+            detector = f"current (config {state.fingerprint})"
+        else:
+            detector = f"v{state.detector_version or '?'} (config {state.fingerprint})"
+        print(
+            f"{store.path.name:<40} {tickers:>8} {store.age_seconds() / 3600:>8.1f} "
+            f"{store.size_bytes() / 1e6:>10.1f}  {detector}"
+        )
+
+
+def evict_signal_caches(
+    historical_dir: Path,
+    older_than: float = None,
+    mismatched: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """
+    Delete signal caches past an age and/or computed by another detector version.
+
+    Stores built with other thresholds, history lengths or universes are
+    valid for the runs that use those settings, so only the detector version
+    recorded in each store's state is compared.
+    """
+    removed = 0
+    for store in find_signal_stores(historical_dir):
+        age_hours = store.age_seconds() / 3600
+        state = store.load_state()
+        reasons = []
+        if older_than is not None and age_hours > older_than:
+            reasons.append(f"{age_hours:.0f}h old")
+        if mismatched:
+            if state is None or not state.detector_version:
+                reasons.append("detector version not recorded")
+            elif state.detector_version != HistoricalSignalDetector.VERSION:
+                reasons.append(f"detector v{state.detector_version}")
+        if not reasons:
+            continue
+        print(f"{'Would remove' if dry_run else 'Removing'} {store.path.name} ({', '.join(reasons)})")
+        if not dry_run:
+            store.delete()
+        removed += 1
+    return removed
+
+
+def main():
+    args = parse_args()
+    setup_logging(level="INFO")
+
+    # Same files FMPClient uses unless a directory is given explicitly
+    if args.cache_dir is None:
+        settings = get_settings()
+        args.cache_dir = settings.cache_dir
+        db_path = args.db or settings.cache_db_path
+        prices_path = settings.price_store_path
+    else:
+        db_path = args.db or args.cache_dir / DEFAULT_DB_NAME
+        prices_path = args.cache_dir / DEFAULT_PRICES_DB_NAME
+
+    if args.command == "migrate-prices":
+        store = PriceStore(prices_path)
+        try:
+            start = time.time()
+            files, bars = store.import_json_dir(args.cache_dir)
+            print(f"Merged {files} files ({bars} bars) in {time.time() - start:.1f}s")
+            print(json.dumps(store.stats(), indent=2))
+        finally:
+            store.close()
+        return
+
+    if args.command == "signals":
+        list_signal_caches(args.historical_dir)
+        return
+
+    if args.command == "evict-signals":
+        if args.older_than is None and not args.mismatched:
+            print("Nothing to evict: pass --older-than and/or --mismatched")
+            return
+        removed = evict_signal_caches(args.historical_dir, args.older_than, args.mismatched, args.dry_run)
+        print(f"{'Would remove' if args.dry_run else 'Removed'} {removed} signal caches")
+        return
+
+    cache = SQLiteCache(db_path)
+    try:
+        if args.command == "migrate":
+            start = time.time()
+            imported, skipped = cache.import_json_dir(args.cache_dir, delete=args.delete)
+            print(f"Imported {imported} files ({skipped} unreadable) in {time.time() - start:.1f}s")
+            print(json.dumps(cache.stats(), indent=2))
+
+        elif args.command == "stats":
+            print(json.dumps(cache.stats(), indent=2))
+
+        elif args.command == "purge":
+            removed = cache.purge(args.older_than)
+            cache.conn.execute("VACUUM")
+            print(f"Removed {removed} entries")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
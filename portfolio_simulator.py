@@ -223,30 +223,32 @@ class PortfolioSimulator:
                     if parquet_file.exists():
                         try:
                             df = pd.read_parquet(parquet_file)
-                            # Convert to list of dicts with expected keys
-                            records = []
-                            for idx, row in df.iterrows():
-                                # Handle both index-based and column-based date storage
-                                if hasattr(idx, 'strftime'):
-                                    date_str = idx.strftime('%Y-%m-%d')
-                                elif 'date' in row:
-                                    date_val = row['date']
-                                    if hasattr(date_val, 'strftime'):
-                                        date_str = date_val.strftime('%Y-%m-%d')
-                                    else:
-                                        date_str = str(date_val)[:10]
-                                else:
-                                    continue  # Skip if no valid date
-
-                                record = {
-                                    'date': date_str,
-                                    'open': float(row.get('open', row.get('Open', 0))),
-                                    'high': float(row.get('high', row.get('High', 0))),
-                                    'low': float(row.get('low', row.get('Low', 0))),
-                                    'close': float(row.get('close', row.get('Close', 0))),
-                                    'volume': int(row.get('volume', row.get('Volume', 0))),
-                                }
-                                records.append(record)
+                            # Convert to list of dicts with expected keys, column-wise
+                            # Handle both index-based and column-based date storage
+                            if isinstance(df.index, pd.DatetimeIndex):
+                                dates = df.index.strftime('%Y-%m-%d').tolist()
+                            elif 'date' in df.columns:
+                                dates = [str(d)[:10] for d in df['date'].tolist()]
+                            else:
+                                continue  # Skip if no valid date
+
+                            def column(name: str) -> pd.Series:
+                                for col in (name, name.capitalize()):
+                                    if col in df.columns:
+                                        return df[col]
+                                return pd.Series(0, index=df.index)
+
+                            ohlc = {
+                                key: column(key).astype(float).tolist()
+                                for key in ('open', 'high', 'low', 'close')
+                            }
+                            volumes = column('volume').astype('int64').tolist()
+                            records = [
+                                {'date': d, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+                                for d, o, h, l, c, v in zip(
+                                    dates, ohlc['open'], ohlc['high'], ohlc['low'], ohlc['close'], volumes
+                                )
+                            ]
                             if records:
                                 self.price_data[ticker] = records
                                 loaded += 1
@@ -123,6 +123,19 @@ def parse_args() -> argparse.Namespace:
         help="Minimum signal strength for raw mode (default: weak)",
     )
 
+    # Processing
+    parser.add_argument(
+        "--panel",
+        action="store_true",
+        help="Compute signals for the whole universe as one dates x tickers panel",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for signal computation (default: 1)",
+    )
+
     # Output
     parser.add_argument(
         "--limit",
@@ -291,13 +304,15 @@ async def run_historical_scan(args: argparse.Namespace):
         years_of_data=args.years,
         min_market_cap=int(args.min_market_cap * 1_000_000_000),
         resample_to_weekly=True,
+        panel_mode=args.panel,
+        workers=args.workers,
     )
 
     scanner = HistoricalScanner(config)
 
     try:
         # Check if we need to run full scan
-        if args.refresh or not (config.cache_dir / "all_signals.json").exists():
+        if args.refresh or not (config.cache_dir / "all_signals.parquet").exists():
             console.print(Panel(
                 f"[bold blue]Historical Signal Scanner[/bold blue]\n\n"
                 f"Years of data: {args.years}\n"
@@ -317,7 +332,6 @@ async def run_historical_scan(args: argparse.Namespace):
                 task = progress.add_task("[cyan]Downloading and analyzing...", total=None)
 
                 signals = await scanner.scan_universe(
-                    max_concurrent=10,
                     force_refresh=args.refresh,
                 )
 
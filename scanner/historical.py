@@ -8,17 +8,26 @@ when breakouts, volume spikes, and crossovers actually occurred.
 import asyncio
 import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
 from data.fmp_client import FMPClient
+from data.price_columns import PriceColumns
+from scanner.panel import SignalPanel
+from scanner.signal_store import BarMarker, SignalStore, SignalStoreState, config_fingerprint, universe_key
+from scanner.signal_table import SignalTable
 
 logger = logging.getLogger(__name__)
 
+# A cached daily series starting this many days after the window start is
+# missing history (more than a weekend and holidays)
+HEAD_SLACK_DAYS = 7
+
 
 def get_most_recent_sunday(reference_date: Optional[datetime] = None) -> datetime:
     """
@@ -43,7 +52,6 @@ class HistoricalSignal:
     ticker: str
     signal_type: str
     strength: str
-    description: str
     price: float
     volume: int
 
@@ -52,11 +60,48 @@ class HistoricalSignal:
     volume_vs_avg: float = 0.0
     distance_to_high_pct: float = 0.0
 
+    # Typed attributes behind the score and description
+    is_new_high: bool = False  # ATH_BREAKOUT: close above the previous 52-week high
+    reference_price: float = 0.0  # Previous 52-week high (ATH) or SMA value (crossovers)
+    period: int = 0  # SMA period (crossovers)
+
     # Composite score (calculated based on signal quality)
     score: int = 0
 
+    @property
+    def description(self) -> str:
+        """Human-readable description, rendered on demand."""
+        if self.signal_type == "ATH_BREAKOUT":
+            if self.is_new_high:
+                return f"Breaking to new 52-week high at ${self.price:.2f} (prev high: ${self.reference_price:.2f})"
+            pct = self.price / self.reference_price if self.reference_price > 0 else 0
+            return f"Approaching 52-week high ({pct:.1%} of ${self.reference_price:.2f})"
+
+        if self.signal_type == "VOLUME_SPIKE":
+            ratio = self.volume_vs_avg
+            if ratio >= 5.0:
+                return f"Extreme volume spike ({ratio:.1f}x average)"
+            if ratio >= 3.0:
+                return f"High volume ({ratio:.1f}x average)"
+            return f"Above-average volume ({ratio:.1f}x)"
+
+        if self.signal_type.startswith("SMA"):
+            return f"Crossing above {self.period}-period SMA (${self.reference_price:.2f})"
+
+        if self.signal_type == "MOMENTUM":
+            change = self.change_pct
+            if change >= 0.15:
+                return f"Strong momentum (+{change:.1%} this week)"
+            if change >= 0.10:
+                return f"Good momentum (+{change:.1%} this week)"
+            return f"Positive momentum (+{change:.1%} this week)"
+
+        return self.signal_type
+
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        data = asdict(self)
+        data["description"] = self.description
+        return data
 
 
 @dataclass
@@ -126,6 +171,19 @@ class HistoricalConfig:
 
     # Cache settings
     cache_dir: Path = field(default_factory=lambda: Path("data/cache/historical"))
+    incremental_refresh: bool = True  # Append new bars to stale caches instead of re-downloading
+
+    # Compute signals for the whole universe as one dates x tickers panel
+    panel_mode: bool = False
+
+    # Worker processes for signal computation (1 = in-process)
+    workers: int = 1
+
+    # Downloaded frames waiting for the detector (in-process streaming scans)
+    pipeline_queue_size: int = 32
+
+    # Only scan bars added since the last run when thresholds are unchanged
+    incremental_signals: bool = True
 
 
 class HistoricalDataManager:
@@ -183,6 +241,10 @@ class HistoricalDataManager:
 
         return all_stocks
 
+    def cache_path(self, ticker: str, weekly: bool = True) -> Path:
+        """Parquet cache file for a ticker's weekly or daily bars."""
+        return self.config.cache_dir / f"{ticker}_{'weekly' if weekly else 'daily'}.parquet"
+
     async def get_historical_prices(
         self,
         ticker: str,
@@ -194,16 +256,41 @@ class HistoricalDataManager:
 
         Returns DataFrame with columns: date, open, high, low, close, volume
         """
-        cache_file = self.config.cache_dir / f"{ticker}_daily.parquet"
+        df, _ = await self._refresh_daily(ticker, years, force_refresh)
+        return df
+
+    async def _refresh_daily(
+        self,
+        ticker: str,
+        years: int,
+        force_refresh: bool,
+    ) -> Tuple[Optional[pd.DataFrame], Optional[pd.Timestamp]]:
+        """
+        Load or refresh the daily parquet cache.
 
-        # Check cache (refresh weekly)
+        A stale cache is extended in place when config.incremental_refresh is
+        set: only bars from the last cached date onward are fetched. The
+        overlapping bar must match the cached one, otherwise a split or other
+        corporate action has rewritten history and everything is re-fetched.
+
+        Returns:
+            Tuple of (daily DataFrame, date of the first new bar). The date is
+            None when the cache was used as-is or rebuilt from scratch.
+        """
+        cache_file = self.cache_path(ticker, weekly=False)
+
+        cached = None
         if not force_refresh and cache_file.exists():
+            try:
+                cached = pd.read_parquet(cache_file)
+            except Exception:
+                cached = None  # Re-download if cache is corrupted
+
+        # Check cache (refresh weekly)
+        if cached is not None:
             cache_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
             if cache_age < timedelta(days=7):
-                try:
-                    return pd.read_parquet(cache_file)
-                except Exception:
-                    pass  # Re-download if cache is corrupted
+                return cached, None
 
         # Calculate date range - align to Sunday for consistent week boundaries
         end_dt = get_most_recent_sunday()
@@ -211,34 +298,94 @@ class HistoricalDataManager:
         start_date = (end_dt - timedelta(days=years * 365)).strftime("%Y-%m-%d")
 
         try:
-            data = await self.fmp.get_historical_prices(ticker, start_date, end_date)
+            if cached is not None and not cached.empty and self.config.incremental_refresh:
+                appended = await self._append_daily(ticker, cached, start_date, end_date)
+                if appended is not None:
+                    df, first_new = appended
+                    df.to_parquet(cache_file, index=False)
+                    return df, first_new
 
-            if not data or "historical" not in data:
-                return None
+                logger.info(f"{ticker}: cached history no longer matches, re-fetching in full")
+                self.fmp.invalidate_prices(ticker)
 
-            # Convert to DataFrame
-            df = pd.DataFrame(data["historical"])
-
-            if df.empty:
-                return None
-
-            # Clean up columns
-            df["date"] = pd.to_datetime(df["date"])
-            df = df.sort_values("date").reset_index(drop=True)
-
-            # Keep only needed columns
-            columns = ["date", "open", "high", "low", "close", "volume"]
-            df = df[[c for c in columns if c in df.columns]]
+            columns = await self.fmp.get_price_columns(ticker, start_date, end_date)
+            df = self._to_daily_frame(columns)
+            if df is None:
+                return None, None
 
             # Cache
             df.to_parquet(cache_file, index=False)
 
-            return df
+            return df, None
 
         except Exception as e:
             logger.warning(f"Failed to get historical data for {ticker}: {e}")
+            return None, None
+
+    async def _append_daily(
+        self,
+        ticker: str,
+        cached: pd.DataFrame,
+        start_date: str,
+        end_date: str,
+    ) -> Optional[Tuple[pd.DataFrame, Optional[pd.Timestamp]]]:
+        """
+        Fetch bars from the last cached date onward and append them, plus
+        any bars the window needs before the first cached date.
+
+        Returns None if the overlapping bar disagrees with the cache.
+        """
+        last_date = cached["date"].iloc[-1]
+        columns = await self.fmp.get_price_columns(
+            ticker,
+            last_date.strftime("%Y-%m-%d"),
+            end_date,
+            refresh=True,  # The overlapping bar must come from the API, not the price store
+        )
+        fresh = self._to_daily_frame(columns)
+        if fresh is None or fresh["date"].iloc[0] != last_date:
+            return None
+
+        if not np.isclose(fresh["close"].iloc[0], cached["close"].iloc[-1], rtol=1e-4):
             return None
 
+        new_bars = fresh[fresh["date"] > last_date]
+        df = pd.concat([cached, new_bars], ignore_index=True)
+        df = df[df["date"] >= pd.Timestamp(start_date)].reset_index(drop=True)
+        first_new = new_bars["date"].iloc[0] if not new_bars.empty else None
+
+        # The window may reach further back than the cache (e.g. more years
+        # requested): fetch the missing head too
+        first_cached = cached["date"].iloc[0]
+        if first_cached - pd.Timestamp(start_date) > pd.Timedelta(days=HEAD_SLACK_DAYS):
+            columns = await self.fmp.get_price_columns(
+                ticker,
+                start_date,
+                (first_cached - pd.Timedelta(days=1)).strftime("%Y-%m-%d"),
+            )
+            head = self._to_daily_frame(columns)
+            if head is not None:
+                df = pd.concat([head[head["date"] < first_cached], df], ignore_index=True)
+                first_new = None  # Every week changed position: resample in full
+
+        return df, first_new
+
+    @staticmethod
+    def _to_daily_frame(columns: PriceColumns) -> Optional[pd.DataFrame]:
+        """Convert ascending price columns (FMPClient.get_price_columns) to a daily frame."""
+        if not len(columns["date"]):
+            return None
+
+        volume = columns["volume"]
+        return pd.DataFrame({
+            "date": columns["date"].astype("datetime64[ns]"),
+            "open": columns["open"],
+            "high": columns["high"],
+            "low": columns["low"],
+            "close": columns["close"],
+            "volume": volume if np.isnan(volume).any() else volume.astype(np.int64),
+        })
+
     async def get_weekly_prices(
         self,
         ticker: str,
@@ -248,29 +395,52 @@ class HistoricalDataManager:
         """
         Get weekly OHLCV data (resampled from daily).
 
+        When the daily cache was extended incrementally, only the weeks from
+        the first new bar onward (plus the first, possibly partial, week of
+        the window) are re-derived.
+
         Returns DataFrame with weekly bars.
         """
-        cache_file = self.config.cache_dir / f"{ticker}_weekly.parquet"
+        cache_file = self.cache_path(ticker, weekly=True)
 
-        # Check cache
+        cached = None
         if not force_refresh and cache_file.exists():
+            try:
+                cached = pd.read_parquet(cache_file)
+            except Exception:
+                cached = None
+
+        # Check cache
+        if cached is not None:
             cache_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
             if cache_age < timedelta(days=7):
-                try:
-                    return pd.read_parquet(cache_file)
-                except Exception:
-                    pass
+                return cached
 
         # Get daily data
-        daily = await self.get_historical_prices(ticker, years, force_refresh)
+        daily, first_new = await self._refresh_daily(ticker, years, force_refresh)
 
         if daily is None or daily.empty:
             return None
 
-        # Resample to weekly
-        daily = daily.set_index("date")
+        if cached is not None and not cached.empty and first_new is not None:
+            weekly = self._update_weekly(cached, daily, first_new)
+        else:
+            weekly = self._resample_weekly(daily)
+
+        # Cache
+        weekly.to_parquet(cache_file, index=False)
 
-        weekly = daily.resample("W-SUN").agg({
+        return weekly
+
+    @staticmethod
+    def _week_label(date: pd.Timestamp) -> pd.Timestamp:
+        """W-SUN label (the Sunday that closes the week) for a date."""
+        return date.normalize() + pd.Timedelta(days=6 - date.weekday())
+
+    @staticmethod
+    def _resample_weekly(daily: pd.DataFrame) -> pd.DataFrame:
+        """Resample daily bars to W-SUN weekly bars."""
+        weekly = daily.set_index("date").resample("W-SUN").agg({
             "open": "first",
             "high": "max",
             "low": "min",
@@ -278,16 +448,30 @@ class HistoricalDataManager:
             "volume": "sum",
         }).dropna()
 
-        weekly = weekly.reset_index()
+        return weekly.reset_index()
 
-        # Cache
-        weekly.to_parquet(cache_file, index=False)
-
-        return weekly
+    def _update_weekly(
+        self,
+        weekly: pd.DataFrame,
+        daily: pd.DataFrame,
+        first_new: pd.Timestamp,
+    ) -> pd.DataFrame:
+        """Re-derive only the weekly bars touched by newly appended daily bars."""
+        first_label = self._week_label(first_new)
+        head_label = self._week_label(daily["date"].iloc[0])
+        if head_label >= first_label:
+            return self._resample_weekly(daily)
+
+        # The window start may have moved: rebuild its first (possibly partial) week
+        head = self._resample_weekly(daily[daily["date"] <= head_label])
+        kept = weekly[(weekly["date"] > head_label) & (weekly["date"] < first_label)]
+        tail = self._resample_weekly(daily[daily["date"] > first_label - pd.Timedelta(days=7)])
+
+        return pd.concat([head, kept, tail], ignore_index=True)
 
     async def download_universe_data(
         self,
-        max_concurrent: int = 10,
+        max_concurrent: Optional[int] = None,
         weekly: bool = True,
         custom_tickers: Optional[List[str]] = None,
     ) -> Dict[str, pd.DataFrame]:
@@ -295,30 +479,24 @@ class HistoricalDataManager:
         Download historical data for entire universe.
 
         Args:
-            max_concurrent: Maximum concurrent downloads
+            max_concurrent: Optional cap on concurrent downloads (the shared FMP
+                rate limiter already paces requests)
             weekly: If True, resample to weekly data
             custom_tickers: Optional list of tickers to download (overrides default universe)
 
         Returns dict mapping ticker -> DataFrame.
         """
-        if custom_tickers:
-            tickers = custom_tickers
-            logger.info(f"Using custom universe of {len(tickers)} tickers")
-        else:
-            universe = await self.get_universe()
-            tickers = [s["symbol"] for s in universe]
+        tickers = await self.resolve_tickers(custom_tickers)
 
         logger.info(f"Downloading historical data for {len(tickers)} stocks...")
 
-        semaphore = asyncio.Semaphore(max_concurrent)
+        semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent else None
 
         async def download_one(ticker: str) -> Tuple[str, Optional[pd.DataFrame]]:
+            if semaphore is None:
+                return ticker, await self._fetch_frame(ticker, weekly)
             async with semaphore:
-                if weekly:
-                    df = await self.get_weekly_prices(ticker, self.config.years_of_data)
-                else:
-                    df = await self.get_historical_prices(ticker, self.config.years_of_data)
-                return ticker, df
+                return ticker, await self._fetch_frame(ticker, weekly)
 
         results = await asyncio.gather(
             *[download_one(t) for t in tickers],
@@ -339,6 +517,61 @@ class HistoricalDataManager:
 
         return data
 
+    async def stream_universe_data(
+        self,
+        tickers: List[str],
+        queue: "asyncio.Queue[Tuple[int, str, pd.DataFrame]]",
+        max_concurrent: Optional[int] = None,
+        weekly: bool = True,
+    ) -> int:
+        """
+        Download tickers into a queue as (index, ticker, DataFrame) items.
+
+        A fixed pool of downloaders feeds the queue, so at most
+        max_concurrent + queue.maxsize frames are held at any time; when
+        the consumer falls behind, downloaders wait on the full queue.
+
+        Args:
+            tickers: Tickers to download; index is the position in this list
+            queue: Bounded queue read by the consumer
+            max_concurrent: Number of downloaders (default: settings.fmp_max_concurrency)
+            weekly: If True, resample to weekly data
+
+        Returns:
+            Number of tickers with data
+        """
+        pending = iter(enumerate(tickers))
+        downloaded = 0
+
+        async def downloader() -> None:
+            nonlocal downloaded
+            for index, ticker in pending:
+                try:
+                    df = await self._fetch_frame(ticker, weekly)
+                except Exception as e:
+                    logger.debug(f"{ticker}: download failed: {e}")
+                    continue
+                if df is not None and not df.empty:
+                    downloaded += 1
+                    await queue.put((index, ticker, df))
+
+        workers = max_concurrent or self.fmp.settings.fmp_max_concurrency
+        await asyncio.gather(*[downloader() for _ in range(min(workers, len(tickers)))])
+        return downloaded
+
+    async def resolve_tickers(self, custom_tickers: Optional[List[str]] = None) -> List[str]:
+        """Tickers to download: the custom list if given, else the default universe."""
+        if custom_tickers:
+            logger.info(f"Using custom universe of {len(custom_tickers)} tickers")
+            return custom_tickers
+        universe = await self.get_universe()
+        return [s["symbol"] for s in universe]
+
+    async def _fetch_frame(self, ticker: str, weekly: bool) -> Optional[pd.DataFrame]:
+        if weekly:
+            return await self.get_weekly_prices(ticker, self.config.years_of_data)
+        return await self.get_historical_prices(ticker, self.config.years_of_data)
+
     async def close(self):
         await self.fmp.close()
 
@@ -349,6 +582,32 @@ class HistoricalSignalDetector:
     def __init__(self, config: Optional[HistoricalConfig] = None):
         self.config = config or HistoricalConfig()
 
+    # Bump when detection logic or stored fields change so stored signals are recomputed
+    VERSION = 2
+
+    # Lookback needed for indicators; rows before this never signal
+    START_IDX = 20
+
+    # Per signal type, the leading rows whose indicators (or the previous
+    # bar's) reach back to the first bar of the frame; later rows only see
+    # bars after it, so their signals survive the head of the frame sliding
+    HEAD_ROWS = {
+        "ATH_BREAKOUT": 53,       # previous bar's 52-week high
+        "VOLUME_SPIKE": 20,       # 20-week average volume
+        "SMA50_CROSSOVER": 51,    # previous bar's SMA50
+        "SMA200_CROSSOVER": 201,  # previous bar's SMA200
+        "MOMENTUM": 20,           # previous close
+    }
+
+    # Order in which checks run on a row
+    SIGNAL_ORDER = {
+        "ATH_BREAKOUT": 0,
+        "VOLUME_SPIKE": 1,
+        "SMA50_CROSSOVER": 2,
+        "SMA200_CROSSOVER": 3,
+        "MOMENTUM": 4,
+    }
+
     def calculate_signals(
         self,
         df: pd.DataFrame,
@@ -357,6 +616,10 @@ class HistoricalSignalDetector:
         """
         Calculate all signals for a stock's historical data.
 
+        All five conditions are evaluated as boolean masks over the whole
+        frame; HistoricalSignal records are only built for rows that fire.
+        Output (order and values) matches calculate_signals_rowwise.
+
         Args:
             df: DataFrame with date, open, high, low, close, volume
             ticker: Stock symbol
@@ -368,6 +631,235 @@ class HistoricalSignalDetector:
         if df is None or len(df) < 20:
             return []
 
+        def column(name: str) -> np.ndarray:
+            return df[name].to_numpy(dtype=np.float64).reshape(-1, 1)
+
+        return self._signals_from_bars(
+            high=column("high"),
+            close=column("close"),
+            volume=column("volume"),
+            tickers=[ticker],
+            dates=[df["date"].to_numpy()],
+        )
+
+    def calculate_signals_refreshed(
+        self,
+        df: pd.DataFrame,
+        ticker: str,
+        start_row: int,
+    ) -> List[HistoricalSignal]:
+        """
+        Signals for the rows a refresh of a stored frame can change.
+
+        Those are the rows from start_row onward (new bars) and, per signal
+        type, the first HEAD_ROWS rows (the head may have slid or been
+        rebuilt). Signals on every other row equal the stored ones.
+        """
+        if df is None or len(df) < 20:
+            return []
+
+        rows = np.arange(len(df))
+        fire_rows = {
+            signal_type: (rows < head_rows) | (rows >= start_row)
+            for signal_type, head_rows in self.HEAD_ROWS.items()
+        }
+
+        def column(name: str) -> np.ndarray:
+            return df[name].to_numpy(dtype=np.float64).reshape(-1, 1)
+
+        return self._signals_from_bars(
+            high=column("high"),
+            close=column("close"),
+            volume=column("volume"),
+            tickers=[ticker],
+            dates=[df["date"].to_numpy()],
+            fire_rows=fire_rows,
+        )
+
+    def calculate_panel_signals(self, panel: SignalPanel) -> List[HistoricalSignal]:
+        """
+        Calculate signals for every ticker of a panel in one pass.
+
+        Returns signals grouped by ticker (panel order), then date, exactly as
+        calling calculate_signals on each ticker's frame in turn would.
+        """
+        return self._signals_from_bars(
+            high=panel.bar_matrix("high"),
+            close=panel.bar_matrix("close"),
+            volume=panel.bar_matrix("volume"),
+            tickers=panel.tickers,
+            dates=panel.ticker_dates(),
+        )
+
+    @staticmethod
+    def _indicator_arrays(
+        high: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Indicator columns of _add_indicators for bar matrices (bars x tickers).
+
+        Each column is one ticker's bars, oldest first and NaN-padded at the
+        end; pandas rolls every column with the same kernel it uses for a
+        single Series, so values match the per-frame calculation exactly.
+        """
+        high_df = pd.DataFrame(high)
+        close_df = pd.DataFrame(close)
+        volume_df = pd.DataFrame(volume)
+
+        avg_volume_20 = volume_df.rolling(window=20, min_periods=10).mean().to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            volume_ratio = volume / avg_volume_20
+        return {
+            "rolling_52w_high": high_df.rolling(window=52, min_periods=20).max().to_numpy(),
+            "sma_50": close_df.rolling(window=50, min_periods=20).mean().to_numpy(),
+            "sma_200": close_df.rolling(window=200, min_periods=50).mean().to_numpy(),
+            "change_pct": close_df.pct_change(fill_method=None).to_numpy(),
+            "volume_ratio": volume_ratio,
+        }
+
+    def _signals_from_bars(
+        self,
+        high: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        tickers: List[str],
+        dates: List[np.ndarray],
+        fire_rows: Optional[Dict[str, np.ndarray]] = None,
+    ) -> List[HistoricalSignal]:
+        """
+        Evaluate every signal condition as a mask over bar matrices.
+
+        Args:
+            high, close, volume: Bars x tickers, oldest first, NaN-padded
+            tickers: Column labels
+            dates: Per-ticker datetime64 arrays of bar dates
+            fire_rows: Optional per-signal-type row masks; only those rows fire
+        """
+        indicators = self._indicator_arrays(high, close, volume)
+        change = indicators["change_pct"]
+        ratio = indicators["volume_ratio"]
+
+        def prev(values: np.ndarray) -> np.ndarray:
+            shifted = np.empty_like(values)
+            shifted[0] = np.nan
+            shifted[1:] = values[:-1]
+            return shifted
+
+        prev_close = prev(close)
+        in_range = (np.arange(close.shape[0]) >= self.START_IDX)[:, None]
+
+        def allowed(signal_type: str) -> np.ndarray:
+            if fire_rows is None:
+                return in_range
+            return in_range & fire_rows[signal_type][:, None]
+
+        # (ticker column, row, check order, signal) for every cell that fires
+        fired: List[Tuple[int, int, int, HistoricalSignal]] = []
+        date_strs: Dict[int, List[str]] = {}
+
+        def date_str(row: int, col: int) -> str:
+            if col not in date_strs:
+                date_strs[col] = pd.DatetimeIndex(dates[col]).strftime("%Y-%m-%d").tolist()
+            return date_strs[col][row]
+
+        # ATH breakout: close crosses the threshold of the PREVIOUS rolling high
+        prev_high = prev(indicators["rolling_52w_high"])
+        threshold = self.config.ath_threshold_pct
+        with np.errstate(divide="ignore", invalid="ignore"):
+            positive = prev_high > 0
+            prev_pct = np.where(positive, prev_close / prev_high, 0.0)
+            curr_pct = np.where(positive, close / prev_high, 0.0)
+        ath = allowed("ATH_BREAKOUT") & ~np.isnan(prev_high) & (prev_pct < threshold) & (curr_pct >= threshold)
+        new_high = close > prev_high
+        ath_points = self.ath_points(new_high)
+        for i, j in zip(*(idx.tolist() for idx in np.nonzero(ath))):
+            is_new_high = bool(new_high[i, j])
+            fired.append((j, i, 0, HistoricalSignal(
+                date=date_str(i, j),
+                ticker=tickers[j],
+                signal_type="ATH_BREAKOUT",
+                strength="strong" if is_new_high else "moderate",
+                price=float(close[i, j]),
+                volume=int(volume[i, j]),
+                change_pct=float(change[i, j]),
+                distance_to_high_pct=1 - float(curr_pct[i, j]),
+                is_new_high=is_new_high,
+                reference_price=float(prev_high[i, j]),
+                score=int(ath_points[i, j]),
+            )))
+
+        # Volume spike
+        spike = allowed("VOLUME_SPIKE") & (ratio >= self.config.volume_spike_multiplier)
+        volume_points = self.volume_points(ratio)
+        for i, j in zip(*(idx.tolist() for idx in np.nonzero(spike))):
+            r = float(ratio[i, j])
+            fired.append((j, i, 1, HistoricalSignal(
+                date=date_str(i, j),
+                ticker=tickers[j],
+                signal_type="VOLUME_SPIKE",
+                strength="strong" if r >= 5.0 else "moderate" if r >= 3.0 else "weak",
+                price=float(close[i, j]),
+                volume=int(volume[i, j]),
+                change_pct=float(change[i, j]),
+                volume_vs_avg=r,
+                score=int(volume_points[i, j]),
+            )))
+
+        # SMA crossovers: below the SMA last week, above it this week
+        for order, period in ((2, 50), (3, 200)):
+            sma = indicators[f"sma_{period}"]
+            prev_sma = prev(sma)
+            cross = allowed(f"SMA{period}_CROSSOVER") & ~np.isnan(sma) & ~np.isnan(prev_sma) & (prev_close < prev_sma) & (close > sma)
+            for i, j in zip(*(idx.tolist() for idx in np.nonzero(cross))):
+                fired.append((j, i, order, HistoricalSignal(
+                    date=date_str(i, j),
+                    ticker=tickers[j],
+                    signal_type=f"SMA{period}_CROSSOVER",
+                    strength="strong" if period == 200 else "moderate",
+                    price=float(close[i, j]),
+                    volume=int(volume[i, j]),
+                    change_pct=float(change[i, j]),
+                    reference_price=float(sma[i, j]),
+                    period=period,
+                    score=self.SMA_POINTS[period],
+                )))
+
+        # Momentum: large weekly gain
+        momentum = allowed("MOMENTUM") & (change >= self.config.min_gain_pct)
+        momentum_points = self.momentum_points(change)
+        for i, j in zip(*(idx.tolist() for idx in np.nonzero(momentum))):
+            ch = float(change[i, j])
+            fired.append((j, i, 4, HistoricalSignal(
+                date=date_str(i, j),
+                ticker=tickers[j],
+                signal_type="MOMENTUM",
+                strength="strong" if ch >= 0.15 else "moderate" if ch >= 0.10 else "weak",
+                price=float(close[i, j]),
+                volume=int(volume[i, j]),
+                change_pct=ch,
+                score=int(momentum_points[i, j]),
+            )))
+
+        # Same order as the row-wise scan: by ticker, then row, then check
+        fired.sort(key=lambda item: item[:3])
+        return [signal for *_, signal in fired]
+
+    def calculate_signals_rowwise(
+        self,
+        df: pd.DataFrame,
+        ticker: str,
+    ) -> List[HistoricalSignal]:
+        """
+        Reference row-by-row implementation of calculate_signals.
+
+        Slow; kept to check the vectorized detector for parity.
+        """
+        # Minimum 20 weeks of data (allow newer stocks)
+        if df is None or len(df) < 20:
+            return []
+
         signals = []
 
         # Add calculated columns
@@ -400,6 +892,8 @@ class HistoricalSignalDetector:
             if signal := self._check_momentum(row, prev_row, ticker, date_str):
                 signals.append(signal)
 
+        for signal in signals:
+            signal.score = self.calculate_signal_score(signal)
         return signals
 
     def _add_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -417,7 +911,7 @@ class HistoricalSignalDetector:
         df["sma_200"] = df["close"].rolling(window=200, min_periods=50).mean()
 
         # Weekly change
-        df["change_pct"] = df["close"].pct_change()
+        df["change_pct"] = df["close"].pct_change(fill_method=None)
 
         # Volume ratio
         df["volume_ratio"] = df["volume"] / df["avg_volume_20"]
@@ -450,23 +944,19 @@ class HistoricalSignalDetector:
         # Signal: price crossed above the previous 52-week high threshold
         if prev_pct < self.config.ath_threshold_pct and curr_pct >= self.config.ath_threshold_pct:
             # Determine strength - strong if actual NEW high (close > previous high)
-            if row["close"] > prev_high_52w:
-                strength = "strong"
-                desc = f"Breaking to new 52-week high at ${row['close']:.2f} (prev high: ${prev_high_52w:.2f})"
-            else:
-                strength = "moderate"
-                desc = f"Approaching 52-week high ({curr_pct:.1%} of ${prev_high_52w:.2f})"
+            is_new_high = bool(row["close"] > prev_high_52w)
 
             return HistoricalSignal(
                 date=date_str,
                 ticker=ticker,
                 signal_type="ATH_BREAKOUT",
-                strength=strength,
-                description=desc,
+                strength="strong" if is_new_high else "moderate",
                 price=row["close"],
                 volume=int(row["volume"]),
                 change_pct=row.get("change_pct", 0),
                 distance_to_high_pct=1 - curr_pct,
+                is_new_high=is_new_high,
+                reference_price=prev_high_52w,
             )
 
         return None
@@ -488,20 +978,16 @@ class HistoricalSignalDetector:
         if ratio >= self.config.volume_spike_multiplier:
             if ratio >= 5.0:
                 strength = "strong"
-                desc = f"Extreme volume spike ({ratio:.1f}x average)"
             elif ratio >= 3.0:
                 strength = "moderate"
-                desc = f"High volume ({ratio:.1f}x average)"
             else:
                 strength = "weak"
-                desc = f"Above-average volume ({ratio:.1f}x)"
 
             return HistoricalSignal(
                 date=date_str,
                 ticker=ticker,
                 signal_type="VOLUME_SPIKE",
                 strength=strength,
-                description=desc,
                 price=row["close"],
                 volume=int(row["volume"]),
                 change_pct=row.get("change_pct", 0),
@@ -536,22 +1022,16 @@ class HistoricalSignalDetector:
         now_above = row["close"] > curr_sma
 
         if was_below and now_above:
-            if period == 200:
-                strength = "strong"
-                desc = f"Crossing above 200-period SMA (${curr_sma:.2f})"
-            else:
-                strength = "moderate"
-                desc = f"Crossing above {period}-period SMA (${curr_sma:.2f})"
-
             return HistoricalSignal(
                 date=date_str,
                 ticker=ticker,
                 signal_type=f"SMA{period}_CROSSOVER",
-                strength=strength,
-                description=desc,
+                strength="strong" if period == 200 else "moderate",
                 price=row["close"],
                 volume=int(row["volume"]),
                 change_pct=row.get("change_pct", 0),
+                reference_price=curr_sma,
+                period=period,
             )
 
         return None
@@ -574,20 +1054,16 @@ class HistoricalSignalDetector:
         if change >= self.config.min_gain_pct:
             if change >= 0.15:
                 strength = "strong"
-                desc = f"Strong momentum (+{change:.1%} this week)"
             elif change >= 0.10:
                 strength = "moderate"
-                desc = f"Good momentum (+{change:.1%} this week)"
             else:
                 strength = "weak"
-                desc = f"Positive momentum (+{change:.1%} this week)"
 
             return HistoricalSignal(
                 date=date_str,
                 ticker=ticker,
                 signal_type="MOMENTUM",
                 strength=strength,
-                description=desc,
                 price=row["close"],
                 volume=int(row["volume"]),
                 change_pct=change,
@@ -595,8 +1071,8 @@ class HistoricalSignalDetector:
 
         return None
 
-    @staticmethod
-    def calculate_signal_score(signal: HistoricalSignal) -> int:
+    @classmethod
+    def calculate_signal_score(cls, signal: HistoricalSignal) -> int:
         """
         Calculate composite score for a single signal.
 
@@ -610,41 +1086,82 @@ class HistoricalSignalDetector:
         - MOMENTUM < 10%: 0 points (filtered out)
         - SMA50_CROSSOVER: 1 point
         - SMA200_CROSSOVER: 2 points
+
+        The detector scores whole arrays at once with ath_points,
+        volume_points and momentum_points; this is the per-signal equivalent.
         """
         sig_type = signal.signal_type
-        desc = signal.description
 
         if sig_type == "ATH_BREAKOUT":
-            # Only actual new highs count
-            if "Breaking to new" in desc:
-                return 3
-            return 0  # "Approaching" doesn't count
+            # Only actual new highs count; "approaching" doesn't
+            return cls.ATH_NEW_HIGH_POINTS if signal.is_new_high else 0
 
         elif sig_type == "VOLUME_SPIKE":
             vol_ratio = signal.volume_vs_avg
-            if vol_ratio >= 5.0:
-                return 3
-            elif vol_ratio >= 3.0:
-                return 2
+            if vol_ratio >= cls.VOLUME_EXTREME_RATIO:
+                return cls.VOLUME_EXTREME_POINTS
+            elif vol_ratio >= cls.VOLUME_HIGH_RATIO:
+                return cls.VOLUME_HIGH_POINTS
             else:
-                return 1
+                return cls.VOLUME_SPIKE_POINTS
 
         elif sig_type == "MOMENTUM":
             change = abs(signal.change_pct) if signal.change_pct else 0
-            if change >= 0.15:
-                return 2
-            elif change >= 0.10:
-                return 1
+            if change >= cls.MOMENTUM_STRONG_PCT:
+                return cls.MOMENTUM_STRONG_POINTS
+            elif change >= cls.MOMENTUM_GOOD_PCT:
+                return cls.MOMENTUM_GOOD_POINTS
             return 0  # < 10% doesn't count
 
         elif sig_type == "SMA200_CROSSOVER":
-            return 2
+            return cls.SMA_POINTS[200]
 
         elif sig_type == "SMA50_CROSSOVER":
-            return 1
+            return cls.SMA_POINTS[50]
 
         return 0
 
+    # Scoring constants (scanner.sweep.ScoreWeights defaults to these)
+    ATH_NEW_HIGH_POINTS = 3
+    VOLUME_EXTREME_RATIO = 5.0
+    VOLUME_EXTREME_POINTS = 3
+    VOLUME_HIGH_RATIO = 3.0
+    VOLUME_HIGH_POINTS = 2
+    VOLUME_SPIKE_POINTS = 1  # Any other spike
+    MOMENTUM_STRONG_PCT = 0.15
+    MOMENTUM_STRONG_POINTS = 2
+    MOMENTUM_GOOD_PCT = 0.10
+    MOMENTUM_GOOD_POINTS = 1
+    # Points for SMA crossovers by period
+    SMA_POINTS = {50: 1, 200: 2}
+    # Added to a stock-week with two or more scoring signal types
+    CONFLUENCE_BONUS = 1
+
+    @classmethod
+    def ath_points(cls, new_high: np.ndarray) -> np.ndarray:
+        """ATH breakout points: ATH_NEW_HIGH_POINTS for an actual new high, else 0."""
+        return np.where(new_high, cls.ATH_NEW_HIGH_POINTS, 0)
+
+    @classmethod
+    def volume_points(cls, ratio: np.ndarray) -> np.ndarray:
+        """Volume spike points by ratio to average (for cells that spike)."""
+        return np.where(
+            ratio >= cls.VOLUME_EXTREME_RATIO,
+            cls.VOLUME_EXTREME_POINTS,
+            np.where(ratio >= cls.VOLUME_HIGH_RATIO, cls.VOLUME_HIGH_POINTS, cls.VOLUME_SPIKE_POINTS),
+        )
+
+    @classmethod
+    def momentum_points(cls, change: np.ndarray) -> np.ndarray:
+        """Momentum points by absolute weekly change (for cells that fire)."""
+        with np.errstate(invalid="ignore"):
+            magnitude = np.abs(change)
+            return np.where(
+                magnitude >= cls.MOMENTUM_STRONG_PCT,
+                cls.MOMENTUM_STRONG_POINTS,
+                np.where(magnitude >= cls.MOMENTUM_GOOD_PCT, cls.MOMENTUM_GOOD_POINTS, 0),
+            )
+
     def aggregate_by_stock_week(
         self,
         signals: List[HistoricalSignal],
@@ -654,6 +1171,21 @@ class HistoricalSignalDetector:
 
         Returns list of ScoredStockWeek sorted by score (descending).
         """
+        scored_weeks = self.group_stock_weeks(signals)
+
+        # Sort by score descending, then date descending
+        scored_weeks.sort(key=lambda x: (x.total_score, x.date), reverse=True)
+
+        return scored_weeks
+
+    def group_stock_weeks(
+        self,
+        signals: List[HistoricalSignal],
+    ) -> List[ScoredStockWeek]:
+        """
+        Score signals and group them into ScoredStockWeek, in order of each
+        stock-week's first signal. Weeks with no scoring signal are dropped.
+        """
         from collections import defaultdict
 
         # Group signals by (ticker, date)
@@ -680,8 +1212,8 @@ class HistoricalSignalDetector:
             signal_types = [s.signal_type for s in week_signals if s.score > 0]
             unique_types = set(signal_types)
 
-            # Confluence bonus: +1 if 2+ different signal types
-            confluence_bonus = 1 if len(unique_types) >= 2 else 0
+            # Confluence bonus if 2+ different signal types
+            confluence_bonus = self.CONFLUENCE_BONUS if len(unique_types) >= 2 else 0
             total_score = base_score + confluence_bonus
 
             # Get price and change from first signal
@@ -698,12 +1230,104 @@ class HistoricalSignalDetector:
                 change_pct=change_pct,
             ))
 
-        # Sort by score descending, then date descending
-        scored_weeks.sort(key=lambda x: (x.total_score, x.date), reverse=True)
-
         return scored_weeks
 
 
+class StockWeekIndex:
+    """
+    Every scored stock-week of a signal set, computed once and ordered by
+    week date (newest first).
+
+    A stock-week's score depends only on its own signals, so date, ticker and
+    membership filters can be applied to the precomputed weeks instead of
+    re-aggregating the raw signals on every query.
+    """
+
+    def __init__(self, weeks: List[ScoredStockWeek]):
+        self.weeks = weeks
+        days = np.array([w.date for w in weeks], dtype="datetime64[D]").astype(np.int64)
+        # -days is ascending for newest-first weeks, so searchsorted works
+        self._neg_days = -days
+        self._tickers = np.array([w.ticker for w in weeks], dtype=object)
+        self._scores = np.array([w.total_score for w in weeks], dtype=np.int64)
+
+    @classmethod
+    def build(cls, detector: "HistoricalSignalDetector", signals: List[HistoricalSignal]) -> "StockWeekIndex":
+        """Index signals sorted newest first (scan order)."""
+        return cls(detector.group_stock_weeks(signals))
+
+    def __len__(self) -> int:
+        return len(self.weeks)
+
+    def date_range(self, start: Optional[str] = None, end: Optional[str] = None) -> Tuple[int, int]:
+        """Index bounds of weeks with start <= date <= end (ISO dates)."""
+        lo = 0
+        hi = len(self.weeks)
+        if end:
+            lo = int(np.searchsorted(self._neg_days, -_iso_days(end), side="left"))
+        if start:
+            hi = int(np.searchsorted(self._neg_days, -_iso_days(start), side="right"))
+        return lo, max(lo, hi)
+
+    def select(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        ticker: Optional[str] = None,
+        tickers: Optional[set] = None,
+        min_score: int = 0,
+    ) -> List[ScoredStockWeek]:
+        """Weeks matching every filter, sorted by score then date (descending)."""
+        lo, hi = self.date_range(start, end)
+        keep = self._scores[lo:hi] >= min_score
+        if ticker is not None:
+            keep &= self._tickers[lo:hi] == ticker
+        if tickers is not None:
+            keep &= np.fromiter((t in tickers for t in self._tickers[lo:hi]), dtype=bool, count=hi - lo)
+
+        selected = [self.weeks[i] for i in np.flatnonzero(keep) + lo]
+        selected.sort(key=lambda x: (x.total_score, x.date), reverse=True)
+        return selected
+
+    def by_week(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        min_score: int = 0,
+    ) -> Dict[str, List[ScoredStockWeek]]:
+        """Weeks in a date range bucketed by week date (oldest first), each bucket sorted by score."""
+        buckets: Dict[str, List[ScoredStockWeek]] = {}
+        lo, hi = self.date_range(start, end)
+        for i in range(hi - 1, lo - 1, -1):
+            if self._scores[i] >= min_score:
+                buckets.setdefault(self.weeks[i].date, []).append(self.weeks[i])
+        for date, weeks in buckets.items():
+            # Reverse first so the stable sort keeps scan order among ties
+            weeks.reverse()
+            weeks.sort(key=lambda x: x.total_score, reverse=True)
+        return buckets
+
+
+def _iso_days(date: str) -> int:
+    return int(np.datetime64(date[:10], "D").astype(np.int64))
+
+
+def _detect_shard(
+    config: HistoricalConfig,
+    items: List[Tuple[str, str]],
+) -> List[HistoricalSignal]:
+    """Worker-process entry point: load (ticker, parquet path) pairs and detect signals."""
+    detector = HistoricalSignalDetector(config)
+    frames = {ticker: pd.read_parquet(path) for ticker, path in items}
+    if config.panel_mode:
+        return detector.calculate_panel_signals(SignalPanel.from_frames(frames, dtype=np.float64))
+
+    signals = []
+    for ticker, df in frames.items():
+        signals.extend(detector.calculate_signals(df, ticker))
+    return signals
+
+
 class HistoricalScanner:
     """
     Main class for historical signal scanning.
@@ -715,8 +1339,41 @@ class HistoricalScanner:
         self.config = config or HistoricalConfig()
         self.data_manager = HistoricalDataManager(self.config)
         self.detector = HistoricalSignalDetector(self.config)
-        self._signals_cache: Optional[List[HistoricalSignal]] = None
+        self._signals_table: Optional[SignalTable] = None
+        self._signals_list: Optional[List[HistoricalSignal]] = None
+        self._week_index: Optional[StockWeekIndex] = None
         self._sp500_universe = None  # Lazy-loaded SP500Universe
+        self.panel: Optional[SignalPanel] = None  # Set by panel-mode scans
+
+    @property
+    def _signals_cache(self) -> Optional[List[HistoricalSignal]]:
+        """All loaded signals as objects (materialized from the table on first use)."""
+        if self._signals_list is None and self._signals_table is not None:
+            self._signals_list = self._to_signals(self._signals_table)
+        return self._signals_list
+
+    @staticmethod
+    def _to_signals(table: SignalTable, rows: Optional[np.ndarray] = None) -> List[HistoricalSignal]:
+        return [HistoricalSignal(**record) for record in table.records(rows)]
+
+    def _set_signals(self, table: SignalTable, signals: Optional[List[HistoricalSignal]] = None) -> None:
+        self._signals_table = table
+        self._signals_list = signals
+        self._week_index = None
+
+    async def _get_week_index(self) -> StockWeekIndex:
+        """Scored stock-weeks of all loaded signals, built on first use."""
+        table = await self._get_signal_table()
+        if self._week_index is None:
+            self._week_index = StockWeekIndex.build(self.detector, self._to_signals(table))
+            logger.info(f"Indexed {len(self._week_index)} scored stock-weeks")
+        return self._week_index
+
+    async def _get_signal_table(self) -> SignalTable:
+        """Loaded signal table, scanning (or reading the store) on first use."""
+        if self._signals_table is None:
+            await self._load_or_scan()
+        return self._signals_table
 
     async def _get_sp500_universe(self):
         """Lazy-load the S&P 500 universe manager."""
@@ -728,7 +1385,7 @@ class HistoricalScanner:
 
     async def scan_universe(
         self,
-        max_concurrent: int = 10,
+        max_concurrent: Optional[int] = None,
         force_refresh: bool = False,
         custom_tickers: Optional[List[str]] = None,
     ) -> List[HistoricalSignal]:
@@ -738,57 +1395,250 @@ class HistoricalScanner:
         Downloads data if needed, then calculates signals.
 
         Args:
-            max_concurrent: Maximum concurrent API requests
+            max_concurrent: Optional cap on concurrent downloads
             force_refresh: Force refresh of cached data
             custom_tickers: Optional list of tickers to scan (instead of default universe)
         """
+        await self._load_or_scan(max_concurrent, force_refresh, custom_tickers)
+        return self._signals_cache
+
+    async def _load_or_scan(
+        self,
+        max_concurrent: Optional[int] = None,
+        force_refresh: bool = False,
+        custom_tickers: Optional[List[str]] = None,
+    ) -> None:
+        """Load the signal store if fresh, otherwise (incrementally) rescan and save it."""
         logger.info("Starting historical scan...")
 
         # Determine cache file name based on whether custom tickers are used
         if custom_tickers:
             # Use a different cache file for custom universes
-            cache_key = hash(tuple(sorted(custom_tickers))) % 10**8
-            signals_cache_file = self.config.cache_dir / f"signals_custom_{cache_key}.json"
+            cache_key = universe_key(custom_tickers, self.config, self.detector.VERSION)
+            signals_cache_file = self.config.cache_dir / f"signals_custom_{cache_key}.parquet"
         else:
-            signals_cache_file = self.config.cache_dir / "all_signals.json"
+            signals_cache_file = self.config.cache_dir / "all_signals.parquet"
+
+        store = SignalStore(signals_cache_file)
+        fingerprint = config_fingerprint(self.config, self.detector.VERSION)
+        state = None if force_refresh else store.load_state()
+        if state is not None and state.fingerprint != fingerprint:
+            logger.info("Signal configuration changed, recomputing all signals")
+            state = None
+
+        if state is not None and store.age_seconds() < timedelta(days=1).total_seconds():
+            logger.info("Loading signals from cache...")
+            self._set_signals(store.load_table())
+            return
+
+        if not self.config.incremental_signals:
+            state = None
+
+        # Download data and calculate signals
+        if state is not None:
+            logger.info(f"Updating signals incrementally (last run {state.updated_at})")
+            previous = self._to_signals(store.load_table())
+            all_signals, markers = await self._scan_pipeline(
+                max_concurrent,
+                custom_tickers,
+                detect=self._incremental_detector(previous, state),
+            )
+        elif self.config.workers > 1 or self.config.panel_mode:
+            all_signals, markers = await self._scan_batch(max_concurrent, custom_tickers)
+        else:
+            all_signals, markers = await self._scan_pipeline(max_concurrent, custom_tickers)
 
-        if not force_refresh and signals_cache_file.exists():
-            cache_age = datetime.now() - datetime.fromtimestamp(signals_cache_file.stat().st_mtime)
-            if cache_age < timedelta(days=1):
-                logger.info("Loading signals from cache...")
-                with open(signals_cache_file) as f:
-                    data = json.load(f)
-                    self._signals_cache = [HistoricalSignal(**s) for s in data]
-                    return self._signals_cache
+        # Sort by date (newest first); same-day signals by ticker, then check
+        rank = {ticker: i for i, ticker in enumerate(markers)}
+        order = HistoricalSignalDetector.SIGNAL_ORDER
+        all_signals.sort(key=lambda s: (rank.get(s.ticker, len(rank)), order.get(s.signal_type, len(order))))
+        all_signals.sort(key=lambda s: s.date, reverse=True)
+
+        logger.info(f"Total signals detected: {len(all_signals)}")
+
+        # Cache
+        table = SignalTable.from_signals(all_signals)
+        store.save(table, SignalStoreState(
+            fingerprint=fingerprint,
+            tickers=markers,
+            detector_version=self.detector.VERSION,
+        ))
+
+        self._set_signals(table, all_signals)
 
-        # Download data
+    @staticmethod
+    def _bar_marker(df: pd.DataFrame) -> BarMarker:
+        """Marker for the last bar of a frame."""
+        return BarMarker(date=df["date"].iloc[-1].strftime("%Y-%m-%d"), close=float(df["close"].iloc[-1]))
+
+    @staticmethod
+    def _first_new_row(df: pd.DataFrame, marker: Optional[BarMarker]) -> Optional[int]:
+        """
+        Row after the marker's bar, or None if the frame no longer contains
+        that bar unchanged (new ticker, or history rewritten by a split).
+        """
+        if marker is None:
+            return None
+        target = pd.Timestamp(marker.date)
+        pos = int(df["date"].searchsorted(target))
+        if pos >= len(df) or df["date"].iloc[pos] != target:
+            return None
+        if not np.isclose(df["close"].iloc[pos], marker.close, rtol=1e-4):
+            return None
+        return pos + 1
+
+    def _incremental_detector(
+        self,
+        previous: List[HistoricalSignal],
+        state: SignalStoreState,
+    ) -> Callable[[pd.DataFrame, str], List[HistoricalSignal]]:
+        """Detect function that reuses stored signals and scans only new bars."""
+        stored: Dict[str, List[HistoricalSignal]] = {}
+        for signal in previous:
+            stored.setdefault(signal.ticker, []).append(signal)
+
+        head_rows = self.detector.HEAD_ROWS
+
+        def detect(df: pd.DataFrame, ticker: str) -> List[HistoricalSignal]:
+            start_row = self._first_new_row(df, state.tickers.get(ticker))
+            if start_row is None:
+                return self.detector.calculate_signals(df, ticker)
+
+            # Refreshed frames are trimmed to the years window, so the head may
+            # have slid: per signal type, rows whose lookback reaches the first
+            # bar are recomputed along with the new bars; stored signals after
+            # that span are kept
+            head_end = {
+                signal_type: df["date"].iloc[rows].strftime("%Y-%m-%d") if rows < len(df) else None
+                for signal_type, rows in head_rows.items()
+            }
+            kept = []
+            for signal in stored.get(ticker, []):
+                end = head_end[signal.signal_type]
+                if end is not None and signal.date >= end:
+                    kept.append(signal)
+            return kept + self.detector.calculate_signals_refreshed(df, ticker, start_row)
+
+        return detect
+
+    async def _scan_pipeline(
+        self,
+        max_concurrent: Optional[int],
+        custom_tickers: Optional[List[str]],
+        detect: Optional[Callable[[pd.DataFrame, str], List[HistoricalSignal]]] = None,
+    ) -> Tuple[List[HistoricalSignal], Dict[str, BarMarker]]:
+        """
+        Stream downloads into the detector.
+
+        Frames are processed as they arrive (in a thread, so downloads keep
+        flowing) and dropped right after, keeping memory flat. Signals are
+        merged in ticker order, matching a download-then-compute scan.
+
+        Returns:
+            Tuple of (signals, last-bar marker per ticker in ticker order)
+        """
+        detect = detect or self.detector.calculate_signals
+        tickers = await self.data_manager.resolve_tickers(custom_tickers)
+        logger.info(f"Downloading and scanning {len(tickers)} stocks...")
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.pipeline_queue_size)
+        results: Dict[int, Tuple[str, BarMarker, List[HistoricalSignal]]] = {}
+
+        async def consume() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                index, ticker, df = item
+                try:
+                    signals = await asyncio.to_thread(detect, df, ticker)
+                except Exception as e:
+                    # No marker either, so the next incremental scan redoes this ticker
+                    logger.warning(f"{ticker}: signal detection failed: {e}")
+                    continue
+                results[index] = (ticker, self._bar_marker(df), signals)
+                del item, df
+                if signals:
+                    logger.debug(f"{ticker}: {len(signals)} signals detected")
+
+        async def produce() -> int:
+            downloaded = await self.data_manager.stream_universe_data(
+                tickers,
+                queue,
+                max_concurrent=max_concurrent,
+                weekly=self.config.resample_to_weekly,
+            )
+            await queue.put(None)
+            return downloaded
+
+        # If either side fails, stop the other instead of leaving the
+        # downloaders blocked on a full queue
+        producer = asyncio.create_task(produce())
+        consumer = asyncio.create_task(consume())
+        try:
+            done, _ = await asyncio.wait({producer, consumer}, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+            await asyncio.gather(producer, consumer)
+        finally:
+            producer.cancel()
+            consumer.cancel()
+        downloaded = producer.result()
+
+        logger.info(f"Successfully downloaded data for {downloaded}/{len(tickers)} stocks")
+
+        ordered = [results[index] for index in sorted(results)]
+        signals = [signal for _, _, ticker_signals in ordered for signal in ticker_signals]
+        return signals, {ticker: marker for ticker, marker, _ in ordered}
+
+    async def _scan_batch(
+        self,
+        max_concurrent: Optional[int],
+        custom_tickers: Optional[List[str]],
+    ) -> Tuple[List[HistoricalSignal], Dict[str, BarMarker]]:
+        """Download every frame first, then compute signals (panel and multi-process modes)."""
         data = await self.data_manager.download_universe_data(
             max_concurrent=max_concurrent,
             weekly=self.config.resample_to_weekly,
             custom_tickers=custom_tickers,
         )
+        markers = {ticker: self._bar_marker(df) for ticker, df in data.items()}
 
-        # Calculate signals for each stock
-        all_signals = []
+        if self.config.workers > 1:
+            return await self._calculate_signals_parallel(list(data), self.config.workers), markers
 
-        for ticker, df in data.items():
-            signals = self.detector.calculate_signals(df, ticker)
-            all_signals.extend(signals)
+        # float64 so signal values match the per-ticker detector
+        self.panel = SignalPanel.from_frames(data, dtype=np.float64)
+        logger.info(f"Panel: {len(self.panel.dates)} weeks x {len(self.panel)} tickers")
+        return self.detector.calculate_panel_signals(self.panel), markers
 
-            if signals:
-                logger.debug(f"{ticker}: {len(signals)} signals detected")
+    async def _calculate_signals_parallel(
+        self,
+        tickers: List[str],
+        workers: int,
+    ) -> List[HistoricalSignal]:
+        """
+        Shard signal detection across worker processes.
 
-        # Sort by date (newest first)
-        all_signals.sort(key=lambda s: s.date, reverse=True)
+        Workers get parquet cache paths rather than pickled frames. Shards are
+        contiguous runs of tickers and are merged in shard order, so the
+        result is identical to a single-process scan.
+        """
+        weekly = self.config.resample_to_weekly
+        items = [(t, str(self.data_manager.cache_path(t, weekly))) for t in tickers]
+        shard_size = -(-len(items) // (workers * 4)) if items else 1  # A few shards per worker
+        shards = [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
 
-        logger.info(f"Total signals detected: {len(all_signals)}")
+        logger.info(f"Calculating signals for {len(items)} stocks in {len(shards)} shards on {workers} workers")
 
-        # Cache
-        with open(signals_cache_file, "w") as f:
-            json.dump([s.to_dict() for s in all_signals], f)
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = await asyncio.gather(*[
+                loop.run_in_executor(pool, _detect_shard, self.config, shard)
+                for shard in shards
+            ])
 
-        self._signals_cache = all_signals
-        return all_signals
+        return [signal for shard_signals in results for signal in shard_signals]
 
     async def get_recent_signals(
         self,
@@ -799,68 +1649,49 @@ class HistoricalScanner:
         """
         Get signals from the last N days.
         """
-        if self._signals_cache is None:
-            await self.scan_universe()
+        table = await self._get_signal_table()
 
         cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
         strength_order = {"weak": 1, "moderate": 2, "strong": 3}
         min_strength_val = strength_order.get(min_strength, 1)
 
-        filtered = []
-        for signal in self._signals_cache:
-            if signal.date < cutoff:
-                continue
-            if signal_types and signal.signal_type not in signal_types:
-                continue
-            if strength_order.get(signal.strength, 0) < min_strength_val:
-                continue
-            filtered.append(signal)
+        rows = table.select(start=cutoff, signal_types=signal_types)
+        strengths = [s for s in table.categories("strength") if strength_order.get(s, 0) >= min_strength_val]
+        rows = table.filter_in(rows, "strength", strengths)
 
-        return filtered
+        return self._to_signals(table, rows)
 
     async def get_signals_by_ticker(
         self,
         ticker: str,
     ) -> List[HistoricalSignal]:
         """Get all signals for a specific ticker."""
-        if self._signals_cache is None:
-            await self.scan_universe()
-
-        return [s for s in self._signals_cache if s.ticker == ticker]
+        table = await self._get_signal_table()
+        return self._to_signals(table, table.ticker_rows(ticker))
 
     async def get_signal_summary(self) -> Dict[str, Any]:
         """Get summary statistics of signals."""
-        if self._signals_cache is None:
-            await self.scan_universe()
-
-        signals = self._signals_cache
+        table = await self._get_signal_table()
 
-        # Count by type
-        by_type = {}
-        for s in signals:
-            by_type[s.signal_type] = by_type.get(s.signal_type, 0) + 1
-
-        # Count by strength
-        by_strength = {}
-        for s in signals:
-            by_strength[s.strength] = by_strength.get(s.strength, 0) + 1
+        # Counts by type and strength
+        by_type = table.value_counts("signal_type")
+        by_strength = table.value_counts("strength")
 
         # Recent signals (last 30 days)
         cutoff = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-        recent = [s for s in signals if s.date >= cutoff]
+        recent = table.date_range(start=cutoff)
 
         # Top tickers by signal count (last 30 days)
-        ticker_counts = {}
-        for s in recent:
-            ticker_counts[s.ticker] = ticker_counts.get(s.ticker, 0) + 1
+        ticker_counts = table.value_counts("ticker", recent)
 
         top_tickers = sorted(ticker_counts.items(), key=lambda x: x[1], reverse=True)[:20]
+        date_bounds = table.date_bounds()
 
         return {
-            "total_signals": len(signals),
+            "total_signals": len(table),
             "date_range": {
-                "start": min(s.date for s in signals) if signals else None,
-                "end": max(s.date for s in signals) if signals else None,
+                "start": date_bounds[0] if date_bounds else None,
+                "end": date_bounds[1] if date_bounds else None,
             },
             "by_type": by_type,
             "by_strength": by_strength,
@@ -901,47 +1732,78 @@ class HistoricalScanner:
         Returns:
             List of ScoredStockWeek sorted by score descending
         """
-        if self._signals_cache is None:
-            await self.scan_universe()
-
-        signals = self._signals_cache
+        # Stock-weeks are aggregated and scored once for all signals
+        index = await self._get_week_index()
 
-        # Filter by as_of_date for point-in-time analysis
-        if as_of_date:
-            signals = [s for s in signals if s.date <= as_of_date]
-
-        # Filter by date range if specified
+        # Filter by date range (point-in-time as_of_date and/or last N days)
+        cutoff = None
         if days:
             reference_date = datetime.strptime(as_of_date, "%Y-%m-%d") if as_of_date else datetime.now()
             cutoff = (reference_date - timedelta(days=days)).strftime("%Y-%m-%d")
-            signals = [s for s in signals if s.date >= cutoff]
 
-        # Filter by ticker if specified
-        if ticker:
-            signals = [s for s in signals if s.ticker == ticker.upper()]
+        members = await self._pit_members(
+            as_of_date,
+            use_sp500_pit,
+            use_marketcap_pit,
+            marketcap_universe,
+            min_market_cap,
+            max_market_cap,
+        )
+
+        return index.select(
+            start=cutoff,
+            end=as_of_date,
+            ticker=ticker.upper() if ticker else None,
+            tickers=members,
+            min_score=min_score,
+        )
 
-        # Filter to point-in-time S&P 500 members (survivorship-bias-free)
+    async def get_high_intent_weeks(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        min_score: int = 4,
+    ) -> Dict[str, List[ScoredStockWeek]]:
+        """
+        High-intent stock-weeks in a date range, bucketed by week date.
+
+        Unlike calling get_high_intent_signals once per week, this reads the
+        range in a single pass. Point-in-time universe filters depend on each
+        week's date, so apply them per bucket.
+
+        Returns:
+            Week date -> ScoredStockWeek list sorted by score, oldest week first
+        """
+        index = await self._get_week_index()
+        return index.by_week(start_date, end_date, min_score=min_score)
+
+    async def _pit_members(
+        self,
+        as_of_date: Optional[str],
+        use_sp500_pit: bool,
+        use_marketcap_pit: bool,
+        marketcap_universe: Optional[Any],
+        min_market_cap: Optional[int],
+        max_market_cap: Optional[int],
+    ) -> Optional[set]:
+        """Point-in-time universe for as_of_date, or None when not filtering."""
+        members = None
+
+        # Point-in-time S&P 500 members (survivorship-bias-free)
         if use_sp500_pit and as_of_date:
             sp500 = await self._get_sp500_universe()
-            pit_members = sp500.get_members_on_date(as_of_date)
-            signals = [s for s in signals if s.ticker in pit_members]
+            members = set(sp500.get_members_on_date(as_of_date))
 
-        # Filter by point-in-time market cap (survivorship-bias-free)
+        # Point-in-time market cap (survivorship-bias-free)
         if use_marketcap_pit and as_of_date and marketcap_universe:
-            pit_members = marketcap_universe.get_members_on_date(
+            pit_members = set(marketcap_universe.get_members_on_date(
                 as_of_date,
                 min_cap=min_market_cap,
                 max_cap=max_market_cap,
-            )
-            signals = [s for s in signals if s.ticker in pit_members]
-
-        # Aggregate by stock-week and calculate scores
-        scored_weeks = self.detector.aggregate_by_stock_week(signals)
-
-        # Filter by minimum score
-        scored_weeks = [sw for sw in scored_weeks if sw.total_score >= min_score]
+            ))
+            members = pit_members if members is None else members & pit_members
 
-        return scored_weeks
+        return members
 
     async def get_high_intent_summary(
         self,
@@ -999,7 +1861,7 @@ class HistoricalScanner:
         self,
         start_date: str = "2016-01-01",
         end_date: Optional[str] = None,
-        max_concurrent: int = 10,
+        max_concurrent: Optional[int] = None,
         force_refresh: bool = False,
     ) -> List[HistoricalSignal]:
         """
@@ -1011,7 +1873,7 @@ class HistoricalScanner:
         Args:
             start_date: Start of backtest period (YYYY-MM-DD)
             end_date: End of backtest period (default: today)
-            max_concurrent: Maximum concurrent API requests
+            max_concurrent: Optional cap on concurrent downloads
             force_refresh: Force refresh of cached data
 
         Returns:
@@ -1052,7 +1914,7 @@ class HistoricalScanner:
         marketcap_universe,
         start_date: str = "2016-01-01",
         end_date: Optional[str] = None,
-        max_concurrent: int = 10,
+        max_concurrent: Optional[int] = None,
         force_refresh: bool = False,
     ) -> List[HistoricalSignal]:
         """
@@ -1065,7 +1927,7 @@ class HistoricalScanner:
             marketcap_universe: HistoricalMarketCapUniverse instance
             start_date: Start of backtest period (YYYY-MM-DD)
             end_date: End of backtest period (default: today)
-            max_concurrent: Maximum concurrent API requests
+            max_concurrent: Optional cap on concurrent downloads
             force_refresh: Force refresh of cached data
 
         Returns:
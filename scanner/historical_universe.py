@@ -12,17 +12,26 @@ Dynamic thresholds:
 import asyncio
 import json
 import logging
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from data.fmp_client import FMPClient
 
 logger = logging.getLogger(__name__)
 
 CACHE_DIR = Path("data/cache/historical")
 
+# Tickers fetched between market cap checkpoints
+CHECKPOINT_EVERY = 200
+
+# Latest annual record older than this (~15 months): a newer one should be out
+STALE_RECORD_DAYS = 450
+
 
 @dataclass
 class MarketCapThreshold:
@@ -43,6 +52,81 @@ DEFAULT_THRESHOLDS = [
 ]
 
 
+class MarketCapIndex:
+    """
+    Market cap history indexed for point-in-time lookups.
+
+    Each ticker's entries are sorted by date once, so a single lookup is a
+    bisect and the caps of every ticker on a date come from one vectorized
+    pass over the flattened history. Per-date cap vectors are memoized,
+    since backtests ask for the same week-end dates over and over.
+    """
+
+    def __init__(self, history: Dict[str, List[Dict[str, Any]]]):
+        self.tickers = np.array(list(history), dtype=object)
+        self._dates: Dict[str, List[str]] = {}
+        self._caps: Dict[str, List[Any]] = {}
+
+        flat_dates = []
+        flat_caps = []
+        counts = []
+        for ticker, entries in history.items():
+            # Sorted by date; for duplicate dates the first entry wins, as with max()
+            by_date: Dict[str, Any] = {}
+            for entry in entries:
+                by_date.setdefault(entry["date"], entry.get("marketCap"))
+            dates = sorted(by_date)
+            caps = [by_date[d] for d in dates]
+            self._dates[ticker] = dates
+            self._caps[ticker] = caps
+            flat_dates.extend(d[:10] for d in dates)
+            flat_caps.extend(np.nan if not c else c for c in caps)
+            counts.append(len(dates))
+
+        counts = np.array(counts, dtype=np.int64)
+        starts = np.cumsum(counts) - counts
+        # Tickers with at least one entry, and where their entries start
+        self._with_history = np.flatnonzero(counts > 0)
+        self._starts = starts[self._with_history]
+        self._flat_dates = np.array(flat_dates, dtype="datetime64[D]")
+        self._flat_caps = np.array(flat_caps, dtype=np.float64)
+        self._caps_by_date: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def cap_on(self, ticker: str, target_date: str) -> Optional[Any]:
+        """Most recent market cap reported on or before target_date."""
+        dates = self._dates.get(ticker)
+        if not dates:
+            return None
+        pos = bisect_right(dates, target_date)
+        return self._caps[ticker][pos - 1] if pos else None
+
+    def caps_on(self, target_date: str) -> np.ndarray:
+        """Market cap of every ticker on a date (NaN when none is known yet)."""
+        caps = self._caps_by_date.get(target_date)
+        if caps is None:
+            caps = np.full(len(self.tickers), np.nan)
+            if len(self._starts):
+                known = self._flat_dates <= np.datetime64(target_date[:10], "D")
+                # Entries are sorted within each ticker, so the known ones are a prefix
+                n_known = np.add.reduceat(known.astype(np.int64), self._starts)
+                has = n_known > 0
+                caps[self._with_history[has]] = self._flat_caps[self._starts[has] + n_known[has] - 1]
+            self._caps_by_date[target_date] = caps
+        return caps
+
+    def members(self, target_date: str, min_cap: float, max_cap: Optional[float] = None) -> Set[str]:
+        """Tickers with min_cap <= market cap (<= max_cap) on a date."""
+        caps = self.caps_on(target_date)
+        with np.errstate(invalid="ignore"):
+            keep = caps >= min_cap
+            if max_cap is not None:
+                keep &= caps <= max_cap
+        return set(self.tickers[keep].tolist())
+
+
 class HistoricalMarketCapUniverse:
     """
     Manages point-in-time market cap filtering for survivorship-bias-free backtesting.
@@ -56,7 +140,12 @@ class HistoricalMarketCapUniverse:
         self.thresholds = thresholds or DEFAULT_THRESHOLDS
         self._tickers: Optional[List[str]] = None
         self._market_cap_history: Dict[str, List[Dict]] = {}  # ticker -> [{date, marketCap}, ...]
+        self._no_data: Dict[str, str] = {}  # ticker -> date of the last fetch that found no data
+        self._index: Optional[MarketCapIndex] = None
+        self._index_source: Optional[Dict[str, List[Dict]]] = None
         self._cache_file = CACHE_DIR / "market_cap_history.json"
+        self._checkpoint_file = CACHE_DIR / "market_cap_history.partial.json"
+        self._no_data_file = CACHE_DIR / "market_cap_no_data.json"
         self._tickers_file = CACHE_DIR / "universe_1b_tickers.json"
 
     def get_threshold_for_date(self, date: str) -> int:
@@ -93,6 +182,15 @@ class HistoricalMarketCapUniverse:
             with open(self._cache_file) as f:
                 self._market_cap_history = json.load(f)
             logger.info(f"Loaded market cap history for {len(self._market_cap_history)} tickers")
+        elif not force_refresh and self._cache_file.exists():
+            # Refresh: only tickers without a recent annual record
+            with open(self._cache_file) as f:
+                self._market_cap_history = json.load(f)
+            if self._no_data_file.exists():
+                with open(self._no_data_file) as f:
+                    self._no_data = json.load(f)
+            logger.info("Refreshing stale market cap history from API...")
+            await self._fetch_all_market_caps(stale_only=True)
         else:
             logger.info("Fetching market cap history from API (this may take a while)...")
             await self._fetch_all_market_caps()
@@ -112,78 +210,167 @@ class HistoricalMarketCapUniverse:
         logger.info(f"Saved {len(self._tickers)} tickers to cache")
 
     async def _fetch_market_cap_for_ticker(self, ticker: str) -> Optional[List[Dict]]:
-        """Fetch historical market cap for a single ticker."""
-        try:
-            data = await self.fmp._request(
-                f'/enterprise-values/{ticker}',
-                params={'period': 'annual', 'limit': 20}
-            )
-            if data:
-                # Extract just date and market cap
-                return [
-                    {'date': d['date'], 'marketCap': d.get('marketCapitalization', 0)}
-                    for d in data
-                    if d.get('date') and d.get('marketCapitalization')
-                ]
-        except Exception as e:
-            logger.debug(f"Failed to get market cap for {ticker}: {e}")
-        return None
-
-    async def _fetch_all_market_caps(self, max_concurrent: int = 10) -> None:
-        """Fetch historical market cap for all tickers."""
-        if not self._tickers:
-            raise RuntimeError("No tickers loaded")
-
-        total = len(self._tickers)
-        self._market_cap_history = {}
+        """
+        Fetch historical market cap for a single ticker.
 
-        # Process in batches
-        batch_size = max_concurrent
-        for i in range(0, total, batch_size):
-            batch = self._tickers[i:i + batch_size]
+        Returns None when the ticker has no data; request errors propagate
+        so callers can retry the ticker later.
+        """
+        data = await self.fmp._request(
+            f'/enterprise-values/{ticker}',
+            params={'period': 'annual', 'limit': 20}
+        )
+        if data:
+            # Extract just date and market cap
+            return [
+                {'date': d['date'], 'marketCap': d.get('marketCapitalization', 0)}
+                for d in data
+                if d.get('date') and d.get('marketCapitalization')
+            ]
+        return None
 
-            tasks = [self._fetch_market_cap_for_ticker(t) for t in batch]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+    def _stale_tickers(self) -> List[str]:
+        """
+        Tickers whose latest annual record is old enough that a newer one
+        should exist, or never fetched. Tickers that had no data are
+        retried once their last attempt is as old as that cutoff.
+        """
+        cutoff = (datetime.now() - timedelta(days=STALE_RECORD_DAYS)).strftime("%Y-%m-%d")
+        latest = dict(self._no_data)
+        latest.update({
+            ticker: max(entry['date'] for entry in entries)
+            for ticker, entries in self._market_cap_history.items()
+            if entries
+        })
+        return [t for t in self._tickers if t not in latest or latest[t] < cutoff]
+
+    async def _fetch_all_market_caps(
+        self,
+        max_concurrent: Optional[int] = None,
+        stale_only: bool = False,
+        checkpoint_every: int = CHECKPOINT_EVERY,
+    ) -> None:
+        """
+        Fetch historical market cap for all tickers (or only stale ones).
 
-            for ticker, result in zip(batch, results):
-                if isinstance(result, list) and result:
-                    self._market_cap_history[ticker] = result
+        A fixed pool of fetchers paced by the shared FMP rate limiter works
+        through the tickers. Progress is checkpointed every checkpoint_every
+        tickers, and an interrupted fetch resumes from the checkpoint.
 
-            # Progress update
-            progress = min(i + batch_size, total)
-            if progress % 100 == 0 or progress == total:
-                logger.info(f"Fetched market cap: {progress}/{total} ({len(self._market_cap_history)} with data)")
+        Args:
+            max_concurrent: Number of fetchers (default: settings.fmp_max_concurrency)
+            stale_only: Keep the loaded history and fetch only _stale_tickers()
+            checkpoint_every: Tickers between checkpoint writes
+        """
+        if not self._tickers:
+            raise RuntimeError("No tickers loaded")
 
-            # Rate limiting
-            await asyncio.sleep(0.5)
+        tickers = self._stale_tickers() if stale_only else list(self._tickers)
+        history = dict(self._market_cap_history) if stale_only else {}
+        no_data = dict(self._no_data) if stale_only else {}
+        done: Set[str] = set()
+        today = datetime.now().strftime("%Y-%m-%d")
+
+        checkpoint = self._load_checkpoint()
+        if checkpoint is not None:
+            history.update(checkpoint["history"])
+            no_data.update(checkpoint["no_data"])
+            done = set(checkpoint["done"])
+            logger.info(f"Resuming market cap fetch from checkpoint ({len(done)} tickers done)")
+
+        remaining = [t for t in tickers if t not in done]
+        total = len(tickers)
+        fetched = total - len(remaining)
+        pending = iter(remaining)
+        failed: List[str] = []
+
+        async def fetcher() -> None:
+            nonlocal fetched
+            for ticker in pending:
+                try:
+                    result = await self._fetch_market_cap_for_ticker(ticker)
+                except Exception as e:
+                    # Not marked done, so a resume or the next refresh retries it
+                    logger.debug(f"Failed to get market cap for {ticker}: {e}")
+                    failed.append(ticker)
+                else:
+                    if result:
+                        history[ticker] = result
+                        no_data.pop(ticker, None)
+                    else:
+                        # Remembered so refreshes skip it until the stale cutoff
+                        no_data[ticker] = today
+                    done.add(ticker)
+
+                fetched += 1
+                if fetched % checkpoint_every == 0:
+                    self._save_checkpoint(history, no_data, done)
+                    logger.info(f"Fetched market cap: {fetched}/{total} ({len(history)} with data)")
+
+        workers = max_concurrent or self.fmp.settings.fmp_max_concurrency
+        tasks = [asyncio.create_task(fetcher()) for _ in range(min(workers, len(remaining)))]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the other fetchers and keep what was fetched so far
+            for task in tasks:
+                task.cancel()
+            self._save_checkpoint(history, no_data, done)
+            raise
+
+        self._market_cap_history = history
+        self._no_data = no_data
+        _write_json(self._cache_file, history)
+        _write_json(self._no_data_file, no_data)
+        self._checkpoint_file.unlink(missing_ok=True)
+        if failed:
+            logger.warning(f"Market cap fetch failed for {len(failed)} tickers (retried on next refresh)")
+        logger.info(f"Saved market cap history for {len(history)} tickers ({total} fetched)")
+
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Checkpoint of an interrupted fetch, if one from the last week exists."""
+        if not self._checkpoint_file.exists():
+            return None
+        age = datetime.now() - datetime.fromtimestamp(self._checkpoint_file.stat().st_mtime)
+        if age >= timedelta(days=7):
+            return None
+        try:
+            with open(self._checkpoint_file) as f:
+                checkpoint = json.load(f)
+            return {
+                "history": dict(checkpoint["history"]),
+                "no_data": dict(checkpoint.get("no_data", {})),
+                "done": list(checkpoint["done"]),
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring unreadable market cap checkpoint: {self._checkpoint_file}")
+            return None
 
-        # Save cache
-        with open(self._cache_file, 'w') as f:
-            json.dump(self._market_cap_history, f)
-        logger.info(f"Saved market cap history for {len(self._market_cap_history)} tickers")
+    def _save_checkpoint(
+        self,
+        history: Dict[str, List[Dict]],
+        no_data: Dict[str, str],
+        done: Set[str],
+    ) -> None:
+        _write_json(self._checkpoint_file, {"history": history, "no_data": no_data, "done": sorted(done)})
+
+    @property
+    def index(self) -> MarketCapIndex:
+        """Point-in-time index over the loaded history (rebuilt when it changes)."""
+        history = self._market_cap_history
+        if self._index is None or self._index_source is not history or len(self._index) != len(history):
+            self._index = MarketCapIndex(history)
+            self._index_source = history
+        return self._index
 
     def get_market_cap_on_date(self, ticker: str, target_date: str) -> Optional[int]:
         """
         Get the market cap for a ticker at a specific date.
 
-        Uses the most recent annual report data that is <= target_date.
+        Uses the most recent annual report data that is <= target_date
+        (None if target_date is before all records).
         """
-        if ticker not in self._market_cap_history:
-            return None
-
-        history = self._market_cap_history[ticker]
-
-        # Find the most recent market cap <= target_date
-        valid_entries = [h for h in history if h['date'] <= target_date]
-
-        if not valid_entries:
-            # If target_date is before all records, use the oldest available
-            # (stock existed but we don't have earlier data)
-            return None
-
-        # Get the most recent one
-        most_recent = max(valid_entries, key=lambda x: x['date'])
-        return most_recent['marketCap']
+        return self.index.cap_on(ticker, target_date)
 
     def get_members_on_date(
         self,
@@ -204,16 +391,7 @@ class HistoricalMarketCapUniverse:
         """
         # Use provided min_cap or fall back to dynamic threshold
         threshold = min_cap if min_cap is not None else self.get_threshold_for_date(target_date)
-        members = set()
-
-        for ticker in self._market_cap_history:
-            market_cap = self.get_market_cap_on_date(ticker, target_date)
-            if market_cap and market_cap >= threshold:
-                # Apply max cap filter if specified
-                if max_cap is None or market_cap <= max_cap:
-                    members.add(ticker)
-
-        return members
+        return self.index.members(target_date, threshold, max_cap)
 
     def get_members_with_stats(self, target_date: str) -> Tuple[Set[str], Dict]:
         """
@@ -240,6 +418,14 @@ class HistoricalMarketCapUniverse:
         await self.fmp.close()
 
 
+def _write_json(path: Path, data: Any) -> None:
+    """Write JSON via a temporary file, so an interrupted write never leaves a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    tmp_path.replace(path)
+
+
 async def test_historical_universe():
     """Test the historical universe reconstruction."""
     universe = HistoricalMarketCapUniverse()
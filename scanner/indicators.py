@@ -0,0 +1,131 @@
+"""
+Local technical indicators computed with NumPy.
+
+Replaces per-ticker /technical-indicators API calls: daily closes for many
+tickers are packed into one left-aligned 2-D array (tickers x bars, NaN
+padded on the right) and every indicator is computed for all rows at once.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def pack_series(series: Dict[str, Sequence[float]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Pack per-ticker series (oldest first) into a left-aligned matrix.
+
+    Returns:
+        Tuple of (tickers, values[tickers, bars], lengths[tickers])
+    """
+    tickers = list(series)
+    lengths = np.array([len(series[t]) for t in tickers], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+
+    values = np.full((len(tickers), width), np.nan, dtype=np.float64)
+    for i, ticker in enumerate(tickers):
+        values[i, :lengths[i]] = series[ticker]
+    return tickers, values, lengths
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average along the last axis (NaN until `period` bars)."""
+    values = np.atleast_2d(values)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < period:
+        return out
+    csum = np.cumsum(values, axis=-1)
+    out[..., period - 1] = csum[..., period - 1]
+    out[..., period:] = csum[..., period:] - csum[..., :-period]
+    out[..., period - 1:] /= period
+    return out
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average, seeded with the SMA of the first `period` bars."""
+    values = np.atleast_2d(values)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < period:
+        return out
+    alpha = 2.0 / (period + 1)
+    prev = values[..., :period].mean(axis=-1)
+    out[..., period - 1] = prev
+    for t in range(period, values.shape[-1]):
+        prev = alpha * values[..., t] + (1 - alpha) * prev
+        out[..., t] = prev
+    return out
+
+
+def rsi(values: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder's Relative Strength Index."""
+    values = np.atleast_2d(values)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] <= period:
+        return out
+
+    delta = np.diff(values, axis=-1)
+    gains = np.clip(delta, 0, None)
+    losses = np.clip(-delta, 0, None)
+
+    avg_gain = gains[..., :period].mean(axis=-1)
+    avg_loss = losses[..., :period].mean(axis=-1)
+
+    def to_rsi(g: np.ndarray, l: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = g / l
+            return np.where(l == 0, 100.0, 100.0 - 100.0 / (1.0 + rs))
+
+    out[..., period] = to_rsi(avg_gain, avg_loss)
+    for t in range(period, delta.shape[-1]):
+        avg_gain = (avg_gain * (period - 1) + gains[..., t]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[..., t]) / period
+        out[..., t + 1] = to_rsi(avg_gain, avg_loss)
+    return out
+
+
+def latest(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Value at each row's last real bar of a left-aligned matrix."""
+    values = np.atleast_2d(values)
+    result = np.full(len(lengths), np.nan)
+    has_data = lengths > 0
+    rows = np.nonzero(has_data)[0]
+    result[rows] = values[rows, lengths[rows] - 1]
+    return result
+
+
+def latest_indicators(
+    closes: Dict[str, Sequence[float]],
+    sma_periods: Sequence[int] = (20, 50, 200),
+    ema_periods: Sequence[int] = (),
+    rsi_period: int = 14,
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Latest SMA/EMA/RSI values for many tickers in one vectorized pass.
+
+    Args:
+        closes: Ticker -> daily closes, oldest first
+
+    Returns:
+        Ticker -> {"sma_20": ..., "sma_50": ..., "sma_200": ..., "rsi_14": ...}
+        with None where there is not enough history.
+    """
+    if not closes:
+        return {}
+
+    tickers, values, lengths = pack_series(closes)
+
+    columns: Dict[str, np.ndarray] = {}
+    for period in sma_periods:
+        columns[f"sma_{period}"] = latest(sma(values, period), lengths)
+    for period in ema_periods:
+        columns[f"ema_{period}"] = latest(ema(values, period), lengths)
+    if rsi_period:
+        columns[f"rsi_{rsi_period}"] = latest(rsi(values, rsi_period), lengths)
+
+    return {
+        ticker: {
+            name: (None if np.isnan(col[i]) else float(col[i]))
+            for name, col in columns.items()
+        }
+        for i, ticker in enumerate(tickers)
+    }
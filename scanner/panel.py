@@ -0,0 +1,111 @@
+"""
+Cross-sectional price panel for the whole universe.
+
+Aligns every ticker's weekly OHLCV bars into 2-D arrays (dates x tickers)
+so signals can be computed for the full universe in one pass and the same
+panel can be reused by analysis code (e.g. cross-sectional lookups in the
+backtester) without going back to per-ticker DataFrames.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+PANEL_FIELDS = ["open", "high", "low", "close", "volume"]
+
+
+@dataclass
+class SignalPanel:
+    """
+    Dates x tickers OHLCV arrays, NaN where a ticker has no bar.
+
+    Attributes:
+        dates: Sorted union of all bar dates (datetime64[ns])
+        tickers: Column labels
+        fields: Field name -> array of shape (len(dates), len(tickers))
+        positions: Per-ticker row indices into dates, in bar order
+    """
+
+    dates: np.ndarray
+    tickers: List[str]
+    fields: Dict[str, np.ndarray]
+    positions: List[np.ndarray]
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Dict[str, pd.DataFrame],
+        dtype: type = np.float32,
+    ) -> "SignalPanel":
+        """
+        Build a panel from per-ticker frames (date, open, high, low, close, volume).
+
+        float32 halves memory for analysis use but rounds prices at the
+        seventh significant digit; signal scans build with float64 so their
+        output matches the per-ticker detector exactly.
+        """
+        tickers = [t for t, df in frames.items() if df is not None and not df.empty]
+        ticker_dates = [frames[t]["date"].to_numpy(dtype="datetime64[ns]") for t in tickers]
+
+        dates = np.unique(np.concatenate(ticker_dates)) if ticker_dates else np.array([], dtype="datetime64[ns]")
+        positions = [np.searchsorted(dates, d) for d in ticker_dates]
+
+        fields = {}
+        for name in PANEL_FIELDS:
+            values = np.full((len(dates), len(tickers)), np.nan, dtype=dtype)
+            for j, ticker in enumerate(tickers):
+                values[positions[j], j] = frames[ticker][name].to_numpy()
+            fields[name] = values
+
+        return cls(dates=dates, tickers=tickers, fields=fields, positions=positions)
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def ticker_dates(self) -> List[np.ndarray]:
+        """Bar dates of each ticker."""
+        return [self.dates[pos] for pos in self.positions]
+
+    def bar_matrix(self, field: str, dtype: type = np.float64) -> np.ndarray:
+        """
+        Field values as bars x tickers: column j holds ticker j's own bars,
+        oldest first, NaN-padded at the end.
+
+        Rolling windows over this layout count a ticker's bars, not calendar
+        weeks, exactly like rolling over its own DataFrame.
+        """
+        lengths = np.array([len(pos) for pos in self.positions], dtype=np.int64)
+        depth = int(lengths.max()) if len(lengths) else 0
+
+        rows = np.zeros((depth, len(self.tickers)), dtype=np.int64)
+        valid = np.arange(depth)[:, None] < lengths[None, :]
+        for j, pos in enumerate(self.positions):
+            rows[:len(pos), j] = pos
+
+        values = self.fields[field][rows, np.arange(len(self.tickers))[None, :]].astype(dtype)
+        values[~valid] = np.nan
+        return values
+
+    def column(self, ticker: str) -> int:
+        return self.tickers.index(ticker)
+
+    def asof(self, field: str, date: str) -> pd.Series:
+        """
+        Cross-section of a field at the last panel date on or before `date`.
+
+        Tickers without a bar on that date are NaN.
+        """
+        idx = int(np.searchsorted(self.dates, np.datetime64(date, "ns"), side="right")) - 1
+        if idx < 0:
+            return pd.Series(np.nan, index=self.tickers)
+        return pd.Series(self.fields[field][idx], index=self.tickers)
+
+    def series(self, ticker: str, field: str = "close") -> Optional[pd.Series]:
+        """One ticker's bars as a date-indexed Series."""
+        if ticker not in self.tickers:
+            return None
+        j = self.column(ticker)
+        pos = self.positions[j]
+        return pd.Series(self.fields[field][pos, j], index=pd.DatetimeIndex(self.dates[pos]), name=ticker)
@@ -7,10 +7,11 @@ Coordinates FMP API calls, signal detection, and news aggregation.
 import asyncio
 import logging
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Set
 
 from data.fmp_client import FMPClient
+from scanner.indicators import latest_indicators
 from scanner.signals import (
     Signal,
     SignalConfig,
@@ -102,6 +103,7 @@ class StockScanner:
         self,
         fmp_client: Optional[FMPClient] = None,
         signal_config: Optional[SignalConfig] = None,
+        use_local_technicals: bool = True,
     ):
         """
         Initialize the scanner.
@@ -109,10 +111,13 @@ class StockScanner:
         Args:
             fmp_client: FMP API client (creates new one if not provided)
             signal_config: Signal detection configuration
+            use_local_technicals: Compute SMA/RSI locally from daily bars instead
+                of calling the technical-indicator endpoints per ticker
         """
         self.fmp = fmp_client or FMPClient()
         self.detector = SignalDetector(signal_config)
         self.config = signal_config or SignalConfig()
+        self.use_local_technicals = use_local_technicals
 
     async def scan_market_movers(self) -> List[ScanResult]:
         """
@@ -175,15 +180,12 @@ class StockScanner:
         """
         logger.info(f"Scanning {len(tickers)} specific tickers...")
 
-        # Fetch quotes in batches
-        all_quotes = []
-        for i in range(0, len(tickers), 50):
-            batch = tickers[i : i + 50]
-            quotes = await self.fmp.get_batch_quotes(batch)
-            if quotes:
-                all_quotes.extend(quotes)
+        # Fetch quotes (chunked and sent concurrently by the client)
+        missing: List[str] = []
+        all_quotes = await self.fmp.get_batch_quotes(tickers, missing=missing)
 
-        logger.info(f"Fetched quotes for {len(all_quotes)} tickers")
+        logger.info(f"Fetched quotes for {len(all_quotes)} tickers"
+                    + (f" ({len(missing)} without a quote)" if missing else ""))
 
         # Detect signals for each stock
         results = []
@@ -216,17 +218,57 @@ class StockScanner:
 
         return await self.scan_tickers(tickers)
 
+    async def get_local_technicals(
+        self,
+        tickers: List[str],
+        lookback_days: int = 400,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute SMA 20/50/200 and RSI 14 locally from daily bars.
+
+        Bars come from the price store (only missing ranges hit the API), and
+        all tickers are computed in one vectorized pass.
+
+        Returns:
+            Ticker -> {"sma_20", "sma_50", "sma_200", "rsi_14"} for tickers with bars
+        """
+        end = datetime.now()
+        start_date = (end - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+        end_date = end.strftime("%Y-%m-%d")
+
+        responses = await asyncio.gather(
+            *[self.fmp.get_price_columns(t, start_date, end_date) for t in tickers],
+            return_exceptions=True,
+        )
+
+        closes = {}
+        for ticker, columns in zip(tickers, responses):
+            if isinstance(columns, Exception) or not len(columns["close"]):
+                continue
+            closes[ticker] = columns["close"]
+
+        return latest_indicators(closes, sma_periods=(20, 50, 200), rsi_period=14)
+
     async def enrich_with_technicals(self, results: List[ScanResult]) -> List[ScanResult]:
         """
         Enrich results with additional technical indicators.
 
         Adds SMA crossover detection for stocks that don't have it yet.
+        Indicators are computed locally; the per-ticker API path is only
+        used for tickers without daily bars.
         """
         logger.info(f"Enriching {len(results)} stocks with technicals...")
 
+        local_technicals: Dict[str, Dict[str, Any]] = {}
+        if self.use_local_technicals and results:
+            local_technicals = await self.get_local_technicals([r.ticker for r in results])
+            logger.info(f"Computed technicals locally for {len(local_technicals)}/{len(results)} stocks")
+
         async def fetch_technicals(result: ScanResult) -> ScanResult:
             try:
-                scanner_data = await self.fmp.get_scanner_data(result.ticker)
+                scanner_data = local_technicals.get(result.ticker)
+                if scanner_data is None:
+                    scanner_data = await self.fmp.get_scanner_data(result.ticker)
 
                 # Update stock data with technicals
                 stock = StockData(
@@ -259,9 +301,9 @@ class StockScanner:
 
             return result
 
-        # Fetch technicals in parallel (limit concurrency)
+        # Fetch technicals in parallel (FMPClient's rate limiter paces any API fallbacks)
         enriched = await asyncio.gather(
-            *[fetch_technicals(r) for r in results[:30]],  # Limit to top 30 to avoid rate limits
+            *[fetch_technicals(r) for r in results],
             return_exceptions=True,
         )
 
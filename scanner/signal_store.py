@@ -0,0 +1,139 @@
+"""
+Persistent historical signal store.
+
+Keeps the detected signals together with the detector configuration they
+were computed with and, per ticker, the last bar that was processed. A
+later scan with the same configuration only has to look at bars added
+since then; a threshold change invalidates the whole store.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from scanner.signal_table import SignalTable
+
+logger = logging.getLogger(__name__)
+
+
+def config_fingerprint(config: Any, detector_version: int) -> str:
+    """Stable digest of the settings that change detector output (including history length)."""
+    payload = {
+        "detector_version": detector_version,
+        "years_of_data": config.years_of_data,
+        "resample_to_weekly": config.resample_to_weekly,
+        "ath_threshold_pct": config.ath_threshold_pct,
+        "volume_spike_multiplier": config.volume_spike_multiplier,
+        "sma_cross_periods": list(config.sma_cross_periods),
+        "min_gain_pct": config.min_gain_pct,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def universe_key(tickers: Iterable[str], config: Any, detector_version: int) -> str:
+    """
+    Stable cache key for a custom universe scan.
+
+    Same tickers (in any order), history length and detector settings give
+    the same key in every process, unlike the built-in hash() of strings.
+    """
+    payload = {
+        "tickers": sorted(set(tickers)),
+        "years_of_data": config.years_of_data,
+        "config": config_fingerprint(config, detector_version),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def find_signal_stores(cache_dir: Path) -> List["SignalStore"]:
+    """Signal stores in a historical cache directory (default and custom universes)."""
+    return [SignalStore(p) for p in sorted(Path(cache_dir).glob("*signals*.parquet"))]
+
+
+@dataclass
+class BarMarker:
+    """Last bar a ticker's signals were computed through."""
+
+    date: str
+    close: float
+
+
+@dataclass
+class SignalStoreState:
+    """Sidecar metadata for a signal store."""
+
+    fingerprint: str
+    updated_at: str = ""
+    tickers: Dict[str, BarMarker] = field(default_factory=dict)
+    # Detector version the signals were computed with (0: not recorded)
+    detector_version: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "updated_at": self.updated_at,
+            "detector_version": self.detector_version,
+            "tickers": {t: asdict(m) for t, m in self.tickers.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SignalStoreState":
+        return cls(
+            fingerprint=data["fingerprint"],
+            updated_at=data.get("updated_at", ""),
+            detector_version=data.get("detector_version", 0),
+            tickers={t: BarMarker(**m) for t, m in data.get("tickers", {}).items()},
+        )
+
+
+class SignalStore:
+    """
+    Columnar signals file (see SignalTable) plus a ``<name>.state.json`` sidecar.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.state_path = self.path.with_suffix(".state.json")
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def age_seconds(self) -> float:
+        return datetime.now().timestamp() - self.path.stat().st_mtime
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in (self.path, self.state_path) if p.exists())
+
+    def delete(self) -> None:
+        self.state_path.unlink(missing_ok=True)
+        self.path.unlink(missing_ok=True)
+
+    def load_table(self) -> SignalTable:
+        """Open the signals file; columns other than date/ticker/type load on demand."""
+        return SignalTable.read_parquet(self.path)
+
+    def load_signals(self) -> List[Dict[str, Any]]:
+        return self.load_table().records()
+
+    def load_state(self) -> Optional[SignalStoreState]:
+        """State of the store, or None if it has none (e.g. written by an older version)."""
+        if not self.path.exists() or not self.state_path.exists():
+            return None
+        try:
+            with open(self.state_path) as f:
+                return SignalStoreState.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring unreadable signal store state: {self.state_path}")
+            return None
+
+    def save(self, table: SignalTable, state: SignalStoreState) -> None:
+        """Write signals, then state (a crash in between leaves no usable state)."""
+        state.updated_at = datetime.now().isoformat(timespec="seconds")
+        self.state_path.unlink(missing_ok=True)
+        table.write_parquet(self.path)
+        with open(self.state_path, "w") as f:
+            json.dump(state.to_dict(), f)
@@ -0,0 +1,239 @@
+"""
+Columnar, indexed signal table.
+
+Signals are held as NumPy columns in scan order (newest date first) and
+persisted as Parquet with ticker, signal type and strength dictionary-encoded.
+Date-range queries binary-search the date column, ticker queries go through
+a per-ticker row index, and only the columns a query needs are read from
+disk. Rows become HistoricalSignal objects only when a query returns them.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Columns loaded up front; the rest are read on first use
+INDEX_COLUMNS = ["date", "ticker", "signal_type"]
+
+# Stored as dictionary codes + categories
+CATEGORICAL_COLUMNS = ["ticker", "signal_type", "strength"]
+
+# Column -> dtype, in HistoricalSignal field order
+SIGNAL_COLUMNS = {
+    "date": "datetime64[D]",
+    "ticker": object,
+    "signal_type": object,
+    "strength": object,
+    "price": np.float64,
+    "volume": np.int64,
+    "change_pct": np.float64,
+    "volume_vs_avg": np.float64,
+    "distance_to_high_pct": np.float64,
+    "is_new_high": np.bool_,
+    "reference_price": np.float64,
+    "period": np.int64,
+    "score": np.int64,
+}
+
+
+class SignalTable:
+    """
+    Signals as columns, ordered by date descending.
+
+    Categorical columns are (codes, categories) pairs; everything else is a
+    plain array. A table opened from a Parquet file reads non-index columns
+    lazily.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, Any],
+        length: int,
+        source: Optional[Path] = None,
+    ):
+        self._columns = columns
+        self._length = length
+        self._source = source
+        self._ticker_rows: Optional[Dict[str, np.ndarray]] = None
+
+        # -days is ascending for rows sorted newest first, so searchsorted works
+        self._neg_days = -self.column("date").astype(np.int64)
+
+    # ------------------------------------------------------------------
+    # Construction and persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_signals(cls, signals: List[Any]) -> "SignalTable":
+        """Build from HistoricalSignal objects already sorted newest first."""
+        columns = {}
+        for name, dtype in SIGNAL_COLUMNS.items():
+            values = [getattr(s, name) for s in signals]
+            if name in CATEGORICAL_COLUMNS:
+                categories, codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+                columns[name] = (codes.astype(np.int32), categories)
+            else:
+                columns[name] = np.array(values, dtype=dtype) if values else np.array([], dtype=dtype)
+        return cls(columns, len(signals))
+
+    @classmethod
+    def read_parquet(cls, path: Path) -> "SignalTable":
+        """Open a table written by write_parquet, loading only the index columns."""
+        path = Path(path)
+        table = pq.read_table(path, columns=INDEX_COLUMNS)
+        columns = {name: _from_arrow(name, table.column(name)) for name in INDEX_COLUMNS}
+        return cls(columns, table.num_rows, source=path)
+
+    def write_parquet(self, path: Path) -> None:
+        arrays = {}
+        for name in SIGNAL_COLUMNS:
+            values = self.column(name)
+            if name in CATEGORICAL_COLUMNS:
+                codes, categories = values
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(codes, type=pa.int32()),
+                    pa.array(list(categories), type=pa.string()),
+                )
+            elif name == "date":
+                arrays[name] = pa.array(values, type=pa.date32())
+            else:
+                arrays[name] = pa.array(values)
+        pq.write_table(pa.table(arrays), path)
+
+    # ------------------------------------------------------------------
+    # Columns
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._length
+
+    def column(self, name: str) -> Any:
+        """Column values (codes, categories) for categoricals; read from disk on first use."""
+        if name not in self._columns:
+            if self._source is None:
+                raise KeyError(name)
+            chunked = pq.read_table(self._source, columns=[name]).column(name)
+            self._columns[name] = _from_arrow(name, chunked)
+        return self._columns[name]
+
+    def categories(self, name: str) -> np.ndarray:
+        return self.column(name)[1]
+
+    def _category_mask(self, name: str, values: Iterable[str]) -> np.ndarray:
+        """Boolean mask over a categorical column's categories."""
+        categories = self.categories(name)
+        return np.isin(categories, np.array(list(values), dtype=object))
+
+    # ------------------------------------------------------------------
+    # Row selection
+    # ------------------------------------------------------------------
+
+    def date_range(self, start: Optional[str] = None, end: Optional[str] = None) -> np.ndarray:
+        """Rows with start <= date <= end (ISO dates), in table order."""
+        lo = 0
+        hi = self._length
+        if end:
+            lo = int(np.searchsorted(self._neg_days, -_days(end), side="left"))
+        if start:
+            hi = int(np.searchsorted(self._neg_days, -_days(start), side="right"))
+        return np.arange(lo, max(lo, hi))
+
+    def ticker_rows(self, ticker: str) -> np.ndarray:
+        """Rows for one ticker, in table order."""
+        if self._ticker_rows is None:
+            codes, categories = self.column("ticker")
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+            self._ticker_rows = {
+                t: order[bounds[i]:bounds[i + 1]] for i, t in enumerate(categories)
+            }
+        return self._ticker_rows.get(ticker, np.array([], dtype=np.int64))
+
+    def select(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        ticker: Optional[str] = None,
+        tickers: Optional[Iterable[str]] = None,
+        signal_types: Optional[Iterable[str]] = None,
+    ) -> np.ndarray:
+        """Rows matching every given filter, in table order."""
+        rows = self.date_range(start, end)
+        if ticker is not None:
+            ticker_rows = self.ticker_rows(ticker)
+            lo, hi = (rows[0], rows[-1] + 1) if len(rows) else (0, 0)
+            rows = ticker_rows[(ticker_rows >= lo) & (ticker_rows < hi)]
+        if tickers is not None:
+            rows = self.filter_in(rows, "ticker", tickers)
+        if signal_types:
+            rows = self.filter_in(rows, "signal_type", signal_types)
+        return rows
+
+    def filter_in(self, rows: np.ndarray, name: str, values: Iterable[str]) -> np.ndarray:
+        """Subset of rows whose categorical `name` is one of values."""
+        codes = self.column(name)[0]
+        return rows[self._category_mask(name, values)[codes[rows]]]
+
+    # ------------------------------------------------------------------
+    # Materialization and aggregates
+    # ------------------------------------------------------------------
+
+    def records(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """Rows as HistoricalSignal keyword arguments."""
+        if rows is None:
+            rows = np.arange(self._length)
+        fields = {}
+        for name in SIGNAL_COLUMNS:
+            values = self.column(name)
+            if name in CATEGORICAL_COLUMNS:
+                codes, categories = values
+                fields[name] = categories[codes[rows]].tolist()
+            elif name == "date":
+                fields[name] = np.datetime_as_string(values[rows], unit="D").tolist()
+            else:
+                fields[name] = values[rows].tolist()
+        return [dict(zip(fields, row)) for row in zip(*fields.values())]
+
+    def value_counts(self, name: str, rows: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """Counts of a categorical column, keyed in order of first appearance."""
+        codes, categories = self.column(name)
+        if rows is not None:
+            codes = codes[rows]
+        if not len(codes):
+            return {}
+        unique, first, counts = np.unique(codes, return_index=True, return_counts=True)
+        order = np.argsort(first, kind="stable")
+        return {categories[unique[i]]: int(counts[i]) for i in order}
+
+    def date_bounds(self) -> Optional[tuple]:
+        """(oldest, newest) date, or None when empty."""
+        if not self._length:
+            return None
+        dates = self.column("date")
+        return (
+            str(np.datetime_as_string(dates[-1], unit="D")),
+            str(np.datetime_as_string(dates[0], unit="D")),
+        )
+
+
+def _days(date: str) -> int:
+    return int(np.datetime64(date[:10], "D").astype(np.int64))
+
+
+def _from_arrow(name: str, chunked: pa.ChunkedArray) -> Any:
+    """In-memory column from a Parquet column."""
+    if name in CATEGORICAL_COLUMNS:
+        # Chunks (row groups) may carry different dictionaries; unify to one
+        if not pa.types.is_dictionary(chunked.type):
+            chunked = chunked.dictionary_encode()
+        combined = chunked.unify_dictionaries().combine_chunks()
+        codes = combined.indices.to_numpy(zero_copy_only=False).astype(np.int32)
+        categories = np.array(combined.dictionary.to_pylist(), dtype=object)
+        return codes, categories
+    if name == "date":
+        return chunked.to_numpy().astype("datetime64[D]")
+    values = chunked.to_numpy()
+    return values.astype(SIGNAL_COLUMNS[name], copy=False) if SIGNAL_COLUMNS[name] is not object else values
@@ -0,0 +1,272 @@
+"""
+Threshold sweeps over HistoricalConfig.
+
+Evaluates many detector/scoring configurations against the same universe
+without rerunning the scanner for each one. Indicators (rolling highs, SMAs,
+volume ratios, weekly changes, forward returns) are computed once on the
+universe panel; every configuration's signal masks and stock-week scores
+are then evaluated together, with configurations as a leading array axis.
+
+Usage:
+    sweep = ThresholdSweep.from_frames(frames)
+    configs = sweep_grid(ath_threshold_pct=[0.95, 0.98], min_score=[4, 5])
+    table = sweep.run(configs)
+"""
+
+import itertools
+import logging
+from dataclasses import asdict, dataclass, field, fields, replace
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from scanner.historical import HistoricalConfig, HistoricalSignalDetector
+from scanner.panel import SignalPanel
+
+logger = logging.getLogger(__name__)
+
+# Cells (configs x bars x tickers) evaluated per batch, bounds peak memory
+BATCH_CELLS = 8_000_000
+
+
+@dataclass(frozen=True)
+class ScoreWeights:
+    """Points per signal; defaults are the detector's own scoring constants."""
+
+    ath_new_high: int = HistoricalSignalDetector.ATH_NEW_HIGH_POINTS
+    volume_extreme: int = HistoricalSignalDetector.VOLUME_EXTREME_POINTS  # >= 5x average
+    volume_high: int = HistoricalSignalDetector.VOLUME_HIGH_POINTS  # >= 3x average
+    volume_above: int = HistoricalSignalDetector.VOLUME_SPIKE_POINTS  # >= spike multiplier
+    momentum_strong: int = HistoricalSignalDetector.MOMENTUM_STRONG_POINTS  # >= 15%
+    momentum_good: int = HistoricalSignalDetector.MOMENTUM_GOOD_POINTS  # >= 10%
+    sma50_cross: int = HistoricalSignalDetector.SMA_POINTS[50]
+    sma200_cross: int = HistoricalSignalDetector.SMA_POINTS[200]
+    confluence_bonus: int = HistoricalSignalDetector.CONFLUENCE_BONUS
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """One point of a sweep: detector thresholds, scoring weights and score cutoff."""
+
+    ath_threshold_pct: float = 0.98
+    volume_spike_multiplier: float = 2.0
+    min_gain_pct: float = 0.05
+    min_score: int = 4
+    weights: ScoreWeights = field(default_factory=ScoreWeights)
+
+    @classmethod
+    def from_config(cls, config: HistoricalConfig, min_score: int = 4) -> "SweepConfig":
+        return cls(
+            ath_threshold_pct=config.ath_threshold_pct,
+            volume_spike_multiplier=config.volume_spike_multiplier,
+            min_gain_pct=config.min_gain_pct,
+            min_score=min_score,
+        )
+
+    def to_config(self, base: Optional[HistoricalConfig] = None) -> HistoricalConfig:
+        """HistoricalConfig with this point's thresholds."""
+        return replace(
+            base or HistoricalConfig(),
+            ath_threshold_pct=self.ath_threshold_pct,
+            volume_spike_multiplier=self.volume_spike_multiplier,
+            min_gain_pct=self.min_gain_pct,
+        )
+
+    def label(self) -> Dict[str, Any]:
+        """Parameters as flat columns (weights prefixed with w_)."""
+        values = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "weights"}
+        values.update({f"w_{name}": value for name, value in asdict(self.weights).items()})
+        return values
+
+
+def sweep_grid(**axes: Sequence[Any]) -> List[SweepConfig]:
+    """
+    Cartesian product of parameter values.
+
+    Keys are SweepConfig fields or ScoreWeights fields, e.g.
+    sweep_grid(ath_threshold_pct=[0.95, 0.98], volume_high=[1, 2]).
+    """
+    config_names = {f.name for f in fields(SweepConfig)} - {"weights"}
+    weight_names = {f.name for f in fields(ScoreWeights)}
+    unknown = set(axes) - config_names - weight_names
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+
+    names = list(axes)
+    configs = []
+    for values in itertools.product(*(axes[name] for name in names)):
+        point = dict(zip(names, values))
+        weights = ScoreWeights(**{k: v for k, v in point.items() if k in weight_names})
+        configs.append(SweepConfig(
+            weights=weights,
+            **{k: v for k, v in point.items() if k in config_names},
+        ))
+    return configs
+
+
+class ThresholdSweep:
+    """
+    Shared indicators for a universe, evaluated under many configurations.
+
+    Signal conditions and scoring mirror HistoricalSignalDetector (weekly
+    bars); a stock-week is one ticker's bar, scored like
+    aggregate_by_stock_week. Forward returns are close-to-close over the
+    ticker's next N bars.
+    """
+
+    def __init__(self, panel: SignalPanel, horizons: Sequence[int] = (4, 13, 26)):
+        self.panel = panel
+        self.horizons = list(horizons)
+
+        high = panel.bar_matrix("high")
+        close = panel.bar_matrix("close")
+        volume = panel.bar_matrix("volume")
+        indicators = HistoricalSignalDetector._indicator_arrays(high, close, volume)
+
+        in_range = (np.arange(close.shape[0]) >= HistoricalSignalDetector.START_IDX)[:, None]
+        prev_close = _prev(close)
+        prev_high = _prev(indicators["rolling_52w_high"])
+
+        # ATH: ratios of previous/current close to the previous 52-week high
+        with np.errstate(divide="ignore", invalid="ignore"):
+            positive = prev_high > 0
+            self._prev_pct = np.where(positive, prev_close / prev_high, 0.0)
+            self._curr_pct = np.where(positive, close / prev_high, 0.0)
+        self._ath_ok = in_range & ~np.isnan(prev_high)
+        self._new_high = close > prev_high
+
+        self._ratio = np.where(in_range, indicators["volume_ratio"], np.nan)
+        self._change = np.where(in_range, indicators["change_pct"], np.nan)
+
+        # SMA crossovers do not depend on any swept threshold
+        self._sma_cross = {}
+        for period in (50, 200):
+            sma = indicators[f"sma_{period}"]
+            prev_sma = _prev(sma)
+            self._sma_cross[period] = (
+                in_range & ~np.isnan(sma) & ~np.isnan(prev_sma) & (prev_close < prev_sma) & (close > sma)
+            )
+
+        self._forward = {}
+        for h in self.horizons:
+            forward = np.full_like(close, np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                forward[:-h] = close[h:] / close[:-h] - 1
+            self._forward[h] = forward
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], horizons: Sequence[int] = (4, 13, 26)) -> "ThresholdSweep":
+        """Build from per-ticker weekly frames (as returned by download_universe_data)."""
+        return cls(SignalPanel.from_frames(frames, dtype=np.float64), horizons)
+
+    def run(self, configs: Sequence[SweepConfig]) -> pd.DataFrame:
+        """
+        Evaluate every configuration.
+
+        Returns:
+            One row per configuration: its parameters, raw signal counts,
+            high-intent stock-weeks, and mean/hit-rate of their forward returns
+        """
+        cells = self._ratio.size or 1
+        batch = max(1, BATCH_CELLS // cells)
+        rows = []
+        for start in range(0, len(configs), batch):
+            rows.extend(self._evaluate(list(configs[start:start + batch])))
+        logger.info(f"Evaluated {len(configs)} configurations on {len(self.panel)} tickers")
+        table = pd.DataFrame(rows)
+
+        # Only show weights that were actually swept or changed
+        defaults = asdict(ScoreWeights())
+        unchanged = [
+            f"w_{name}" for name, value in defaults.items()
+            if f"w_{name}" in table and (table[f"w_{name}"] == value).all()
+        ]
+        return table.drop(columns=unchanged)
+
+    def _evaluate(self, configs: List[SweepConfig]) -> List[Dict[str, Any]]:
+        """Evaluate a batch of configurations with a leading config axis."""
+
+        def param(values: List[float]) -> np.ndarray:
+            return np.array(values, dtype=np.float64)[:, None, None]
+
+        ath_threshold = param([c.ath_threshold_pct for c in configs])
+        spike = param([c.volume_spike_multiplier for c in configs])
+        min_gain = param([c.min_gain_pct for c in configs])
+        min_score = param([c.min_score for c in configs])
+        w = {
+            name: param([getattr(c.weights, name) for c in configs])
+            for name in (f.name for f in fields(ScoreWeights))
+        }
+
+        ratio = self._ratio[None]
+        change = self._change[None]
+
+        with np.errstate(invalid="ignore"):
+            ath = self._ath_ok[None] & (self._prev_pct[None] < ath_threshold) & (self._curr_pct[None] >= ath_threshold)
+            volume = ratio >= spike
+            momentum = change >= min_gain
+            abs_change = np.abs(change)
+
+            ath_score = np.where(ath & self._new_high[None], w["ath_new_high"], 0.0)
+            volume_score = np.where(
+                volume,
+                np.where(
+                    ratio >= HistoricalSignalDetector.VOLUME_EXTREME_RATIO,
+                    w["volume_extreme"],
+                    np.where(ratio >= HistoricalSignalDetector.VOLUME_HIGH_RATIO, w["volume_high"], w["volume_above"]),
+                ),
+                0.0,
+            )
+            momentum_score = np.where(
+                momentum,
+                np.where(
+                    abs_change >= HistoricalSignalDetector.MOMENTUM_STRONG_PCT,
+                    w["momentum_strong"],
+                    np.where(abs_change >= HistoricalSignalDetector.MOMENTUM_GOOD_PCT, w["momentum_good"], 0.0),
+                ),
+                0.0,
+            )
+        sma50_score = np.where(self._sma_cross[50][None], w["sma50_cross"], 0.0)
+        sma200_score = np.where(self._sma_cross[200][None], w["sma200_cross"], 0.0)
+
+        scores = (ath_score, volume_score, sma50_score, sma200_score, momentum_score)
+        base = sum(scores)
+        scoring_types = sum((s > 0).astype(np.int8) for s in scores)
+        total = base + np.where(scoring_types >= 2, w["confluence_bonus"], 0.0)
+        selected = (base > 0) & (total >= min_score)
+
+        sma_signals = int(self._sma_cross[50].sum() + self._sma_cross[200].sum())
+        counts = {
+            "ath": ath.sum(axis=(1, 2)),
+            "volume": volume.sum(axis=(1, 2)),
+            "momentum": momentum.sum(axis=(1, 2)),
+        }
+        weeks = selected.sum(axis=(1, 2))
+        score_sum = np.where(selected, total, 0.0).sum(axis=(1, 2))
+
+        returns = {}
+        for h, forward in self._forward.items():
+            valid = selected & ~np.isnan(forward)[None]
+            n = valid.sum(axis=(1, 2))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                returns[f"ret_{h}w"] = np.where(valid, forward[None], 0.0).sum(axis=(1, 2)) / n
+                returns[f"hit_{h}w"] = (valid & (forward[None] > 0)).sum(axis=(1, 2)) / n
+
+        rows = []
+        for k, config in enumerate(configs):
+            row = config.label()
+            row["signals"] = int(counts["ath"][k] + counts["volume"][k] + counts["momentum"][k]) + sma_signals
+            row.update({name: int(values[k]) for name, values in counts.items()})
+            row["weeks"] = int(weeks[k])
+            row["avg_score"] = float(score_sum[k] / weeks[k]) if weeks[k] else float("nan")
+            row.update({name: float(values[k]) for name, values in returns.items()})
+            rows.append(row)
+        return rows
+
+
+def _prev(values: np.ndarray) -> np.ndarray:
+    shifted = np.empty_like(values)
+    shifted[0] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
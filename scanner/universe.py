@@ -6,14 +6,20 @@ at any historical date, avoiding survivorship bias.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
+from bisect import bisect_right
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
 
 from data.fmp_client import FMPClient
+from data.price_store import PriceCoverageIndex
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +36,84 @@ class UniverseStats:
     missing_tickers: List[str]
 
 
+class MembershipTimeline:
+    """
+    S&P 500 membership as snapshots between change dates.
+
+    Snapshot k holds the members for dates in [boundaries[k-1], boundaries[k]),
+    so a lookup is one bisect plus reading a bitset row. Snapshots are built
+    from the current members by reversing each change date's changes, newest
+    date first (the order FMP returns them in).
+    """
+
+    def __init__(self, boundaries: List[str], tickers: List[str], snapshots: np.ndarray):
+        self.boundaries = boundaries
+        self.tickers = np.array(tickers, dtype=object)
+        self.snapshots = snapshots  # (len(boundaries) + 1) x len(tickers) bool
+
+    @classmethod
+    def build(cls, current_members: Set[str], changes: List[Dict]) -> "MembershipTimeline":
+        by_date: Dict[str, List[Dict]] = defaultdict(list)
+        tickers = set(current_members)
+        for change in changes:
+            change_date = change.get('date', '')
+            if not change_date:
+                continue
+            by_date[change_date].append(change)
+            tickers.update(t for t in (change.get('symbol'), change.get('removedTicker')) if t)
+
+        boundaries = sorted(by_date)
+        tickers = sorted(tickers)
+        column = {t: i for i, t in enumerate(tickers)}
+
+        members = np.zeros(len(tickers), dtype=bool)
+        members[[column[t] for t in current_members]] = True
+        snapshots = np.empty((len(boundaries) + 1, len(tickers)), dtype=bool)
+        snapshots[-1] = members
+        for k in range(len(boundaries) - 1, -1, -1):
+            # Before boundaries[k]: undo that day's changes
+            for change in by_date[boundaries[k]]:
+                if change.get('symbol'):
+                    members[column[change['symbol']]] = False
+                if change.get('removedTicker'):
+                    members[column[change['removedTicker']]] = True
+            snapshots[k] = members
+
+        return cls(boundaries, tickers, snapshots)
+
+    def members_on(self, target_date: str) -> Set[str]:
+        """Members on a date: changes dated after target_date are not yet applied."""
+        row = self.snapshots[bisect_right(self.boundaries, target_date)]
+        return set(self.tickers[row].tolist())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Per-ticker membership intervals [start, end), None for unbounded."""
+        padded = np.zeros((len(self.boundaries) + 3, len(self.tickers)), dtype=np.int8)
+        padded[1:-1] = self.snapshots
+        edges = np.diff(padded, axis=0)
+        dates = [None] + self.boundaries + [None]
+
+        intervals = {}
+        for j, ticker in enumerate(self.tickers.tolist()):
+            starts = np.flatnonzero(edges[:, j] == 1)
+            ends = np.flatnonzero(edges[:, j] == -1)
+            intervals[ticker] = [[dates[s], dates[e]] for s, e in zip(starts.tolist(), ends.tolist())]
+        return {"boundaries": self.boundaries, "intervals": intervals}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MembershipTimeline":
+        boundaries = list(data["boundaries"])
+        position = {d: k + 1 for k, d in enumerate(boundaries)}
+        tickers = list(data["intervals"])
+        snapshots = np.zeros((len(boundaries) + 1, len(tickers)), dtype=bool)
+        for j, ticker in enumerate(tickers):
+            for start, end in data["intervals"][ticker]:
+                lo = position[start] if start is not None else 0
+                hi = position[end] if end is not None else len(boundaries) + 1
+                snapshots[lo:hi, j] = True
+        return cls(boundaries, tickers, snapshots)
+
+
 class SP500Universe:
     """
     Manages point-in-time S&P 500 membership reconstruction.
@@ -42,8 +126,11 @@ class SP500Universe:
         self.fmp = FMPClient()
         self._current_members: Optional[Set[str]] = None
         self._changes: Optional[List[Dict]] = None
+        self._timeline: Optional[MembershipTimeline] = None
+        self._coverage: Optional[PriceCoverageIndex] = None
         self._changes_cache_file = CACHE_DIR / "sp500_changes.json"
         self._members_cache_file = CACHE_DIR / "sp500_current_members.json"
+        self._timeline_cache_file = CACHE_DIR / "sp500_timeline.json"
 
     async def load(self, force_refresh: bool = False) -> None:
         """Load S&P 500 data (current members and historical changes)."""
@@ -81,9 +168,32 @@ class SP500Universe:
             with open(self._members_cache_file, 'w') as f:
                 json.dump(list(self._current_members), f)
 
+        self._timeline = self._load_timeline()
+
         logger.info(f"Loaded {len(self._current_members)} current members, "
                     f"{len(self._changes)} historical changes")
 
+    def _load_timeline(self) -> MembershipTimeline:
+        """Cached membership timeline, rebuilt when the members or changes differ."""
+        source = hashlib.sha256(json.dumps(
+            [sorted(self._current_members), self._changes], sort_keys=True
+        ).encode()).hexdigest()[:16]
+
+        if self._timeline_cache_file.exists():
+            try:
+                with open(self._timeline_cache_file) as f:
+                    cached = json.load(f)
+                if cached.get("source") == source:
+                    return MembershipTimeline.from_dict(cached)
+            except (OSError, ValueError, KeyError, TypeError):
+                logger.warning(f"Ignoring unreadable membership timeline: {self._timeline_cache_file}")
+
+        timeline = MembershipTimeline.build(self._current_members, self._changes)
+        with open(self._timeline_cache_file, 'w') as f:
+            json.dump({"source": source, **timeline.to_dict()}, f)
+        logger.debug(f"Built membership timeline over {len(timeline.boundaries)} change dates")
+        return timeline
+
     def get_members_on_date(self, target_date: str) -> Set[str]:
         """
         Reconstruct S&P 500 membership as of a specific date.
@@ -94,33 +204,10 @@ class SP500Universe:
         Returns:
             Set of ticker symbols that were in S&P 500 on that date
         """
-        if self._current_members is None or self._changes is None:
+        if self._timeline is None:
             raise RuntimeError("Call load() first")
 
-        # Start with current members
-        members = set(self._current_members)
-
-        # Process changes in reverse chronological order
-        # For each change that happened AFTER target_date, reverse it
-        for change in self._changes:
-            change_date = change.get('date', '')
-
-            if not change_date or change_date <= target_date:
-                continue  # This change had already happened by target_date
-
-            # This change happened AFTER target_date, so reverse it
-            added_ticker = change.get('symbol', '')
-            removed_ticker = change.get('removedTicker', '')
-
-            # Reverse: remove the stock that was added after target_date
-            if added_ticker:
-                members.discard(added_ticker)
-
-            # Reverse: add back the stock that was removed after target_date
-            if removed_ticker:
-                members.add(removed_ticker)
-
-        return members
+        return self._timeline.members_on(target_date)
 
     async def get_members_with_data(
         self,
@@ -153,30 +240,32 @@ class SP500Universe:
         valid_members = set()
         missing_tickers = []
 
-        # Check in batches to avoid overwhelming the API
+        # Answer from the local price store; only tickers (or windows) it has
+        # never fetched go to the API
         members_list = list(members)
-        batch_size = 20
-
-        for i in range(0, len(members_list), batch_size):
-            batch = members_list[i:i + batch_size]
+        coverage = self._get_coverage_index()
+        results = coverage.has_data(members_list, target_date) if coverage else {}
+        to_check = [ticker for ticker in members_list if results.get(ticker) is None]
 
+        if to_check:
+            # FMPClient's shared rate limiter paces the requests
             tasks = [
                 self._check_price_data(ticker, target_date)
-                for ticker in batch
+                for ticker in to_check
             ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for ticker, result in zip(batch, results):
-                if isinstance(result, Exception):
-                    missing_tickers.append(ticker)
-                elif result:
-                    valid_members.add(ticker)
-                else:
-                    missing_tickers.append(ticker)
-
-            # Small delay between batches
-            if i + batch_size < len(members_list):
-                await asyncio.sleep(0.5)
+            checked = await asyncio.gather(*tasks, return_exceptions=True)
+            results.update(zip(to_check, checked))
+            if coverage is not None:
+                coverage.refresh(to_check)
+
+        for ticker in members_list:
+            result = results[ticker]
+            if isinstance(result, Exception):
+                missing_tickers.append(ticker)
+            elif result:
+                valid_members.add(ticker)
+            else:
+                missing_tickers.append(ticker)
 
         stats = UniverseStats(
             target_date=target_date,
@@ -192,6 +281,12 @@ class SP500Universe:
 
         return valid_members, stats
 
+    def _get_coverage_index(self) -> Optional[PriceCoverageIndex]:
+        """Coverage index over the client's price store (None without a store)."""
+        if self._coverage is None and self.fmp.price_store is not None:
+            self._coverage = self.fmp.price_store.coverage_index()
+        return self._coverage
+
     async def _check_price_data(self, ticker: str, target_date: str) -> bool:
         """Check if a stock has price data around the target date."""
         try:
@@ -199,7 +294,7 @@ class SP500Universe:
             start = (datetime.strptime(target_date, "%Y-%m-%d") - timedelta(days=30)).strftime("%Y-%m-%d")
             end = (datetime.strptime(target_date, "%Y-%m-%d") + timedelta(days=30)).strftime("%Y-%m-%d")
 
-            data = await self.fmp.get_historical_prices(ticker, start, end)
+            data = await self.fmp.get_historical_prices(ticker, start, end, ohlcv_only=True)
 
             if data and 'historical' in data and len(data['historical']) > 0:
                 return True
@@ -89,7 +89,8 @@ class StopLossAnalyzer:
             data = await self.fmp.get_historical_prices(
                 ticker,
                 from_date=start_date,
-                to_date=end_date
+                to_date=end_date,
+                ohlcv_only=True,
             )
             if isinstance(data, dict) and 'historical' in data:
                 return data['historical']
@@ -253,7 +254,6 @@ class StopLossAnalyzer:
                     )
                     if data:
                         self.price_data[ticker] = data
-                    await asyncio.sleep(0.2)  # Rate limit
 
         # Analyze each signal - using fair methodology
         original_returns = []
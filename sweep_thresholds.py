@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Threshold Sweep - Compare signal configurations on the cached universe.
+
+Loads weekly data once (downloading only what is missing), computes the
+shared indicators once, and evaluates every combination of the given
+thresholds and scoring weights in one pass. Each row of the output shows
+raw signal counts, high-intent stock-weeks and their forward returns.
+
+Usage:
+    # Sweep ATH threshold and volume multiplier
+    python sweep_thresholds.py --ath 0.95,0.97,0.98,1.0 --volume 2,2.5,3
+
+    # Also sweep scoring: minimum score and the weight of a 3x volume spike
+    python sweep_thresholds.py --min-score 4,5,6 --weight volume_high=1,2
+
+    # Forward returns over 4 and 13 weeks, save as CSV
+    python sweep_thresholds.py --gain 0.05,0.08,0.1 --horizons 4,13 --output sweep.csv
+
+Weights (default points):
+    ath_new_high=3, volume_extreme=3, volume_high=2, volume_above=1,
+    momentum_strong=2, momentum_good=1, sma50_cross=1, sma200_cross=2,
+    confluence_bonus=1
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scanner.historical import HistoricalConfig, HistoricalDataManager
+from scanner.sweep import ThresholdSweep, sweep_grid
+from utils.logging import setup_logging
+
+console = Console()
+
+# Result column -> table header
+HEADERS = {
+    "ath_threshold_pct": "ATH",
+    "volume_spike_multiplier": "Vol x",
+    "min_gain_pct": "Gain",
+    "min_score": "Min",
+    "signals": "Signals",
+    "ath": "ATH sig",
+    "volume": "Vol sig",
+    "momentum": "Mom sig",
+    "weeks": "Weeks",
+    "avg_score": "Avg",
+}
+
+
+def float_list(value: str) -> list:
+    return [float(v) for v in value.split(",") if v]
+
+
+def int_list(value: str) -> list:
+    return [int(v) for v in value.split(",") if v]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Sweep signal thresholds and scoring weights",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    # Grid
+    parser.add_argument("--ath", type=float_list, default=[0.98], help="ATH thresholds (default: 0.98)")
+    parser.add_argument("--volume", type=float_list, default=[2.0], help="Volume spike multipliers (default: 2.0)")
+    parser.add_argument("--gain", type=float_list, default=[0.05], help="Momentum minimum weekly gains (default: 0.05)")
+    parser.add_argument("--min-score", type=int_list, default=[4], help="Minimum composite scores (default: 4)")
+    parser.add_argument(
+        "--weight",
+        action="append",
+        default=[],
+        metavar="NAME=V1,V2",
+        help="Scoring weight values to sweep (repeatable)",
+    )
+
+    # Data / output
+    parser.add_argument("--years", type=int, default=3, help="Years of historical data (default: 3)")
+    parser.add_argument("--horizons", type=int_list, default=[4, 13, 26], help="Forward return horizons in weeks")
+    parser.add_argument("--sort", default=None, help="Sort by column (default: first return column)")
+    parser.add_argument("--output", "-o", type=Path, help="Write results as CSV")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
+
+    return parser.parse_args()
+
+
+def build_grid(args: argparse.Namespace) -> list:
+    axes = {
+        "ath_threshold_pct": args.ath,
+        "volume_spike_multiplier": args.volume,
+        "min_gain_pct": args.gain,
+        "min_score": args.min_score,
+    }
+    for spec in args.weight:
+        name, _, values = spec.partition("=")
+        if not values:
+            raise ValueError(f"Expected NAME=V1,V2 for --weight, got {spec!r}")
+        axes[name.strip()] = int_list(values)
+    return sweep_grid(**axes)
+
+
+def display_results(results, horizons: list):
+    """Display the sweep table."""
+    table = Table(title=f"Threshold Sweep ({len(results)} configurations)")
+    return_columns = [c for h in horizons for c in (f"ret_{h}w", f"hit_{h}w")]
+
+    for column in results.columns:
+        header = HEADERS.get(column) or column.removeprefix("w_").replace("_", " ")
+        table.add_column(header, justify="right")
+
+    for row in results.itertuples(index=False):
+        cells = []
+        for column, value in zip(results.columns, row):
+            if column in return_columns:
+                cells.append(f"{value * 100:+.1f}%" if column.startswith("ret") else f"{value * 100:.0f}%")
+            elif column == "avg_score":
+                cells.append(f"{value:.2f}")
+            elif isinstance(value, int):
+                cells.append(f"{value:,}")
+            else:
+                cells.append(f"{value:g}")
+        table.add_row(*cells)
+
+    console.print(table)
+
+
+async def run_sweep(args: argparse.Namespace):
+    configs = build_grid(args)
+
+    data_manager = HistoricalDataManager(HistoricalConfig(years_of_data=args.years))
+    try:
+        console.print("[dim]Loading weekly data...[/dim]")
+        frames = await data_manager.download_universe_data(weekly=True)
+    finally:
+        await data_manager.close()
+
+    console.print(f"[dim]Evaluating {len(configs)} configurations on {len(frames)} stocks...[/dim]")
+    sweep = ThresholdSweep.from_frames(frames, horizons=args.horizons)
+    results = sweep.run(configs)
+
+    sort_column = args.sort or f"ret_{args.horizons[0]}w"
+    if sort_column in results:
+        results = results.sort_values(sort_column, ascending=False, kind="stable")
+
+    display_results(results, args.horizons)
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+        console.print(f"\n[green]Saved {len(results)} rows to {args.output}[/green]")
+
+
+def main():
+    args = parse_args()
+
+    log_level = "DEBUG" if args.verbose else "INFO"
+    setup_logging(level=log_level)
+
+    try:
+        asyncio.run(run_sweep(args))
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Interrupted by user[/yellow]")
+        sys.exit(130)
+    except Exception as e:
+        console.print(f"\n[red]Error: {e}[/red]")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
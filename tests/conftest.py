@@ -0,0 +1,42 @@
+"""Shared fixtures for the test suite."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Settings require an API key; tests never reach the network
+os.environ.setdefault("FMP_API_KEY", "test")
+
+
+def make_weekly_frame(n: int, seed: int = 0, start: str = "2015-01-02") -> pd.DataFrame:
+    """
+    Synthetic weekly OHLCV bars that trigger every signal type.
+
+    A random walk with occasional jumps (new highs, momentum, SMA crosses)
+    and volume bursts (volume spikes).
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.002, 0.03, n)
+    jumps = rng.random(n) < 0.06
+    returns[jumps] += rng.uniform(0.05, 0.2, jumps.sum()) * rng.choice([-1, 1], jumps.sum())
+    close = 50 * np.exp(np.cumsum(returns))
+
+    volume = rng.uniform(0.8e6, 1.2e6, n)
+    bursts = rng.random(n) < 0.05
+    volume[bursts] *= rng.uniform(2, 7, bursts.sum())
+
+    return pd.DataFrame({
+        "date": pd.date_range(start, periods=n, freq="W-FRI"),
+        "open": close * (1 - rng.uniform(0, 0.02, n)),
+        "high": close * (1 + rng.uniform(0, 0.03, n)),
+        "low": close * (1 - rng.uniform(0, 0.03, n)),
+        "close": close,
+        "volume": volume.round(),
+    })
+
+
+@pytest.fixture
+def weekly_frame():
+    return make_weekly_frame
@@ -0,0 +1,71 @@
+"""Chunked batch quotes: ordering, normalization and failed chunks."""
+
+import asyncio
+
+import pytest
+
+from data.fmp_client import FMPClient, FMPError
+
+
+@pytest.fixture
+def client():
+    return FMPClient(cache_enabled=False, price_store=None)
+
+
+def serve(client, respond):
+    """Route quote requests to respond(symbols) and record each chunk."""
+    chunks = []
+
+    async def request(endpoint, params=None, cache_hours=24, **kwargs):
+        symbols = endpoint.rsplit("/", 1)[-1].split(",")
+        chunks.append(symbols)
+        return respond(symbols)
+
+    client._request = request
+    return chunks
+
+
+def quotes(symbols):
+    return [{"symbol": s, "price": float(i)} for i, s in enumerate(symbols)]
+
+
+def test_chunks_requests_and_keeps_input_order(client):
+    chunks = serve(client, lambda symbols: quotes(symbols)[::-1])
+    tickers = [f"T{i}" for i in range(7)]
+
+    result = asyncio.run(client.get_batch_quotes(tickers + ["t3"], chunk_size=3))
+
+    assert chunks == [["T0", "T1", "T2"], ["T3", "T4", "T5"], ["T6"]]
+    assert [q["symbol"] for q in result] == tickers
+
+
+def test_failed_chunk_reports_missing_symbols(client):
+    def respond(symbols):
+        if "B" in symbols:
+            raise FMPError("chunk failed")
+        return quotes([s for s in symbols if s != "D"])  # Unknown symbol
+
+    serve(client, respond)
+    missing = []
+    result = asyncio.run(client.get_batch_quotes(["a", "b", "c", "d", "e"], chunk_size=2, missing=missing))
+
+    assert [q["symbol"] for q in result] == ["C", "E"]
+    assert missing == ["A", "B", "D"]
+
+
+def test_non_list_payload_is_skipped(client):
+    serve(client, lambda symbols: {"Error Message": "Invalid API KEY"} if "X" in symbols else quotes(symbols))
+    missing = []
+    result = asyncio.run(client.get_batch_quotes(["A", "X"], chunk_size=1, missing=missing))
+
+    assert [q["symbol"] for q in result] == ["A"]
+    assert missing == ["X"]
+
+
+def test_every_chunk_failing_raises(client):
+    def respond(symbols):
+        raise FMPError("down")
+
+    serve(client, respond)
+    with pytest.raises(FMPError, match="down"):
+        asyncio.run(client.get_batch_quotes(["A", "B", "C"], chunk_size=2))
@@ -0,0 +1,60 @@
+"""Vectorized HistoricalSignalDetector against the row-wise reference."""
+
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+from scanner.historical import HistoricalConfig, HistoricalSignalDetector
+
+
+@pytest.fixture
+def detector():
+    return HistoricalSignalDetector(HistoricalConfig())
+
+
+def as_records(signals):
+    return [asdict(s) for s in signals]
+
+
+def assert_parity(detector, df):
+    expected = as_records(detector.calculate_signals_rowwise(df, "TEST"))
+    actual = as_records(detector.calculate_signals(df, "TEST"))
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        assert a.keys() == e.keys()
+        for key in a:
+            if isinstance(e[key], float):
+                assert a[key] == pytest.approx(e[key], rel=1e-12, nan_ok=True), key
+            else:
+                assert a[key] == e[key], key
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n", [300, 120])  # With and without a full 200-bar SMA
+def test_matches_rowwise(detector, weekly_frame, seed, n):
+    df = weekly_frame(n, seed=seed)
+    assert detector.calculate_signals(df, "TEST")
+    assert_parity(detector, df)
+
+
+@pytest.mark.parametrize("n", [0, 5, 19, 20, 21, 52])
+def test_short_histories(detector, weekly_frame, n):
+    df = weekly_frame(n, seed=n)
+    assert_parity(detector, df)
+    if n < HistoricalSignalDetector.START_IDX:
+        assert detector.calculate_signals(df, "TEST") == []
+
+
+@pytest.mark.parametrize("column", ["volume", "close"])
+def test_missing_values(detector, weekly_frame, column):
+    df = weekly_frame(260, seed=7)
+    rng = np.random.default_rng(7)
+    df.loc[rng.choice(len(df), 15, replace=False), column] = np.nan
+    assert_parity(detector, df)
+
+
+def test_zero_volume(detector, weekly_frame):
+    df = weekly_frame(200, seed=3)
+    df.loc[:40, "volume"] = 0
+    assert_parity(detector, df)
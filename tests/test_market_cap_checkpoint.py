@@ -0,0 +1,104 @@
+"""Market cap fetch: checkpoint resume, failed and no-data tickers."""
+
+import asyncio
+import json
+
+import pytest
+
+from scanner.historical_universe import HistoricalMarketCapUniverse
+
+RECORD = [{"date": "2099-06-30", "marketCap": 1e10}]  # Never stale
+
+
+class Interrupted(BaseException):
+    """Stands in for Ctrl-C in the middle of a fetch."""
+
+
+@pytest.fixture
+def universe(tmp_path):
+    universe = HistoricalMarketCapUniverse()
+    universe._cache_file = tmp_path / "market_cap_history.json"
+    universe._checkpoint_file = tmp_path / "market_cap_history.partial.json"
+    universe._no_data_file = tmp_path / "market_cap_no_data.json"
+    universe._tickers = [f"T{i}" for i in range(10)]
+    yield universe
+    asyncio.run(universe.fmp.close())
+
+
+def fetch_with(universe, respond):
+    calls = []
+
+    async def fetch(ticker):
+        calls.append(ticker)
+        return respond(ticker)
+
+    universe._fetch_market_cap_for_ticker = fetch
+    return calls
+
+
+def run(universe, **kwargs):
+    asyncio.run(universe._fetch_all_market_caps(max_concurrent=1, **kwargs))
+
+
+def test_interrupted_fetch_resumes_from_checkpoint(universe):
+    def interrupt_at_t5(ticker):
+        if ticker == "T5":
+            raise Interrupted()
+        return RECORD
+
+    fetch_with(universe, interrupt_at_t5)
+    with pytest.raises(Interrupted):
+        run(universe, checkpoint_every=2)
+
+    checkpoint = json.loads(universe._checkpoint_file.read_text())
+    assert checkpoint["done"] == ["T0", "T1", "T2", "T3", "T4"]
+    assert not universe._cache_file.exists()
+
+    calls = fetch_with(universe, lambda ticker: RECORD)
+    run(universe, checkpoint_every=2)
+
+    assert calls == ["T5", "T6", "T7", "T8", "T9"]
+    assert sorted(json.loads(universe._cache_file.read_text())) == universe._tickers
+    assert not universe._checkpoint_file.exists()
+
+
+def test_failed_ticker_still_triggers_checkpoint(universe):
+    saved = []
+    save = universe._save_checkpoint
+
+    def record_save(history, no_data, done):
+        saved.append(sorted(done))
+        save(history, no_data, done)
+
+    universe._save_checkpoint = record_save
+
+    def fail_t1(ticker):
+        if ticker == "T1":
+            raise RuntimeError("HTTP 500")
+        return RECORD
+
+    fetch_with(universe, fail_t1)
+    run(universe, checkpoint_every=2)
+
+    # T1 lands on the first checkpoint boundary and is not marked done
+    assert saved[0] == ["T0"]
+    assert len(saved) == 5
+
+
+def test_refresh_skips_no_data_and_retries_failed(universe):
+    def respond(ticker):
+        if ticker == "T1":
+            raise RuntimeError("HTTP 500")
+        return None if ticker == "T2" else RECORD
+
+    fetch_with(universe, respond)
+    run(universe)
+    assert "T2" not in universe._market_cap_history
+    assert json.loads(universe._no_data_file.read_text()).keys() == {"T2"}
+
+    calls = fetch_with(universe, lambda ticker: RECORD)
+    run(universe, stale_only=True)
+
+    # The failed ticker is retried; the one without data waits for the cutoff
+    assert calls == ["T1"]
+    assert universe._stale_tickers() == []
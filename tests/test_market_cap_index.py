@@ -0,0 +1,71 @@
+"""MarketCapIndex against the original per-ticker max() scan."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scanner.historical_universe import MarketCapIndex
+
+
+def old_cap_on(history, ticker, target_date):
+    if ticker not in history:
+        return None
+    valid = [h for h in history[ticker] if h["date"] <= target_date]
+    if not valid:
+        return None
+    return max(valid, key=lambda x: x["date"])["marketCap"]
+
+
+def old_members(history, target_date, min_cap, max_cap=None):
+    members = set()
+    for ticker in history:
+        cap = old_cap_on(history, ticker, target_date)
+        if cap and cap >= min_cap and (max_cap is None or cap <= max_cap):
+            members.add(ticker)
+    return members
+
+
+def make_history(seed, n_tickers=60):
+    rng = np.random.default_rng(seed)
+    history = {}
+    for i in range(n_tickers):
+        years = rng.integers(0, 12)
+        first = 2010 + int(rng.integers(0, 8))
+        entries = [
+            {"date": f"{first + y}-{rng.choice(['03-31', '06-30', '12-31'])}",
+             "marketCap": float(rng.lognormal(22, 1.2))}
+            for y in range(years)
+        ]
+        if entries and rng.random() < 0.2:
+            entries.append(dict(entries[0], marketCap=0))  # Duplicate date, zero cap
+        rng.shuffle(entries)  # FMP returns newest first; the index must not care
+        history[f"T{i}"] = entries
+    return history
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_members_match_max_scan(seed):
+    history = make_history(seed)
+    index = MarketCapIndex(history)
+
+    for target in pd.date_range("2009-06-30", "2024-12-31", freq="QE").strftime("%Y-%m-%d"):
+        for min_cap, max_cap in ((3e9, None), (5e9, None), (1e9, 2e10)):
+            assert index.members(target, min_cap, max_cap) == old_members(history, target, min_cap, max_cap)
+
+
+def test_cap_on_matches_max_scan():
+    history = make_history(3)
+    index = MarketCapIndex(history)
+
+    for ticker in list(history) + ["UNKNOWN"]:
+        for target in ("2009-01-01", "2012-06-30", "2015-12-31", "2030-01-01"):
+            assert index.cap_on(ticker, target) == old_cap_on(history, ticker, target)
+
+
+def test_members_on_exact_report_date():
+    history = {"A": [{"date": "2020-12-31", "marketCap": 6e9}], "B": []}
+    index = MarketCapIndex(history)
+
+    assert index.members("2020-12-30", 5e9) == set()
+    assert index.members("2020-12-31", 5e9) == {"A"}
+    assert len(index) == 2
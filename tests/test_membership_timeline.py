@@ -0,0 +1,69 @@
+"""MembershipTimeline against the original change-replay loop."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scanner.universe import MembershipTimeline
+
+
+def replay_members(current_members, changes, target_date):
+    """The replay loop MembershipTimeline replaced: undo every later change."""
+    members = set(current_members)
+    for change in changes:
+        change_date = change.get("date", "")
+        if not change_date or change_date <= target_date:
+            continue
+        if change.get("symbol", ""):
+            members.discard(change["symbol"])
+        if change.get("removedTicker", ""):
+            members.add(change["removedTicker"])
+    return members
+
+
+def make_changes(seed, n_changes=300):
+    """Simulate index changes forward in time; returns (current members, changes newest first)."""
+    rng = np.random.default_rng(seed)
+    members = {f"S{i}" for i in range(50)}
+    spare = [f"N{i}" for i in range(400)]
+    dates = sorted(rng.choice(pd.bdate_range("2012-01-01", "2024-12-31").strftime("%Y-%m-%d"), n_changes))
+
+    changes = []
+    for change_date in dates:  # Duplicated dates: several changes on one day
+        removed = str(rng.choice(sorted(members)))
+        added = spare.pop(int(rng.integers(len(spare))))
+        members.discard(removed)
+        members.add(added)
+        change = {"date": change_date, "symbol": added, "removedTicker": removed}
+        if rng.random() < 0.05:
+            change["removedTicker"] = ""  # Addition without a matching removal
+            members.add(removed)
+        changes.append(change)
+    changes.append({"date": "", "symbol": "BAD", "removedTicker": "S0"})  # Ignored
+    return members, changes[::-1]
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_members_on_matches_replay(seed):
+    current, changes = make_changes(seed)
+    timeline = MembershipTimeline.build(current, changes)
+
+    change_dates = sorted({c["date"] for c in changes if c["date"]})
+    targets = list(pd.date_range("2011-06-30", "2025-06-30", freq="ME").strftime("%Y-%m-%d"))
+    targets += change_dates[::7]  # On a change date the change already applies
+    for target in targets:
+        assert timeline.members_on(target) == replay_members(current, changes, target), target
+
+
+def test_dict_round_trip_preserves_lookups():
+    current, changes = make_changes(2)
+    timeline = MembershipTimeline.build(current, changes)
+
+    # Stored as JSON in the cache
+    restored = MembershipTimeline.from_dict(json.loads(json.dumps(timeline.to_dict())))
+
+    assert restored.boundaries == timeline.boundaries
+    for target in ["2000-01-01", *timeline.boundaries[::5], "2030-01-01"]:
+        assert restored.members_on(target) == timeline.members_on(target)
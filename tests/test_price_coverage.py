@@ -0,0 +1,61 @@
+"""PriceCoverageIndex window lookups on gaps and unfetched ranges."""
+
+import pandas as pd
+import pytest
+
+from data.price_store import PriceStore
+
+
+def bars(*spans):
+    return [
+        {"date": day.strftime("%Y-%m-%d"), "close": 10.0, "volume": 100}
+        for start, end in spans
+        for day in pd.bdate_range(start, end)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PriceStore(tmp_path / "prices.sqlite3")
+    # Fetched Jan-Jun 2020, no trading from March through April (e.g. halted)
+    store.add_bars("GAP", bars(("2020-01-01", "2020-02-28"), ("2020-05-01", "2020-06-30")),
+                   "2020-01-01", "2020-06-30")
+    # Bars for 2020 but only Jan-Feb was ever fetched as a whole range
+    store.add_bars("PART", bars(("2020-01-01", "2020-02-28")), "2020-01-01", "2020-02-28")
+    # Listed mid-2020; the earlier range was fetched and came back empty
+    store.add_bars("IPO", [], "2019-01-01", "2020-06-30")
+    store.add_bars("IPO", bars(("2020-07-01", "2020-12-31")), "2020-07-01", "2020-12-31")
+    yield store
+    store.close()
+
+
+def test_gap_window_is_missing(store):
+    index = store.coverage_index()
+    assert index.has_data(["GAP"], "2020-03-31") == {"GAP": False}
+    # Windows reaching a bar on either side of the gap
+    assert index.has_data(["GAP"], "2020-03-20") == {"GAP": True}
+    assert index.has_data(["GAP"], "2020-04-10") == {"GAP": True}
+
+
+def test_unfetched_window_is_unknown(store):
+    index = store.coverage_index()
+    assert index.has_data(["PART", "NEVER"], "2020-01-31") == {"PART": True, "NEVER": None}
+    # No bars, but the window was never fetched: the store cannot tell
+    assert index.has_data(["PART"], "2020-06-15") == {"PART": None}
+    assert "NEVER" not in index
+
+
+def test_fetched_range_before_listing_is_missing(store):
+    index = store.coverage_index()
+    assert index.has_data(["IPO"], "2019-06-28") == {"IPO": False}
+    assert index.has_data(["IPO"], "2020-06-20") == {"IPO": True}
+
+
+def test_refresh_picks_up_new_ranges(store):
+    index = store.coverage_index()
+    assert index.has_data(["PART"], "2020-06-15") == {"PART": None}
+
+    store.add_bars("PART", [], "2020-03-01", "2020-12-31")  # Fetched: nothing after February
+    index.refresh(["PART"])
+    assert index.has_data(["PART"], "2020-06-15") == {"PART": False}
+    assert index.has_data(["GAP"], "2020-03-31") == {"GAP": False}
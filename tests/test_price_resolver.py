@@ -0,0 +1,93 @@
+"""PriceResolver lookups against the original per-date +/-10 day rule."""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.price_columns import columns_from_bars, slice_columns
+from data.price_resolver import PriceResolver
+
+
+def make_bars(seed):
+    """Daily closes for 2020-2021 with a few multi-week trading gaps."""
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2020-01-01", "2021-12-31")
+    keep = np.ones(len(days), dtype=bool)
+    for start in rng.integers(0, len(days) - 40, 4):
+        keep[start:start + rng.integers(5, 30)] = False
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(days))))
+    return [
+        {"date": day.strftime("%Y-%m-%d"), "close": float(close)}
+        for day, close, k in zip(days, closes, keep) if k
+    ]
+
+
+def old_price_on(bars, target_date):
+    """The rule get_price_on_date used: one +/-10 day request per lookup."""
+    target = pd.Timestamp(target_date)
+    lo = (target - pd.Timedelta(days=10)).strftime("%Y-%m-%d")
+    hi = (target + pd.Timedelta(days=10)).strftime("%Y-%m-%d")
+    hist = [b for b in bars if lo <= b["date"] <= hi]
+    if not hist:
+        return None
+    df = pd.DataFrame(hist)
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values("date")
+    after = df["date"] >= target
+    if after.any():
+        return float(df[after].iloc[0]["close"])
+    return float(df.iloc[-1]["close"])
+
+
+class FakeFMP:
+    def __init__(self, series):
+        self.series = series
+        self.settings = SimpleNamespace(fmp_max_concurrency=4)
+        self.loads = []
+
+    async def get_price_columns(self, ticker, start, end):
+        self.loads.append((ticker, start, end))
+        return slice_columns(columns_from_bars(self.series[ticker]), start, end)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_prices_on_matches_window_rule(seed):
+    series = {"A": make_bars(seed), "B": make_bars(seed + 10)}
+    fmp = FakeFMP(series)
+    resolver = PriceResolver(fmp)
+
+    targets = pd.date_range("2019-12-10", "2022-01-20", freq="2D").strftime("%Y-%m-%d").tolist()
+    asyncio.run(resolver.prefetch([(t, d) for t in series for d in targets]))
+    assert len(fmp.loads) == 2  # One load per ticker
+
+    for ticker, bars in series.items():
+        prices = resolver.prices_on(ticker, targets)
+        for target, price in zip(targets, prices):
+            expected = old_price_on(bars, target)
+            if expected is None:
+                assert np.isnan(price), target
+            else:
+                assert price == expected, target
+
+
+def test_reloads_cover_union_and_unknown_ticker_is_none():
+    fmp = FakeFMP({"A": make_bars(3)})
+    resolver = PriceResolver(fmp)
+
+    async def run():
+        await resolver.prefetch([("A", "2020-06-01")])
+        await resolver.prefetch([("A", "2020-06-01"), ("A", "2020-05-30")])  # Mostly loaded already
+        return await resolver.get_price_on_date("A", "2021-03-01")
+
+    price = asyncio.run(run())
+    assert price == old_price_on(fmp.series["A"], "2021-03-01")
+    # Reloads cover the union of the old and new ranges
+    assert [load[1:] for load in fmp.loads] == [
+        ("2020-05-22", "2020-06-11"),
+        ("2020-05-20", "2020-06-11"),
+        ("2020-05-20", "2021-03-11"),
+    ]
+    assert resolver.price_on("MISSING", "2020-06-01") is None
@@ -0,0 +1,124 @@
+"""Range-merging price store: coverage gaps, merges and rewritten history."""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.fmp_client import FMPClient
+from data.price_columns import columns_from_bars, parse_price_payload
+from data.price_store import PriceStore, merge_ranges, subtract_ranges
+
+
+def bars(start, end, close=100.0):
+    return [
+        {"date": day.strftime("%Y-%m-%d"), "close": close + i, "volume": 1000 + i}
+        for i, day in enumerate(pd.bdate_range(start, end))
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PriceStore(tmp_path / "prices.sqlite3")
+    yield store
+    store.close()
+
+
+def test_merge_ranges_joins_overlapping_and_adjacent():
+    assert merge_ranges([
+        ("2024-03-01", "2024-03-31"),
+        ("2024-01-01", "2024-01-31"),
+        ("2024-02-01", "2024-02-10"),  # Next day after January
+        ("2024-01-15", "2024-01-20"),  # Inside January
+    ]) == [("2024-01-01", "2024-02-10"), ("2024-03-01", "2024-03-31")]
+
+
+def test_subtract_ranges_returns_uncovered_parts():
+    covered = [("2024-02-01", "2024-02-29"), ("2024-04-01", "2024-04-30")]
+    assert subtract_ranges("2024-01-15", "2024-05-15", covered) == [
+        ("2024-01-15", "2024-01-31"),
+        ("2024-03-01", "2024-03-31"),
+        ("2024-05-01", "2024-05-15"),
+    ]
+    assert subtract_ranges("2024-02-05", "2024-02-20", covered) == []
+
+
+def test_missing_ranges_after_merging_windows(store):
+    store.add_columns("T", columns_from_bars(bars("2024-01-01", "2024-01-31")), "2024-01-01", "2024-01-31")
+    store.add_columns("T", columns_from_bars(bars("2024-03-01", "2024-03-29")), "2024-03-01", "2024-03-31")
+
+    assert store.missing_ranges("T", "2024-01-10", "2024-04-10") == [
+        ("2024-02-01", "2024-02-29"),
+        ("2024-04-01", "2024-04-10"),
+    ]
+
+    # The middle window fills the gap; coverage collapses to one range
+    store.add_bars("T", bars("2024-01-31", "2024-03-01"), "2024-01-31", "2024-03-01")
+    assert store.get_coverage("T") == [("2024-01-01", "2024-03-31")]
+
+    columns = store.get_columns("T", "2024-01-01", "2024-03-31")
+    dates = columns["date"]
+    assert len(dates) == len(pd.bdate_range("2024-01-01", "2024-03-29"))
+    assert (np.diff(dates) > np.timedelta64(0, "D")).all()
+
+
+def test_coverage_stops_before_today(store):
+    today = pd.Timestamp.now().normalize()
+    start = (today - pd.Timedelta(days=10)).strftime("%Y-%m-%d")
+    store.add_bars("T", bars(start, today), start, today.strftime("%Y-%m-%d"))
+
+    assert store.missing_ranges("T", start, today.strftime("%Y-%m-%d")) == [
+        (today.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")),
+    ]
+
+
+def test_empty_object_covers_range_but_error_does_not(store):
+    assert parse_price_payload(b'{"Error Message": "Limit reached"}') is None
+    empty = parse_price_payload(b"{ }\n")
+    assert empty is not None and not len(empty["date"])
+
+    store.add_columns("IPO", empty, "2010-01-01", "2010-12-31")
+    assert store.missing_ranges("IPO", "2010-01-01", "2010-12-31") == []
+
+
+def test_matches_flags_rewritten_closes(store):
+    store.add_bars("T", bars("2024-01-01", "2024-01-31"), "2024-01-01", "2024-01-31")
+
+    same = columns_from_bars(bars("2024-01-31", "2024-02-09", close=100.0 + 22))
+    split = columns_from_bars(bars("2024-01-31", "2024-02-09", close=61.0))
+    assert store.matches("T", same)
+    assert not store.matches("T", split)
+
+
+def test_split_between_fetches_refetches_the_range(store):
+    client = FMPClient(price_store=store, cache_enabled=False)
+    factor = {"value": 1.0}
+    requested = []
+
+    async def request(endpoint, params=None, cache_hours=24, parse=None):
+        requested.append((params["from"], params["to"]))
+        days = pd.bdate_range(params["from"], params["to"])
+        return columns_from_bars([
+            {"date": day.strftime("%Y-%m-%d"), "close": 100.0 / factor["value"]} for day in days
+        ])
+
+    client._request = request
+
+    async def run():
+        await client.get_price_columns("T", "2024-01-01", "2024-01-31")
+        factor["value"] = 2.0  # 2:1 split: FMP restates the history
+        columns = await client.get_price_columns("T", "2024-01-01", "2024-02-29")
+        await client.close()
+        return columns
+
+    columns = asyncio.run(run())
+    assert set(columns["close"].tolist()) == {50.0}
+    assert len(columns["date"]) == len(pd.bdate_range("2024-01-01", "2024-02-29"))
+    # The gap is fetched with the last stored bar, then January again up to
+    # the first bar of the new history
+    assert requested == [
+        ("2024-01-01", "2024-01-31"),
+        ("2024-01-31", "2024-02-29"),
+        ("2024-01-01", "2024-01-31"),
+    ]
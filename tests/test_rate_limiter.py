@@ -0,0 +1,80 @@
+"""AIMD concurrency window and token bucket of the shared rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+
+from data.rate_limiter import AdaptiveRateLimiter
+
+
+def test_successes_widen_window_additively():
+    limiter = AdaptiveRateLimiter(initial_concurrency=4, max_concurrency=6)
+    for _ in range(4):
+        limiter._on_success(0.1)
+    # About +1 per window's worth of healthy responses
+    assert 4.8 < limiter.concurrency < 5.0
+
+    for _ in range(100):
+        limiter._on_success(0.1)
+    assert limiter.concurrency == 6
+
+
+def test_throttle_halves_window_and_pauses():
+    limiter = AdaptiveRateLimiter(initial_concurrency=8, min_concurrency=2)
+
+    before = time.monotonic()
+    limiter._on_throttle(retry_after=5.0)
+    assert limiter.concurrency == 4
+    assert limiter._tokens == 0
+    assert limiter._blocked_until >= before + 5.0
+    assert limiter.throttled_requests == 1
+
+    for _ in range(3):
+        limiter._on_throttle(None)
+    assert limiter.concurrency == 2  # Never below min_concurrency
+
+
+def test_latency_blowup_shrinks_window():
+    limiter = AdaptiveRateLimiter(initial_concurrency=10, latency_factor=3.0)
+    for _ in range(5):
+        limiter._on_success(0.1)
+    widened = limiter.concurrency
+
+    limiter._on_success(1.0)  # 10x the best smoothed latency
+    assert limiter.concurrency == pytest.approx(widened * 0.9)
+
+
+def test_slot_records_throttle_from_retry_after():
+    limiter = AdaptiveRateLimiter(requests_per_minute=6000, initial_concurrency=4)
+
+    async def run():
+        async with limiter.slot() as slot:
+            slot.record_throttle("0.01")
+        async with limiter.slot() as slot:
+            slot.record_throttle("soon")  # Unparseable header: default pause
+
+    asyncio.run(run())
+    assert limiter.throttled_requests == 2
+    assert limiter.concurrency == 1
+    assert limiter.total_requests == 2
+
+
+def test_window_caps_requests_in_flight():
+    limiter = AdaptiveRateLimiter(requests_per_minute=60000, initial_concurrency=3, max_concurrency=3)
+    in_flight = peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        async with limiter.slot():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def run():
+        await asyncio.gather(*[call() for _ in range(12)])
+
+    asyncio.run(run())
+    assert peak == 3
+    assert limiter.total_requests == 12
@@ -0,0 +1,75 @@
+"""Incremental signal store: reused signals must equal a full scan."""
+
+from dataclasses import replace
+
+import pytest
+
+from scanner.historical import HistoricalConfig, HistoricalScanner
+from scanner.signal_store import SignalStoreState, config_fingerprint
+
+
+def signal_keys(signals):
+    return sorted((s.date, s.signal_type, s.price, s.score) for s in signals)
+
+
+@pytest.fixture
+def scanner():
+    return HistoricalScanner(HistoricalConfig())
+
+
+@pytest.mark.parametrize("slide", [0, 1, 10, 60])
+def test_incremental_matches_full_scan_over_slid_window(scanner, weekly_frame, slide):
+    history = weekly_frame(420, seed=slide)
+    old = history.iloc[:330].reset_index(drop=True)
+    # Refreshed frame: new bars appended, head trimmed to the years window
+    new = history.iloc[slide:380].reset_index(drop=True)
+
+    detector = scanner.detector
+    state = SignalStoreState(
+        fingerprint=config_fingerprint(scanner.config, detector.VERSION),
+        tickers={"TEST": scanner._bar_marker(old)},
+    )
+    detect = scanner._incremental_detector(detector.calculate_signals(old, "TEST"), state)
+
+    full = detector.calculate_signals(new, "TEST")
+    assert full
+    assert signal_keys(detect(new, "TEST")) == signal_keys(full)
+
+
+@pytest.mark.parametrize("slide", [1, 4])
+def test_default_window_refresh_skips_full_scan(scanner, weekly_frame, monkeypatch, slide):
+    weeks = scanner.config.years_of_data * 52
+    history = weekly_frame(weeks + 10, seed=7 + slide)
+    old = history.iloc[:weeks].reset_index(drop=True)
+    new = history.iloc[slide:weeks + slide].reset_index(drop=True)
+
+    detector = scanner.detector
+    state = SignalStoreState(
+        fingerprint=config_fingerprint(scanner.config, detector.VERSION),
+        tickers={"TEST": scanner._bar_marker(old)},
+    )
+    detect = scanner._incremental_detector(detector.calculate_signals(old, "TEST"), state)
+    full = detector.calculate_signals(new, "TEST")
+    assert full
+
+    def full_scan(df, ticker):
+        raise AssertionError("refresh fell back to a full scan")
+
+    monkeypatch.setattr(detector, "calculate_signals", full_scan)
+    assert signal_keys(detect(new, "TEST")) == signal_keys(full)
+
+
+def test_changed_history_is_rescanned(scanner, weekly_frame):
+    old = weekly_frame(300, seed=1)
+    new = weekly_frame(320, seed=2)  # Marker bar no longer matches
+
+    state = SignalStoreState(fingerprint="", tickers={"TEST": scanner._bar_marker(old)})
+    detect = scanner._incremental_detector(scanner.detector.calculate_signals(old, "TEST"), state)
+
+    assert signal_keys(detect(new, "TEST")) == signal_keys(scanner.detector.calculate_signals(new, "TEST"))
+
+
+def test_fingerprint_tracks_history_length():
+    config = HistoricalConfig()
+    assert config_fingerprint(config, 1) == config_fingerprint(replace(config), 1)
+    assert config_fingerprint(config, 1) != config_fingerprint(replace(config, years_of_data=10), 1)